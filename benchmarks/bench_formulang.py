@@ -0,0 +1,50 @@
+"""Benchmark of syllable generation from Formulang formulas.
+
+Compares parsing every formula and wrapping each evaluated
+`FormulangStructure` into its target type, as generation used to work,
+with `Formulang.generate_syllable()`, which evaluates cached parse trees
+directly into the target types, and with sampling a `SyllableTemplate`.
+Run from the repository root with `python -m benchmarks.bench_formulang`.
+"""
+
+import timeit
+
+from clck.common.structure import EmptyStructure, Structure
+from clck.formulang.common import Formulang, SyllableTemplate
+from clck.phonology.syllabics import Nucleus, SyllabicComponent, Syllable
+
+
+COUNT = 2000
+LEFT, NUCLEUS, RIGHT = "s+t|k", "a|i", "n|m"
+
+
+def wrap[S: Structure](formula: str, type: type[S]) -> S:
+    return type(Formulang.generate_ast(formula).eval() or EmptyStructure())
+
+
+def generate_wrapped() -> list[Syllable]:
+    return [Syllable((wrap(LEFT, SyllabicComponent), wrap(NUCLEUS, Nucleus),
+        wrap(RIGHT, SyllabicComponent))) for _ in range(COUNT)]
+
+
+def generate_direct() -> list[Syllable]:
+    return [Formulang.generate_syllable(LEFT, NUCLEUS, RIGHT)
+        for _ in range(COUNT)]
+
+
+def sample_template() -> tuple[Syllable, ...]:
+    return SyllableTemplate(LEFT, NUCLEUS, RIGHT).sample_many(COUNT)  # type: ignore
+
+
+def report(name: str, fn: object) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=5))  # type: ignore
+    print(f"{name:<32}{best / COUNT * 1e6:8.2f} us/syllable")
+    return best
+
+
+if __name__ == "__main__":
+    wrapped = report("parse, evaluate and wrap", generate_wrapped)
+    direct = report("generate_syllable()", generate_direct)
+    template = report("SyllableTemplate.sample_many()", sample_template)
+    print(f"speedup of generate_syllable(): {wrapped / direct:.1f}x")
+    print(f"speedup of SyllableTemplate: {wrapped / template:.1f}x")
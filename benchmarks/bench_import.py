@@ -0,0 +1,61 @@
+"""Benchmark of the import time of the `clck` package.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters,
+reports the best cumulative import time of the module together with the
+slowest modules it imported, and exits with status 1 if the time is
+over budget. Run from the repository root with
+`python -m benchmarks.bench_import [module] [--budget MS]`.
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+REPEAT = 5
+DEFAULT_BUDGET_MS = 10.0
+"""The budget of `import clck`. Subpackages are loaded lazily, so this
+only covers the package's own `__init__`."""
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    """Imports `module` in a fresh interpreter and returns the self and
+    cumulative import times, in microseconds, of every module imported
+    after interpreter startup.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+        f"import {module}"], capture_output=True, text=True, check=True)
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if name.strip() == "site":
+            # Everything imported so far belongs to interpreter startup
+            times.clear()
+            continue
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="clck")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS,
+        help="the allowed cumulative import time in milliseconds")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(REPEAT)]
+    best = min(runs, key=lambda times: times[args.module][1])
+    total_ms = best[args.module][1] / 1000
+
+    print(f"import {args.module}: {total_ms:.2f} ms (budget {args.budget:.2f} ms)")
+    print("slowest modules (self time):")
+    for name, (self_us, _) in sorted(best.items(),
+        key=lambda item: item[1][0], reverse=True)[:10]:
+        print(f"  {self_us / 1000:8.2f} ms  {name}")
+
+    if total_ms > args.budget:
+        print(f"over budget by {total_ms - args.budget:.2f} ms")
+        sys.exit(1)
@@ -0,0 +1,49 @@
+"""Benchmark of the cost of blueprint validation during structure
+construction.
+
+Compares creating syllables with the default validating constructor,
+in trusted mode, and in trusted mode followed by a bulk `validate_many()`
+pass. Run from the repository root with
+`python -m benchmarks.bench_structure`.
+"""
+
+import timeit
+
+from clck.common.structure import Structure
+from clck.ipa.IPA import IPA_VOICED_VELAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.phonology.phonemes import DummyVowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+COUNT = 2000
+VOWEL = DummyVowelPhoneme()
+
+
+def build_syllables() -> list[Syllable]:
+    return [Syllable((Onset((IPA_VOICELESS_ALVEOLAR_PLOSIVE,)),
+        Nucleus((VOWEL,)), Coda((IPA_VOICED_VELAR_NASAL,))))
+        for _ in range(COUNT)]
+
+
+def build_trusted() -> list[Syllable]:
+    with Structure.trusted():
+        return build_syllables()
+
+
+def build_trusted_then_validate() -> list[Syllable]:
+    syllables = build_trusted()
+    assert Structure.validate_many(syllables) == ()
+    return syllables
+
+
+def report(name: str, fn: object) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=7))  # type: ignore
+    print(f"{name:<32}{best / COUNT * 1e6:8.2f} us/syllable")
+    return best
+
+
+if __name__ == "__main__":
+    validated = report("validated constructor", build_syllables)
+    trusted = report("trusted constructor", build_trusted)
+    report("trusted + validate_many()", build_trusted_then_validate)
+    print(f"validation share of construction: {1 - trusted / validated:.0%}")
@@ -1,5 +1,41 @@
-from clck import ipa
-from clck.formulang import Formulang
-from clck.formulang import Token
-from clck.phonology.phonemes import Phone
-from clck.phonology.phonemes import Phoneme
\ No newline at end of file
+"""CLCK, the constructed language construction kit.
+
+Subpackages and the names exported here are only imported on first
+access (PEP 562), so `import clck` stays cheap.
+"""
+
+import importlib
+
+
+_LAZY_SUBMODULES: frozenset[str] = frozenset((
+    "analysis",
+    "common",
+    "formulang",
+    "ipa",
+    "language",
+    "phonetics",
+    "phonology",
+))
+
+_LAZY_NAMES: dict[str, str] = {
+    "Formulang": "clck.formulang",
+    "Token": "clck.formulang",
+    "Phone": "clck.phonology.phonemes",
+    "Phoneme": "clck.phonology.phonemes",
+}
+
+__all__ = sorted((*_LAZY_SUBMODULES, *_LAZY_NAMES))
+
+
+def __getattr__(name: str) -> object:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    elif name in _LAZY_NAMES:
+        value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
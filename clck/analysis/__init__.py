@@ -0,0 +1,2 @@
+from clck.analysis.distance import FeatureDistanceMatrix
+from clck.analysis.ngrams import NGramModel
@@ -0,0 +1,152 @@
+from typing import TYPE_CHECKING, Sequence
+from weakref import WeakKeyDictionary
+
+from clck.exceptions import CLCKException
+from clck.phonetics.phones import Phone, get_feature_matrix
+from clck.phonology.phonemes import Phoneme, PhonemicInventory
+
+if TYPE_CHECKING:
+    import numpy
+
+
+class FeatureDistanceMatrix:
+    """The class for `FeatureDistanceMatrix`.
+
+    A `FeatureDistanceMatrix` holds the pairwise feature distances of a
+    sequence of phones or phonemes. The distance of two phones is the
+    number of articulatory properties (see `FEATURES`) that only one of
+    them has, so identical feature sets are at distance 0. The whole
+    matrix is computed at once with NumPy from the binary feature matrix
+    of the phones. Phonemes are compared by their base phones.
+
+    Requires NumPy.
+
+    Below demonstrates finding the three phonemes of an inventory
+    closest to a phone it lacks.::
+
+        distances = FeatureDistanceMatrix.of_inventory(inventory)
+        distances.nearest(IPA_VOICED_DENTAL_FRICATIVE, 3)
+    """
+
+    _INVENTORY_CACHE: "WeakKeyDictionary[PhonemicInventory, FeatureDistanceMatrix]" = WeakKeyDictionary()
+    _DEFAULT_CACHE: "FeatureDistanceMatrix | None" = None
+
+    def __init__(self, items: Sequence[Phone | Phoneme]) -> None:
+        """Creates a new `FeatureDistanceMatrix` of the given phones or
+        phonemes.
+
+        Parameters
+        ----------
+        items : Sequence[Phone | Phoneme]
+            the phones or phonemes to compute the distances of
+        """
+        import numpy
+
+        self._items: tuple[Phone | Phoneme, ...] = tuple(items)
+        self._positions: dict[int, int] = {id(item): i
+            for i, item in enumerate(self._items)}
+        self._features = get_feature_matrix([self._get_phone(i)
+            for i in self._items])
+
+        # |a xor b| = |a| + |b| - 2|a and b|, for all pairs at once
+        f = self._features.astype(numpy.int32)
+        counts = f.sum(axis=1)
+        self._matrix = counts[:, None] + counts[None, :] - 2 * (f @ f.T)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def items(self) -> tuple[Phone | Phoneme, ...]:
+        """The phones or phonemes of this matrix, in row order."""
+        return self._items
+
+    @property
+    def matrix(self) -> "numpy.ndarray":
+        """The `(n, n)` integer array of pairwise feature distances."""
+        return self._matrix
+
+    def distance(self, a: Phone | Phoneme, b: Phone | Phoneme) -> int:
+        """Returns the feature distance of the given phones or phonemes.
+        Either of them may be missing from this matrix.
+        """
+        i = self._positions.get(id(a))
+        j = self._positions.get(id(b))
+        if i is not None and j is not None:
+            return int(self._matrix[i, j])
+        return bin(self._get_phone(a).feature_mask
+            ^ self._get_phone(b).feature_mask).count("1")
+
+    def get_distances(self, item: Phone | Phoneme) -> "numpy.ndarray":
+        """Returns the feature distances of the given phone or phoneme
+        to every item of this matrix, in row order. The phone or
+        phoneme does not need to be one of the items.
+        """
+        i = self._positions.get(id(item))
+        if i is not None:
+            return self._matrix[i]
+
+        features = get_feature_matrix((self._get_phone(item),))[0]
+        return (self._features != features).sum(axis=1)
+
+    def nearest(self, item: Phone | Phoneme,
+        k: int = 1) -> tuple[Phone | Phoneme, ...]:
+        """Returns the `k` items of this matrix closest to the given
+        phone or phoneme, from the closest. The item itself is never
+        returned, and ties are kept in row order.
+
+        Parameters
+        ----------
+        item : Phone | Phoneme
+            the phone or phoneme to find the nearest items of. It does
+            not need to be one of the items of this matrix
+        k : int, optional
+            the number of items to return, by default 1
+
+        Returns
+        -------
+        tuple[Phone | Phoneme, ...]
+            the nearest items
+        """
+        import numpy
+
+        if k < 0:
+            raise CLCKException("The number of nearest items cannot be negative")
+
+        distances = self.get_distances(item).astype(numpy.float64)
+        i = self._positions.get(id(item))
+        if i is not None:
+            distances[i] = numpy.inf
+
+        k = min(k, len(self._items) - (i is not None))
+        if k <= 0:
+            return ()
+        order = numpy.argsort(distances, kind="stable")[:k]
+        return tuple([self._items[j] for j in order])
+
+    @classmethod
+    def of_default_phones(cls) -> "FeatureDistanceMatrix":
+        """Returns the distance matrix of `Phone.DEFAULT_IPA_PHONES`,
+        computing it only once for the current default phones.
+        """
+        cached = cls._DEFAULT_CACHE
+        if cached is None or cached._items is not Phone.DEFAULT_IPA_PHONES:
+            cached = cls._DEFAULT_CACHE = cls(Phone.DEFAULT_IPA_PHONES)
+        return cached
+
+    @classmethod
+    def of_inventory(cls, inventory: PhonemicInventory) -> "FeatureDistanceMatrix":
+        """Returns the distance matrix of the phonemes of the given
+        inventory. The matrix is cached per inventory and only computed
+        again after phonemes are added to it.
+        """
+        cached = cls._INVENTORY_CACHE.get(inventory)
+        if cached is None or cached._items is not inventory.phonemes:
+            cached = cls._INVENTORY_CACHE[inventory] = cls(inventory.phonemes)
+        return cached
+
+    @staticmethod
+    def _get_phone(item: Phone | Phoneme) -> Phone:
+        if isinstance(item, Phoneme):
+            return item.base_phone
+        return item
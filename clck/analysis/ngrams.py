@@ -0,0 +1,356 @@
+from array import array
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PhonemeIndex
+from clck.common.packed import pack_phoneme_ids
+from clck.exceptions import CLCKException
+from clck.phonology.allophony import Realizable
+from clck.phonology.phonemes import Phoneme
+
+if TYPE_CHECKING:
+    import numpy
+    from clck.language.language import Language
+
+
+MAX_DENSE_NGRAMS = 1 << 22
+"""The largest number of possible n-grams an `NGramModel` counts in a
+dense array when not told otherwise, 32 MiB of counts."""
+
+
+class NGramModel:
+    """The class for `NGramModel`.
+
+    An `NGramModel` is a phonotactic model of the words of a language,
+    estimating the probability of each phoneme from the `order - 1`
+    phonemes before it with add-k smoothing. Words are padded with a
+    boundary symbol on both sides, so word edges are modelled too, and
+    phonemes missing from the model's inventory share one unknown
+    symbol.
+
+    Counts are NumPy arrays indexed by the model's own phoneme IDs,
+    which follow the order of the inventory. They are either dense, of
+    one count per possible n-gram, or sparse, of the sorted codes of
+    the n-grams seen and their counts. Training and scoring work on
+    whole packed batches of words (see `pack_phoneme_ids()`) with no
+    per-phoneme Python code, so millions of candidates can be scored
+    and ranked at once.
+
+    Requires NumPy.
+
+    Below demonstrates ranking generated syllables by naturalness.::
+
+        model = NGramModel.from_language(language, 3)
+        best = model.rank(candidates, 100)
+    """
+
+    def __init__(self, phonemes: Iterable[Phoneme], order: int = 2,
+        smoothing: float = 1.0, sparse: bool | None = None) -> None:
+        """Creates a new untrained `NGramModel`.
+
+        Parameters
+        ----------
+        phonemes : Iterable[Phoneme]
+            the phonemes of the model, usually those of an inventory
+        order : int, optional
+            the length of the n-grams, by default 2
+        smoothing : float, optional
+            the pseudo-count added to every n-gram, by default 1.0
+        sparse : bool | None, optional
+            whether or not counts are kept sparse, by default only if
+            there are more than `MAX_DENSE_NGRAMS` possible n-grams
+
+        Raises
+        ------
+        CLCKException
+            if the order is less than 1, the smoothing is not positive,
+            or the n-grams are too many to be encoded in 64 bits
+        """
+        import numpy
+
+        if order < 1:
+            raise CLCKException("The order of an n-gram model must be at least 1")
+        if smoothing <= 0:
+            raise CLCKException("The smoothing of an n-gram model must be positive")
+
+        self._index = PhonemeIndex(*phonemes)
+        self._order = order
+        self._smoothing = smoothing
+        # The symbols are the phonemes, then the boundary and the
+        # unknown phoneme
+        self._boundary = len(self._index)
+        self._unknown = self._boundary + 1
+        self._symbols = self._boundary + 2
+        self._ngrams = self._symbols ** order
+        if self._ngrams >= 1 << 63:
+            raise CLCKException(f"Cannot encode {order}-grams of {self._symbols} symbols")
+
+        self._sparse = self._ngrams > MAX_DENSE_NGRAMS if sparse is None else sparse
+        self._total = 0
+        self._counts = numpy.zeros(0 if self._sparse else self._ngrams, numpy.int64)
+        self._context_counts = numpy.zeros(
+            0 if self._sparse else self._ngrams // self._symbols, numpy.int64)
+        # The sorted codes of the n-grams and contexts seen, if sparse
+        self._codes = numpy.zeros(0, numpy.int64)
+        self._context_codes = numpy.zeros(0, numpy.int64)
+        self._translations: dict[int, tuple[PhonemeIndex, "numpy.ndarray"]] = {}
+
+    @property
+    def is_sparse(self) -> bool:
+        """Whether or not the counts of this model are sparse."""
+        return self._sparse
+
+    @property
+    def order(self) -> int:
+        """The length of the n-grams of this model."""
+        return self._order
+
+    @property
+    def phonemes(self) -> tuple[Phoneme, ...]:
+        """The phonemes of this model, in ID order."""
+        return self._index.phonemes
+
+    @property
+    def total(self) -> int:
+        """The number of n-grams counted, which is the number of
+        phonemes of the training words plus one per word."""
+        return self._total
+
+    def get_count(self, ngram: Sequence[Phoneme | None]) -> int:
+        """Returns the number of times the given n-gram was counted,
+        where `None` is the boundary of a word.
+
+        Raises
+        ------
+        CLCKException
+            if the n-gram is not of the order of this model
+        """
+        import numpy
+
+        if len(ngram) != self._order:
+            raise CLCKException(f"{ngram} is not a {self._order}-gram")
+        code = 0
+        for p in ngram:
+            if p is None:
+                symbol = self._boundary
+            else:
+                symbol = self._get_symbol(p)
+            code = code * self._symbols + symbol
+        return int(self._look_up(numpy.array([code], numpy.int64), False)[0])
+
+    def train(self, words: Iterable[Realizable]) -> None:
+        """Counts the n-grams of the given structures, packed structures
+        or sequences of phonemes, each being one word.
+        """
+        self.train_packed(*pack_phoneme_ids(words))
+
+    def train_packed(self, phoneme_ids: array, offsets: array,
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> None:
+        """Counts the n-grams of a batch of words packed by
+        `pack_phoneme_ids()`.
+
+        Parameters
+        ----------
+        phoneme_ids : array
+            the concatenated phoneme IDs of all words
+        offsets : array
+            the offsets of each word in `phoneme_ids`, followed by the
+            total length
+        index : PhonemeIndex, optional
+            the index of the phoneme IDs, by default
+            `DEFAULT_PHONEME_INDEX`
+        """
+        import numpy
+
+        codes = self._get_codes(phoneme_ids, offsets, index)[0]
+        self._total += len(codes)
+        if not self._sparse:
+            self._counts += numpy.bincount(codes, minlength=self._ngrams)
+            self._context_counts = self._counts.reshape(-1, self._symbols).sum(axis=1)
+            return
+
+        codes, counts = numpy.unique(codes, return_counts=True)
+        self._codes, self._counts = self._merge(self._codes, self._counts,
+            codes, counts)
+        contexts, inverse = numpy.unique(self._codes // self._symbols,
+            return_inverse=True)
+        self._context_codes = contexts
+        self._context_counts = numpy.bincount(inverse, weights=self._counts,
+            minlength=len(contexts)).astype(numpy.int64)
+
+    def score(self, word: Realizable) -> float:
+        """Returns the natural logarithm of the probability of the given
+        structure, packed structure or sequence of phonemes as a word.
+        """
+        return float(self.score_many((word,))[0])
+
+    def score_many(self, words: Iterable[Realizable],
+        per_phoneme: bool = False) -> "numpy.ndarray":
+        """Returns the log-probabilities of the given words as an array,
+        see `score_packed()`.
+        """
+        return self.score_packed(*pack_phoneme_ids(words),
+            per_phoneme=per_phoneme)
+
+    def score_packed(self, phoneme_ids: array, offsets: array,
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX,
+        per_phoneme: bool = False) -> "numpy.ndarray":
+        """Returns the natural logarithms of the probabilities of a batch
+        of words packed by `pack_phoneme_ids()`, computed all at once.
+
+        Parameters
+        ----------
+        phoneme_ids : array
+            the concatenated phoneme IDs of all words
+        offsets : array
+            the offsets of each word in `phoneme_ids`, followed by the
+            total length
+        index : PhonemeIndex, optional
+            the index of the phoneme IDs, by default
+            `DEFAULT_PHONEME_INDEX`
+        per_phoneme : bool, optional
+            whether or not each log-probability is divided by the
+            number of predicted symbols, the phonemes and the final
+            boundary, so that words of different lengths compare, by
+            default `False`
+
+        Returns
+        -------
+        numpy.ndarray
+            the `float64` log-probability of each word
+        """
+        import numpy
+
+        codes, words = self._get_codes(phoneme_ids, offsets, index)
+        counts = self._look_up(codes, False)
+        contexts = self._look_up(codes // self._symbols, True)
+        k = self._smoothing
+        log_probabilities = (numpy.log(counts + k)
+            - numpy.log(contexts + k * self._symbols))
+        scores = numpy.bincount(words, weights=log_probabilities,
+            minlength=len(offsets) - 1)
+        if per_phoneme:
+            scores /= numpy.diff(numpy.asarray(offsets, numpy.int64)) + 1
+        return scores
+
+    def rank(self, words: Sequence[Realizable], k: int | None = None,
+        per_phoneme: bool = False) -> tuple[Realizable, ...]:
+        """Returns the given words from the most probable, up to `k` of
+        them. See `rank_packed()`.
+        """
+        order = self.rank_packed(*pack_phoneme_ids(words), k=k,
+            per_phoneme=per_phoneme)
+        return tuple([words[i] for i in order])
+
+    def rank_packed(self, phoneme_ids: array, offsets: array,
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX, k: int | None = None,
+        per_phoneme: bool = False) -> "numpy.ndarray":
+        """Returns the positions of the words of a packed batch from the
+        most probable, up to `k` of them. Only the best `k` words are
+        sorted. Ties are kept in batch order.
+
+        See `score_packed()` for the parameters.
+        """
+        import numpy
+
+        scores = -self.score_packed(phoneme_ids, offsets, index, per_phoneme)
+        if k is None or k >= len(scores):
+            return numpy.argsort(scores, kind="stable")
+        if k <= 0:
+            return numpy.zeros(0, numpy.intp)
+        best = numpy.argpartition(scores, k - 1)[:k]
+        # Ties with the k-th score are resolved in batch order
+        threshold = scores[best].max()
+        best = numpy.concatenate((numpy.flatnonzero(scores < threshold),
+            numpy.flatnonzero(scores == threshold)))[:k]
+        return best[numpy.argsort(scores[best], kind="stable")]
+
+    @classmethod
+    def from_language(cls, language: "Language", order: int = 2,
+        smoothing: float = 1.0, sparse: bool | None = None) -> "NGramModel":
+        """Returns a new `NGramModel` of the phonemes of the inventory of
+        the given language, trained on its registered structures.
+        """
+        model = cls(language.inventory.phonemes, order, smoothing, sparse)
+        model.train(language.structures)
+        return model
+
+    def _get_codes(self, phoneme_ids: array, offsets: array,
+        index: PhonemeIndex) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+        # Returns the code of the n-gram ending at every phoneme and
+        # final boundary, and the word each belongs to
+        import numpy
+
+        n = self._order
+        starts = numpy.asarray(offsets, numpy.int64)
+        lengths = numpy.diff(starts)
+        words = len(lengths)
+        symbols = self._get_translation(index)[
+            numpy.asarray(phoneme_ids, numpy.intp)]
+
+        # Each word is laid out as n - 1 boundaries, its phonemes and a
+        # final boundary, words following each other
+        padded = numpy.full(len(symbols) + n * words, self._boundary, numpy.int64)
+        shifts = numpy.arange(words, dtype=numpy.int64) * n + (n - 1)
+        padded[numpy.arange(len(symbols)) + numpy.repeat(shifts, lengths)] = symbols
+
+        # Every position but the n - 1 leading boundaries of each word
+        # is predicted
+        predicted = numpy.ones(len(padded), bool)
+        leading = (starts[:-1] + numpy.arange(words, dtype=numpy.int64) * n)
+        for j in range(n - 1):
+            predicted[leading + j] = False
+        positions = numpy.flatnonzero(predicted)
+
+        codes = numpy.zeros(len(positions), numpy.int64)
+        for j in range(n - 1, -1, -1):
+            codes = codes * self._symbols + padded[positions - j]
+        return codes, numpy.repeat(numpy.arange(words), lengths + 1)
+
+    def _get_symbol(self, phoneme: Phoneme) -> int:
+        # The symbol of the given phoneme, where phonemes standing for
+        # their symbols, such as those generated by Formulang, are the
+        # phoneme of the model with the same symbol
+        if phoneme in self._index:
+            return self._index.get_id(phoneme)
+        if phoneme.stands_for_symbol:
+            try:
+                return self._index.get_symbol_id(phoneme.symbol)
+            except KeyError:
+                pass
+        return self._unknown
+
+    def _get_translation(self, index: PhonemeIndex) -> "numpy.ndarray":
+        # The symbol of each ID of the given index, computed again once
+        # the index grows
+        import numpy
+
+        cached = self._translations.get(id(index))
+        if cached is not None and cached[0] is index and len(cached[1]) == len(index):
+            return cached[1]
+        translation = numpy.array([self._get_symbol(p) for p in index], numpy.int64)
+        self._translations[id(index)] = (index, translation)
+        return translation
+
+    def _look_up(self, codes: "numpy.ndarray", contexts: bool) -> "numpy.ndarray":
+        import numpy
+
+        counts = self._context_counts if contexts else self._counts
+        if not self._sparse:
+            return counts[codes]
+        keys = self._context_codes if contexts else self._codes
+        if len(keys) == 0:
+            return numpy.zeros(len(codes), numpy.int64)
+        positions = numpy.searchsorted(keys, codes)
+        positions[positions == len(keys)] = 0
+        return numpy.where(keys[positions] == codes, counts[positions], 0)
+
+    @staticmethod
+    def _merge(codes: "numpy.ndarray", counts: "numpy.ndarray",
+        new_codes: "numpy.ndarray", new_counts: "numpy.ndarray") -> tuple["numpy.ndarray", "numpy.ndarray"]:
+        import numpy
+
+        merged, inverse = numpy.unique(numpy.concatenate((codes, new_codes)),
+            return_inverse=True)
+        totals = numpy.bincount(inverse, weights=numpy.concatenate(
+            (counts, new_counts)), minlength=len(merged))
+        return merged, totals.astype(numpy.int64)
@@ -1,12 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from clck.common.registry import RegistryView, WeakRegistry
+
 
 
 class PhonologicalProperty(ABC):
 
-    properties: list["PhonologicalProperty"] = []
-    property_names: list[str] = []
+    properties: WeakRegistry["PhonologicalProperty"] = WeakRegistry()
+    """The registry of all live phonological properties."""
+
+    property_names = RegistryView[tuple[str, ...]](lambda: tuple([p.name
+        for p in PhonologicalProperty.properties]))
+    """The names of the properties of `properties`."""
     _id: int = 1
     
     @abstractmethod
@@ -16,8 +22,7 @@ class PhonologicalProperty(ABC):
         self._id: int = self.__class__._id
         
         self.__class__._increment_class_vars()
-        self.__class__.properties.append(self)
-        self.__class__.property_names.append(self._name)
+        self.__class__.properties.add(self)
 
     def __str__(self) -> str:
         return (f"{self.__class__.__name__} property (id={self._id}) "
@@ -0,0 +1,206 @@
+from array import array
+from typing import Callable, Iterable
+
+
+DEAD_STATE: int = -1
+"""The state an automaton enters once a sequence can no longer be
+accepted."""
+
+
+_COMPONENT_TYPES: list[type] = []
+_COMPONENT_TYPE_IDS: dict[type, int] = {}
+
+
+def get_component_type_id(cls: type) -> int:
+    """Returns the compact integer ID of the given component class,
+    assigning a new one on its first use.
+
+    Parameters
+    ----------
+    cls : type
+        the component class
+
+    Returns
+    -------
+    int
+        the ID of the class
+    """
+    try:
+        return _COMPONENT_TYPE_IDS[cls]
+    except KeyError:
+        _COMPONENT_TYPE_IDS[cls] = len(_COMPONENT_TYPES)
+        _COMPONENT_TYPES.append(cls)
+        return _COMPONENT_TYPE_IDS[cls]
+
+
+def get_component_type(id: int) -> type:
+    """Returns the component class of the given type ID."""
+    return _COMPONENT_TYPES[id]
+
+
+def get_type_ids(elements: Iterable[object]) -> array:
+    """Returns the type IDs of the given components as an
+    `array('H')`. Classes are mapped to their own IDs.
+    """
+    return array("H", [get_component_type_id(e if isinstance(e, type)
+        else e.__class__) for e in elements])
+
+
+def pack_type_ids(sequences: Iterable[Iterable[object]]) -> tuple[array, array]:
+    """Packs the type IDs of many sequences of components into one
+    `array('H')` of IDs and an `array('I')` of offsets, where sequence
+    `i` spans `ids[offsets[i]:offsets[i + 1]]`.
+    """
+    ids = array("H")
+    offsets = array("I", [0])
+    for s in sequences:
+        ids.extend(get_type_ids(s))
+        offsets.append(len(ids))
+    return (ids, offsets)
+
+
+class BlueprintAutomaton:
+    """The class for deterministic finite automata over component type
+    IDs.
+
+    A `BlueprintAutomaton` is the compiled form of a blueprint. It
+    validates a sequence of component types in a single linear pass.
+    Transitions are computed on demand, since the alphabet of component
+    classes is open, and each `(state, type ID)` transition is only ever
+    computed once.
+    """
+
+    def __init__(self, step: Callable[[int, type], int],
+        accepting: Iterable[int], start: int = 0) -> None:
+        """Creates a new `BlueprintAutomaton`.
+
+        Parameters
+        ----------
+        step : Callable[[int, type], int]
+            the transition function returning the next state for a state
+            and a component class, or `DEAD_STATE`
+        accepting : Iterable[int]
+            the accepting states
+        start : int, optional
+            the start state, by default 0
+        """
+        self._step = step
+        self._accepting = frozenset(accepting)
+        self._start = start
+        self._table: dict[int, dict[int, int]] = {}
+
+    @property
+    def state_count(self) -> int:
+        """The number of states reached so far."""
+        return len(self._table)
+
+    def accepts(self, type_ids: Iterable[int]) -> bool:
+        """Returns `True` if the given sequence of type IDs is accepted
+        by this automaton, otherwise returns `False`.
+        """
+        state = self._start
+        for t in type_ids:
+            state = self._next(state, t)
+            if state == DEAD_STATE:
+                return False
+        return state in self._accepting
+
+    def accepts_types(self, elements: Iterable[object]) -> bool:
+        """Returns `True` if the types of the given components or
+        classes are accepted by this automaton.
+        """
+        return self.accepts(get_type_ids(elements))
+
+    def accepts_many(self, type_ids: array, offsets: array) -> list[bool]:
+        """Validates many sequences packed by `pack_type_ids()` and
+        returns one result per sequence.
+
+        Parameters
+        ----------
+        type_ids : array
+            the concatenated type IDs of all sequences
+        offsets : array
+            the offsets of each sequence in `type_ids`, followed by the
+            total length
+
+        Returns
+        -------
+        list[bool]
+            whether or not each sequence is accepted
+        """
+        results: list[bool] = []
+        accepting = self._accepting
+        for i in range(len(offsets) - 1):
+            state = self._start
+            for j in range(offsets[i], offsets[i + 1]):
+                state = self._next(state, type_ids[j])
+                if state == DEAD_STATE:
+                    break
+            results.append(state in accepting)
+        return results
+
+    def _next(self, state: int, type_id: int) -> int:
+        try:
+            row = self._table[state]
+        except KeyError:
+            row = self._table[state] = {}
+        try:
+            return row[type_id]
+        except KeyError:
+            next_state = row[type_id] = self._step(state,
+                _COMPONENT_TYPES[type_id])
+            return next_state
+
+
+def compile_sequence_automaton(predicates: tuple[Callable[[type], bool], ...]) -> BlueprintAutomaton:
+    """Returns an automaton accepting the sequences of exactly
+    `len(predicates)` types where the `i`-th type satisfies the `i`-th
+    predicate.
+    """
+    size = len(predicates)
+
+    def step(state: int, cls: type) -> int:
+        if state < size and predicates[state](cls):
+            return state + 1
+        return DEAD_STATE
+
+    return BlueprintAutomaton(step, (size,))
+
+
+def compile_bound_automaton(predicate: Callable[[type], bool] | None,
+    limit_size: int = 0, accept_empty: bool = True) -> BlueprintAutomaton:
+    """Returns an automaton accepting the sequences that contain at
+    least one type satisfying `predicate`, as checked by flexible
+    blueprints.
+
+    Parameters
+    ----------
+    predicate : Callable[[type], bool] | None
+        the predicate of the allowed types, or `None` if any type is
+        allowed
+    limit_size : int, optional
+        the exact length of accepted non-empty sequences, or 0 for any
+        length, by default 0
+    accept_empty : bool, optional
+        whether or not the empty sequence is accepted, by default `True`
+    """
+    # States encode (length, seen) as 2 * length + seen. Without a size
+    # limit, the length is capped at 1 since only emptiness matters.
+    cap = limit_size if limit_size > 0 else 1
+
+    def step(state: int, cls: type) -> int:
+        length, seen = divmod(state, 2)
+        if length < cap:
+            length += 1
+        elif limit_size > 0:
+            return DEAD_STATE
+        if not seen and (predicate is None or predicate(cls)):
+            seen = 1
+        return 2 * length + seen
+
+    accepting = {2 * cap + 1}
+    if predicate is None:
+        accepting.add(2 * cap)
+    if accept_empty:
+        accepting.add(0)
+    return BlueprintAutomaton(step, accepting)
@@ -0,0 +1,162 @@
+from typing import Any, Iterable
+
+from clck.common.component import Component, ComponentBlueprint
+from clck.common.structure import Structure
+from clck.exceptions import CLCKException
+
+
+class _Frame:
+    """A structure under construction inside a `StructureBuilder`."""
+
+    def __init__(self, type: type[Structure[Any]],
+        _bp: ComponentBlueprint | None) -> None:
+        self.type = type
+        self.given_bp = _bp
+        self.blueprint = _bp if _bp else type.get_shared_default_blueprint()
+        self.components: list[Component] = []
+
+
+class StructureBuilder:
+    """The class for `StructureBuilder`.
+
+    A `StructureBuilder` is a mutable accumulator used to construct a
+    `Structure` component by component. Components are collected in
+    plain lists and each structure is only created once, when it is
+    closed or when the builder is frozen. This avoids recreating
+    intermediate structures and the quadratic cost of growing tuples
+    one component at a time.
+
+    Structures are created exactly like their constructors would create
+    them from the collected components, so that components not fitting
+    the blueprint are reconstructed the same way. Components that
+    already fit are checked once and kept as they are.
+
+    Below demonstrates building a syllable with an onset cluster.::
+
+        builder = StructureBuilder(Syllable)
+        builder.open(Onset)
+        builder.extend((s, t))
+        builder.close()
+        builder.append(Nucleus((a,)))
+        builder.open(Coda)
+        syllable = builder.freeze()
+    """
+
+    def __init__(self, type: type[Structure[Any]] = Structure,
+        _bp: ComponentBlueprint | None = None) -> None:
+        """Creates a new `StructureBuilder` for a structure of the given
+        type.
+
+        Parameters
+        ----------
+        type : type[Structure], optional
+            the `Structure` subclass to build, by default `Structure`
+        _bp : ComponentBlueprint | None, optional
+            the blueprint to build the structure with, by default the
+            class' default blueprint
+        """
+        self._frames: list[_Frame] = [_Frame(type, _bp)]
+        self._frozen: bool = False
+
+    @property
+    def depth(self) -> int:
+        """The number of substructures currently opened and not yet
+        closed.
+        """
+        return len(self._frames) - 1
+
+    def append(self, component: Component) -> None:
+        """Adds a component to the structure currently being built.
+        Components are checked against the blueprint of the structure
+        once it is created.
+
+        Parameters
+        ----------
+        component : Component
+            the component to add
+        """
+        self._assert_not_frozen()
+        self._frames[-1].components.append(component)
+
+    def extend(self, components: Iterable[Component]) -> None:
+        """Adds each of the given components to the structure currently
+        being built.
+        """
+        self._assert_not_frozen()
+        self._frames[-1].components.extend(components)
+
+    def open(self, type: type[Structure[Any]] = Structure,
+        _bp: ComponentBlueprint | None = None) -> None:
+        """Starts building a substructure of the given type. Components
+        added afterwards belong to the substructure until `close()` is
+        called.
+
+        Parameters
+        ----------
+        type : type[Structure], optional
+            the `Structure` subclass of the substructure, by default
+            `Structure`
+        _bp : ComponentBlueprint | None, optional
+            the blueprint to build the substructure with, by default the
+            class' default blueprint
+        """
+        self._assert_not_frozen()
+        self._frames.append(_Frame(type, _bp))
+
+    def close(self) -> Structure[Any]:
+        """Finishes the substructure opened last, creates it and adds it
+        to its parent structure.
+
+        Returns
+        -------
+        Structure
+            the created substructure
+
+        Raises
+        ------
+        CLCKException
+            if there is no opened substructure
+        """
+        self._assert_not_frozen()
+        if len(self._frames) == 1:
+            raise CLCKException("There is no opened substructure to close")
+
+        structure = self._build(self._frames.pop())
+        self.append(structure)
+        return structure
+
+    def freeze(self) -> Structure[Any]:
+        """Closes all opened substructures and returns the finished
+        structure. The builder cannot be used anymore afterwards.
+
+        Returns
+        -------
+        Structure
+            the finished structure
+        """
+        self._assert_not_frozen()
+        while len(self._frames) > 1:
+            self.close()
+
+        self._frozen = True
+        return self._build(self._frames.pop())
+
+    def _assert_not_frozen(self) -> None:
+        if self._frozen:
+            raise CLCKException("StructureBuilder has already been frozen")
+
+    def _build(self, frame: _Frame) -> Structure[Any]:
+        components = tuple(frame.components)
+
+        # Fitting components would be kept as they are by the
+        # constructor, so they are not checked a second time
+        if ComponentBlueprint(*components).is_compatible_to(frame.blueprint):
+            with Structure.trusted():
+                return self._create(frame, components)
+        return self._create(frame, components)
+
+    @staticmethod
+    def _create(frame: _Frame, components: tuple[Component, ...]) -> Structure[Any]:
+        if frame.given_bp:
+            return frame.type(components, _bp=frame.given_bp)
+        return frame.type(components)
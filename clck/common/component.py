@@ -1,11 +1,19 @@
 from abc import ABC, abstractmethod
 from types import UnionType
-from typing import TypeAlias, TypeVar, Union
+from typing import Any, Callable, TypeAlias, TypeVar, Union
+
+from clck.common.automata import BlueprintAutomaton
+from clck.common.automata import compile_bound_automaton
+from clck.common.automata import compile_sequence_automaton
 
 # from clck.formulang.common import generate
 
 ComponentT = TypeVar("ComponentT", bound="Component")
 
+_MAX_CACHED_RESULTS = 4096
+"""The number of compatibility results a blueprint remembers before
+starting over."""
+
 
 class Component(ABC):
     """The class denoting all abstract representations of linguistic
@@ -145,6 +153,26 @@ class DummyComponent(Component):
 
 BlueprintElement: TypeAlias = Union["ComponentBlueprint", ComponentT, type[ComponentT]]
 
+ElementMatcher: TypeAlias = Callable[[Any], bool]
+"""A compiled predicate telling whether an element of a candidate
+blueprint can be substituted to one element of a target blueprint.
+"""
+
+_UNSET: Any = object()
+
+_structure_cls: type | None = None
+
+
+def _get_structure_class() -> type:
+    """Returns the `Structure` class. It is imported on first use only
+    since `clck.common.structure` depends on this module.
+    """
+    global _structure_cls
+    if _structure_cls is None:
+        from clck.common.structure import Structure
+        _structure_cls = Structure
+    return _structure_cls
+
 
 class ComponentBlueprint:
     """The class for all component blueprints.
@@ -180,6 +208,20 @@ class ComponentBlueprint:
     But not if `B` contains a different instance even if it's the same
     type as `A`'s.
 
+    Compiled Matching
+    -----------------
+    A blueprint is compiled once, on its first compatibility check,
+    into a matcher with one predicate per element. If a blueprint only
+    contains types, the result of a check only depends on the types of
+    the candidate's elements, so results are memoized on that type
+    signature and repeated checks for the same shapes are dictionary
+    lookups.
+
+    Blueprints can also be compiled into a `BlueprintAutomaton` using
+    `get_automaton()`, a finite automaton over component type IDs that
+    validates a sequence of component types of any length in a single
+    pass, including many packed sequences at once.
+
     --------------------------------------------------------------------
 
     
@@ -188,6 +230,11 @@ class ComponentBlueprint:
         strict: bool = True) -> None:
         self._e = comps
         self._is_strict = strict
+        self._matcher: Callable[["ComponentBlueprint"], bool] | None = None
+        self._type_only: bool | None = None
+        self._signature: Any = _UNSET
+        self._compat_cache: dict[Any, bool] = {}
+        self._automaton: BlueprintAutomaton | None = None
 
     def __eq__(self, __value: object) -> bool:
         if isinstance(__value, ComponentBlueprint):
@@ -225,6 +272,23 @@ class ComponentBlueprint:
         """
         return len(self._e)
 
+    def get_automaton(self) -> BlueprintAutomaton:
+        """Returns the automaton accepting the sequences of component
+        types that are compatible to this blueprint.
+
+        The automaton decides compatibility from the types of the
+        elements only. Structures are therefore checked by their class
+        and not by their own contents, as a class-level blueprint would.
+
+        Returns
+        -------
+        BlueprintAutomaton
+            the compiled automaton of this blueprint
+        """
+        if self._automaton is None:
+            self._automaton = self._compile_automaton()
+        return self._automaton
+
     def is_compatible_to(self, cb: "ComponentBlueprint") -> bool:
         """Returns `True` if this ComponentBlueprint instance is
         compatible to the given component blueprint `cb`, that is, if
@@ -244,19 +308,19 @@ class ComponentBlueprint:
             component blueprint
         """
 
-        if cb.is_reverse_compatible(self):
-            pass
-        elif len(self._e) != len(cb._e):
-            return False
-
-        for i, b in enumerate(cb._e):
-            a = self._e[i]
-            if self._match_cases(a, b):
-                continue
-            else:
-                return False
+        # The bound of a flexible blueprint counts too, since instances
+        # in it are matched by equality and not by type
+        signature = self._get_signature()
+        if signature is None or not self._is_type_only_element(cb):
+            return cb._get_matcher()(self)
 
-        return True
+        try:
+            return cb._compat_cache[signature]
+        except KeyError:
+            if len(cb._compat_cache) >= _MAX_CACHED_RESULTS:
+                cb._compat_cache.clear()
+            result = cb._compat_cache[signature] = cb._get_matcher()(self)
+            return result
 
     def is_reverse_compatible(self, cb: "ComponentBlueprint") -> bool:
         """Returns `True` if `cb` is compatible to this instance,
@@ -275,9 +339,107 @@ class ComponentBlueprint:
         """
         return False
 
+    def _compile(self) -> Callable[["ComponentBlueprint"], bool]:
+        """Compiles this blueprint into a matcher function that tells
+        whether a candidate blueprint is compatible to this blueprint.
+        """
+        predicates = tuple(self._compile_element(b) for b in self._e)
+        size = len(predicates)
+        reverse_compatible = self.is_reverse_compatible
+        has_reverse = (type(self).is_reverse_compatible
+            is not ComponentBlueprint.is_reverse_compatible)
+
+        def match(candidate: ComponentBlueprint) -> bool:
+            if has_reverse and reverse_compatible(candidate):
+                return True
+
+            elements = candidate._e
+            if len(elements) != size:
+                return False
+
+            for predicate, a in zip(predicates, elements):
+                if not predicate(a):
+                    return False
+            return True
+
+        return match
+
+    def _compile_automaton(self) -> BlueprintAutomaton:
+        return compile_sequence_automaton(
+            tuple(self._compile_element(b) for b in self._e))
+
+    def _compile_element(self, b: BlueprintElement[ComponentT]) -> ElementMatcher:
+        """Compiles one element of this blueprint into a predicate that
+        is equivalent to `_match_cases(a, b)` for any candidate element
+        `a`.
+        """
+        if isinstance(b, type):
+            if issubclass(b, AnyBlueprint):
+                return lambda a: not isinstance(a, AnyBlueprint)
+
+            def match_type(a: Any) -> bool:
+                if isinstance(a, Component):
+                    return isinstance(a, b)
+                return isinstance(a, type) and issubclass(a, b)
+
+            return match_type
+
+        match_cases = self._match_cases
+        return lambda a: match_cases(a, b)
+
+    def _get_matcher(self) -> Callable[["ComponentBlueprint"], bool]:
+        if self._matcher is None:
+            self._matcher = self._compile()
+        return self._matcher
+
+    def _get_signature(self) -> Any:
+        """Returns the type signature of this blueprint's elements, or
+        `None` if one of its elements cannot be summarized by its type.
+        """
+        if self._signature is _UNSET:
+            self._signature = self._signature_of_elements(self._e)
+        return self._signature
+
+    def _is_type_only(self) -> bool:
+        """Returns `True` if this blueprint, including its nested
+        blueprints, only contains types and no component instances.
+        """
+        if self._type_only is None:
+            self._type_only = all(self._is_type_only_element(e)
+                for e in self._e)
+        return self._type_only
+
+    @staticmethod
+    def _is_type_only_element(e: Any) -> bool:
+        if isinstance(e, AnyBlueprint):
+            return e._is_type_only() and all(
+                ComponentBlueprint._is_type_only_element(b) for b in e._bound)
+        elif isinstance(e, ComponentBlueprint):
+            return e._is_type_only()
+        else:
+            return isinstance(e, type)
+
+    @staticmethod
+    def _signature_of_elements(elements: tuple[Any, ...]) -> Any:
+        signature: list[Any] = []
+        for e in elements:
+            if isinstance(e, type):
+                signature.append(e)
+            elif isinstance(e, _get_structure_class()):
+                # Structures are matched through their own blueprints
+                s = e._blueprint._get_signature()
+                if s is None:
+                    return None
+                signature.append((e.__class__, s))
+            elif isinstance(e, Component):
+                signature.append(e.__class__)
+            else:
+                return None
+        return tuple(signature)
+
     def _match_cases(self, a: BlueprintElement[ComponentT],
         b: BlueprintElement[ComponentT]) -> bool:
-        from clck.common.structure import Structure
+        Structure = _get_structure_class()
 
         if a == b:
             return True
@@ -306,14 +468,23 @@ class AnyBlueprint(ComponentBlueprint):
     def __init__(self, *bound: BlueprintElement[ComponentT]) -> None:
         super().__init__()
         self._bound = bound
+        self._bound_matchers: tuple[ElementMatcher, ...] | None = None
+        self._bound_automaton: BlueprintAutomaton | None = None
+        self._eq_cache: dict[Any, bool] = {}
 
     def __eq__(self, __value: object) -> bool:
         if isinstance(__value, ComponentBlueprint):
-            for b in self._bound:
-                for a in __value._e:
-                    if self._match_cases(a, b):
-                        return True
-            return False
+            signature = __value._get_signature()
+            if signature is None or not self._is_type_only_element(self):
+                return self._matches_any(__value)
+
+            try:
+                return self._eq_cache[signature]
+            except KeyError:
+                if len(self._eq_cache) >= _MAX_CACHED_RESULTS:
+                    self._eq_cache.clear()
+                result = self._eq_cache[signature] = self._matches_any(__value)
+                return result
         else:
             return False
     
@@ -323,6 +494,54 @@ class AnyBlueprint(ComponentBlueprint):
         """
         return self._bound
 
+    def _get_bound_matchers(self) -> tuple[ElementMatcher, ...]:
+        if self._bound_matchers is None:
+            self._bound_matchers = tuple(self._compile_element(b)
+                for b in self._bound)
+        return self._bound_matchers
+
+    def _get_bound_predicate(self) -> ElementMatcher | None:
+        """Returns the predicate telling whether a class matches any of
+        the bound elements, or `None` if this blueprint has no bound.
+        """
+        if self._bound == ():
+            return None
+        matchers = self._get_bound_matchers()
+        return lambda cls: any(match(cls) for match in matchers)
+
+    def _is_bound_decidable(self) -> bool:
+        """Returns `True` if the bound elements can be matched from the
+        types of candidate elements alone.
+        """
+        for b in self._bound:
+            if isinstance(b, AnyBlueprint):
+                if not b._is_bound_decidable():
+                    return False
+            elif not isinstance(b, type):
+                return False
+        return True
+
+    def _matches_any(self, cb: ComponentBlueprint) -> bool:
+        """Returns `True` if any element of `cb` matches any of the
+        bound elements of this blueprint.
+        """
+        if self._is_bound_decidable() and all(
+            isinstance(a, type) or (isinstance(a, Component)
+                and not isinstance(a, _get_structure_class()))
+            for a in cb._e):
+            if self._bound_automaton is None:
+                predicate = self._get_bound_predicate()
+                self._bound_automaton = compile_bound_automaton(
+                    predicate or (lambda cls: False), accept_empty=False)
+            return self._bound_automaton.accepts_types(cb._e)
+
+        matchers = self._get_bound_matchers()
+        for a in cb._e:
+            for match in matchers:
+                if match(a):
+                    return True
+        return False
+
 
 class FlexibleBlueprint(AnyBlueprint):
     def __init__(self, bound: tuple[BlueprintElement[ComponentT], ...] = (),
@@ -334,6 +553,10 @@ class FlexibleBlueprint(AnyBlueprint):
     def limit_size(self) -> int:
         return self._limit_size
 
+    def _compile_automaton(self) -> BlueprintAutomaton:
+        return compile_bound_automaton(self._get_bound_predicate(),
+            self._limit_size)
+
     def is_reverse_compatible(self, cb: ComponentBlueprint) -> bool:
         if self._limit_size == 0:
             pass
@@ -345,9 +568,4 @@ class FlexibleBlueprint(AnyBlueprint):
         if self._bound == ():
             return True
 
-        for b in cb._e:
-            for a in self._bound:
-                if self._match_cases(b, a):
-                    return True
-        
-        return False
\ No newline at end of file
+        return self._matches_any(cb)
\ No newline at end of file
@@ -0,0 +1,395 @@
+from array import array
+from typing import Any, Iterable, Iterator, Sequence
+
+from clck.common.automata import get_component_type
+from clck.common.automata import get_component_type_id
+from clck.common.structure import EmptyStructure, Structure
+from clck.exceptions import CLCKException
+from clck.phonology.phonemes import ConsonantPhoneme
+from clck.phonology.phonemes import Phoneme
+from clck.phonology.phonemes import VowelPhoneme
+
+
+class PhonemeIndex:
+    """The class that assigns compact integer IDs to phonemes.
+
+    IDs are handed out in registration order, starting from zero, and
+    never change afterwards. Phonemes are indexed by identity, so two
+    distinct `Phoneme` objects with the same symbol receive two IDs.
+    Phonemes standing for their symbols (see
+    `Phoneme.stands_for_symbol`), such as those generated by Formulang,
+    are the exception: they receive the ID of the first phoneme
+    registered with their symbol.
+    """
+
+    def __init__(self, *phonemes: Phoneme) -> None:
+        """Creates a new `PhonemeIndex` with the given initial
+        phonemes.
+
+        Parameters
+        ----------
+        *phonemes : Phoneme
+            the phonemes to register, in ID order
+        """
+        self._phonemes: list[Phoneme] = []
+        self._ids: dict[int, int] = {}
+        self._symbol_ids: dict[str, int] = {}
+        for phoneme in phonemes:
+            self.get_id(phoneme)
+
+    def __contains__(self, phoneme: object) -> bool:
+        return id(phoneme) in self._ids
+
+    def __getitem__(self, id: int) -> Phoneme:
+        return self._phonemes[id]
+
+    def __iter__(self) -> Iterator[Phoneme]:
+        return iter(self._phonemes)
+
+    def __len__(self) -> int:
+        return len(self._phonemes)
+
+    @property
+    def phonemes(self) -> tuple[Phoneme, ...]:
+        """The registered phonemes, ordered by their IDs."""
+        return tuple(self._phonemes)
+
+    def get_id(self, phoneme: Phoneme) -> int:
+        """Returns the ID of the given phoneme, registering it first if
+        it is not yet in this index. A phoneme standing for its symbol
+        is only registered if no phoneme has its symbol yet.
+
+        Parameters
+        ----------
+        phoneme : Phoneme
+            the phoneme to look up
+
+        Returns
+        -------
+        int
+            the ID of the phoneme
+        """
+        try:
+            return self._ids[id(phoneme)]
+        except KeyError:
+            if phoneme.stands_for_symbol:
+                pid = self._symbol_ids.get(phoneme.symbol)
+                if pid is not None:
+                    return pid
+            pid = len(self._phonemes)
+            if pid > 0xFFFF:
+                raise CLCKException("PhonemeIndex cannot hold more than 65536 phonemes")
+            self._phonemes.append(phoneme)
+            self._ids[id(phoneme)] = pid
+            self._symbol_ids.setdefault(phoneme.symbol, pid)
+            return pid
+
+    def get_ids(self, phonemes: tuple[Phoneme, ...] | list[Phoneme]) -> array:
+        """Returns the IDs of the given phonemes as an `array('H')`.
+        """
+        return array("H", [self.get_id(p) for p in phonemes])
+
+    def get_symbol_id(self, symbol: str) -> int:
+        """Returns the ID of the first phoneme registered with the given
+        symbol.
+
+        Raises
+        ------
+        KeyError
+            if no registered phoneme has the given symbol
+        """
+        return self._symbol_ids[symbol]
+
+
+DEFAULT_PHONEME_INDEX = PhonemeIndex()
+"""The phoneme index used by `PackedStructure` when none is given."""
+
+
+# Field offsets of a node record in PackedStructure._nodes
+_TYPE, _CHILD_START, _CHILD_END, _PHONEME_START, _PHONEME_END, _SUBTREE_END = range(6)
+_NODE_STRIDE = 6
+
+
+class PackedStructure:
+    """The array-backed, read-only counterpart of a `Structure` tree.
+
+    A `PackedStructure` stores a whole structure tree in three flat
+    arrays instead of one object per node:
+
+    - the phoneme IDs of all leaves in an `array('H')`, in reading order
+    - one fixed-size record per node in preorder, holding the node's
+      type, the range of its children and the range of its phonemes
+    - the children of all nodes back to back (CSR-style), each entry
+      pointing either to a node or to a phoneme position
+
+    Because the phonemes of any subtree are contiguous, queries such as
+    `phonemes` or `output` are plain slices of the phoneme array. The
+    same read API as `Structure` is available, and `to_structure()`
+    converts back to an ordinary `Structure` tree.
+
+    Below demonstrates packing and unpacking a syllable.::
+
+        packed = PackedStructure.from_structure(syllable)
+        packed.output
+        packed.to_structure()
+    """
+
+    __slots__ = ("_index", "_phoneme_ids", "_nodes", "_children", "_node")
+
+    def __init__(self, index: PhonemeIndex, phoneme_ids: array,
+        nodes: array, children: array, _node: int = 0) -> None:
+        """Creates a new `PackedStructure` from already packed arrays.
+        Use `from_structure()` to pack an existing `Structure`.
+
+        Parameters
+        ----------
+        index : PhonemeIndex
+            the index that resolves the phoneme IDs
+        phoneme_ids : array
+            the `array('H')` of phoneme IDs in reading order
+        nodes : array
+            the flat array of node records in preorder
+        children : array
+            the CSR array of child entries of all nodes
+        """
+        self._index = index
+        self._phoneme_ids = phoneme_ids
+        self._nodes = nodes
+        self._children = children
+        self._node = _node
+
+    def __repr__(self) -> str:
+        return f"<PackedStructure {self.structure_type.__name__} {{{'.'.join(self._get_component_transcripts())}}}>"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    @property
+    def components(self) -> tuple["Phoneme | PackedStructure", ...]:
+        """The components of this structure. Substructures are returned
+        as `PackedStructure` views sharing this instance's arrays.
+        """
+        return tuple(self._iter_components())
+
+    @property
+    def ipa_transcript(self) -> str:
+        return f"/{self.output}/"
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the arrays of the whole packed
+        tree.
+        """
+        return sum(a.buffer_info()[1] * a.itemsize
+            for a in (self._phoneme_ids, self._nodes, self._children))
+
+    @property
+    def output(self) -> str:
+        return "".join([self._index[i].output for i in self.phoneme_ids])
+
+    @property
+    def phoneme_ids(self) -> array:
+        """The IDs of the phonemes of this structure as an
+        `array('H')`.
+        """
+        base = self._node * _NODE_STRIDE
+        return self._phoneme_ids[self._nodes[base + _PHONEME_START]
+            :self._nodes[base + _PHONEME_END]]
+
+    @property
+    def phonemes(self) -> tuple[Phoneme, ...]:
+        """The phonemes of this structure."""
+        index = self._index
+        return tuple([index[i] for i in self.phoneme_ids])
+
+    @property
+    def size(self) -> int:
+        """The number of phonemes of this structure."""
+        base = self._node * _NODE_STRIDE
+        return self._nodes[base + _PHONEME_END] - self._nodes[base + _PHONEME_START]
+
+    @property
+    def substructures(self) -> tuple["PackedStructure", ...]:
+        """The substructures of this structure."""
+        return tuple([c for c in self._iter_components()
+            if isinstance(c, PackedStructure)])
+
+    @property
+    def structure_type(self) -> type[Structure[Any]]:
+        """The `Structure` subclass this node was packed from."""
+        return get_component_type(self._nodes[self._node * _NODE_STRIDE + _TYPE])
+
+    def get_component_type_ids(self) -> array:
+        """Returns the type IDs of the components of this structure as
+        an `array('H')`, as validated by a blueprint's
+        `BlueprintAutomaton`.
+        """
+        base = self._node * _NODE_STRIDE
+        ids = array("H")
+        for i in range(self._nodes[base + _CHILD_START],
+            self._nodes[base + _CHILD_END]):
+            entry = self._children[i]
+            if entry & 1:
+                ids.append(get_component_type_id(
+                    self._index[self._phoneme_ids[entry >> 1]].__class__))
+            else:
+                ids.append(self._nodes[(entry >> 1) * _NODE_STRIDE + _TYPE])
+        return ids
+
+    def get_consonants(self) -> tuple[ConsonantPhoneme, ...]:
+        """Returns all the consonants of this structure."""
+        return self.get_phonemes_by_type(ConsonantPhoneme)
+
+    def get_phonemes_by_type[P: Phoneme](self,
+            type: type[P] = Phoneme) -> tuple[P, ...]:
+        """Returns a tuple of phonemes that are of the specified
+        `Phoneme` type.
+        """
+        return tuple([p for p in self.phonemes if isinstance(p, type)])
+
+    def get_structures_by_type(self,
+            type: type[Structure[Any]]) -> tuple["PackedStructure", ...]:
+        """Returns a tuple of all found substructures whose packed type
+        is the given `Structure` subtype. Like
+        `Structure.get_structures_by_type()`, the subtrees of matching
+        structures are not searched any further.
+        """
+        nodes = self._nodes
+        rl: list[PackedStructure] = []
+        i = self._node + 1
+        end = nodes[self._node * _NODE_STRIDE + _SUBTREE_END]
+        while i < end:
+            base = i * _NODE_STRIDE
+            if issubclass(get_component_type(nodes[base + _TYPE]), type):
+                rl.append(self._view(i))
+                i = nodes[base + _SUBTREE_END]
+            else:
+                i += 1
+        return tuple(rl)
+
+    def get_vowels(self) -> tuple[VowelPhoneme, ...]:
+        """Returns all the vowels of this structure."""
+        return self.get_phonemes_by_type(VowelPhoneme)
+
+    def to_structure(self) -> Structure[Any]:
+        """Returns an ordinary `Structure` tree equivalent to this
+        packed structure.
+        """
+        components: list[Any] = []
+        for c in self._iter_components():
+            if isinstance(c, PackedStructure):
+                components.append(c.to_structure())
+            else:
+                components.append(c)
+
+        cls = self.structure_type
+        if cls is EmptyStructure:
+            return EmptyStructure()
+        return cls(tuple(components))
+
+    @classmethod
+    def from_structure(cls, structure: Structure[Any],
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> "PackedStructure":
+        """Packs the given structure tree into a new `PackedStructure`.
+
+        Components that are neither phonemes nor structures, such as the
+        placeholder of an `EmptyStructure`, carry no phonemic content
+        and are left out.
+
+        Parameters
+        ----------
+        structure : Structure
+            the structure to pack
+        index : PhonemeIndex, optional
+            the index assigning IDs to the phonemes, by default
+            `DEFAULT_PHONEME_INDEX`
+
+        Returns
+        -------
+        PackedStructure
+            the packed structure
+        """
+        phoneme_ids = array("H")
+        nodes = array("I")
+        children = array("I")
+        cls._pack_node(structure, index, phoneme_ids, nodes, children)
+        return cls(index, phoneme_ids, nodes, children)
+
+    @staticmethod
+    def _pack_node(structure: Structure[Any], index: PhonemeIndex,
+        phoneme_ids: array, nodes: array, children: array) -> None:
+        node = len(nodes) // _NODE_STRIDE
+        base = node * _NODE_STRIDE
+        nodes.extend((get_component_type_id(structure.__class__), 0, 0,
+            len(phoneme_ids), 0, 0))
+
+        # Child entries are written after the whole subtree so that the
+        # children of one node stay contiguous in the CSR array
+        entries: list[int] = []
+        for c in structure.components:
+            if isinstance(c, Phoneme):
+                entries.append((len(phoneme_ids) << 1) | 1)
+                phoneme_ids.append(index.get_id(c))
+            elif isinstance(c, Structure):
+                entries.append((len(nodes) // _NODE_STRIDE) << 1)
+                PackedStructure._pack_node(c, index, phoneme_ids, nodes,
+                    children)
+            elif isinstance(c, PackedStructure):
+                raise CLCKException("Cannot pack a structure containing packed structures")
+
+        nodes[base + _CHILD_START] = len(children)
+        children.extend(entries)
+        nodes[base + _CHILD_END] = len(children)
+        nodes[base + _PHONEME_END] = len(phoneme_ids)
+        nodes[base + _SUBTREE_END] = len(nodes) // _NODE_STRIDE
+
+    def _get_component_transcripts(self) -> list[str]:
+        transcripts: list[str] = []
+        for c in self._iter_components():
+            if isinstance(c, PackedStructure):
+                transcripts.append(f"{{{'.'.join(c._get_component_transcripts())}}}")
+            else:
+                transcripts.append(c.formulang_transcript)
+        return transcripts
+
+    def _iter_components(self) -> Iterator["Phoneme | PackedStructure"]:
+        base = self._node * _NODE_STRIDE
+        for i in range(self._nodes[base + _CHILD_START],
+            self._nodes[base + _CHILD_END]):
+            entry = self._children[i]
+            if entry & 1:
+                yield self._index[self._phoneme_ids[entry >> 1]]
+            else:
+                yield self._view(entry >> 1)
+
+    def _view(self, node: int) -> "PackedStructure":
+        return PackedStructure(self._index, self._phoneme_ids, self._nodes,
+            self._children, node)
+
+
+def pack_phoneme_ids(words: Iterable["Structure[Any] | PackedStructure | Sequence[Phoneme]"],
+    index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> tuple[array, array]:
+    """Packs the phoneme IDs of many words, each a structure, packed
+    structure or sequence of phonemes, into one `array('H')` of IDs and
+    an `array('I')` of offsets, where word `i` spans
+    `ids[offsets[i]:offsets[i + 1]]`.
+
+    Parameters
+    ----------
+    words : Iterable[Structure | PackedStructure | Sequence[Phoneme]]
+        the words to pack
+    index : PhonemeIndex, optional
+        the index assigning IDs to the phonemes, by default
+        `DEFAULT_PHONEME_INDEX`
+    """
+    ids = array("H")
+    offsets = array("I", [0])
+    for word in words:
+        if isinstance(word, PackedStructure) and word._index is index:
+            ids.extend(word.phoneme_ids)
+        elif isinstance(word, (Structure, PackedStructure)):
+            ids.extend(index.get_ids(word.phonemes))
+        else:
+            ids.extend(index.get_ids(word)) # type: ignore
+        offsets.append(len(ids))
+    return (ids, offsets)
@@ -0,0 +1,180 @@
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterator, TypeVar
+from weakref import ref
+
+if TYPE_CHECKING:
+    from clck.phonetics.phones import Phone
+    from clck.phonology.phonemes import Phoneme
+
+
+SymbolicT = TypeVar("SymbolicT", bound="Phone | Phoneme")
+T = TypeVar("T")
+
+
+class SymbolRegistry(Generic[SymbolicT]):
+    """The class for `SymbolRegistry`.
+
+    A `SymbolRegistry` holds phones or phonemes in registration order
+    and indexes them by symbol and by class, so that looking one up
+    does not scan every registered item. The first item registered with
+    a symbol is the one found by that symbol.
+
+    A registry can be given a loader, which is called once before the
+    registry is first read. The default IPA registries use it to load
+    the IPA chart on demand.
+
+    Below demonstrates looking up default IPA phonemes.::
+
+        DEFAULT_IPA_PHONEME_REGISTRY.by_symbol("ŋ")
+        DEFAULT_IPA_PHONEME_REGISTRY.by_class(ConsonantPhoneme)
+    """
+
+    def __init__(self, loader: Callable[[], None] | None = None) -> None:
+        """Creates a new empty `SymbolRegistry`.
+
+        Parameters
+        ----------
+        loader : Callable[[], None] | None, optional
+            the function registering the initial items, called on the
+            first read of this registry, by default none
+        """
+        self._loader = loader
+        self._items: list[SymbolicT] = []
+        self._symbols: dict[str, SymbolicT] = {}
+        self._classes: dict[type, list[SymbolicT]] = {}
+        self._items_view: tuple[SymbolicT, ...] | None = None
+        self._symbols_view: tuple[str, ...] | None = None
+        self._class_views: dict[type, tuple[Any, ...]] = {}
+
+    def __contains__(self, symbol: str) -> bool:
+        self._load()
+        return symbol in self._symbols
+
+    def __iter__(self) -> Iterator[SymbolicT]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._items)
+
+    @property
+    def items(self) -> tuple[SymbolicT, ...]:
+        """The registered items, in registration order. The same tuple
+        is returned until another item is registered.
+        """
+        self._load()
+        if self._items_view is None:
+            self._items_view = tuple(self._items)
+        return self._items_view
+
+    @property
+    def symbols(self) -> tuple[str, ...]:
+        """The symbols of the registered items, in registration order.
+        """
+        self._load()
+        if self._symbols_view is None:
+            self._symbols_view = tuple([i.symbol for i in self._items])
+        return self._symbols_view
+
+    def by_symbol(self, symbol: str) -> SymbolicT | None:
+        """Returns the first item registered with the given symbol, or
+        `None` if there is none.
+        """
+        self._load()
+        return self._symbols.get(symbol)
+
+    def by_class(self, cls: type[T]) -> tuple[T, ...]:
+        """Returns the registered items that are instances of the given
+        class, in registration order.
+        """
+        self._load()
+        try:
+            return self._class_views[cls]
+        except KeyError:
+            pass
+
+        if cls in self._classes and not any(c is not cls and issubclass(c, cls)
+            for c in self._classes):
+            view = tuple(self._classes[cls])
+        else:
+            view = tuple([i for i in self._items if isinstance(i, cls)])
+        self._class_views[cls] = view
+        return view # type: ignore
+
+    def register(self, item: SymbolicT) -> None:
+        """Adds the given item to this registry. Registering does not
+        trigger the loader.
+        """
+        self._items.append(item)
+        self._symbols.setdefault(item.symbol, item)
+        self._classes.setdefault(item.__class__, []).append(item)
+        self._items_view = None
+        self._symbols_view = None
+        self._class_views.clear()
+
+    def _load(self) -> None:
+        loader = self._loader
+        if loader is not None:
+            # Cleared first, since the loader may read this registry
+            self._loader = None
+            loader()
+
+
+class WeakRegistry(Generic[T]):
+    """The class for `WeakRegistry`.
+
+    A `WeakRegistry` tracks objects in registration order without
+    keeping them alive. An object leaves the registry as soon as it is
+    garbage collected, so registries shared by all languages do not grow
+    with every temporary object registered in them. Objects are tracked
+    by identity and registering one twice has no effect.
+
+    Membership tests with `in` are by identity as well. This differs
+    from the plain lists the manager registries used to be, which
+    compared with `==`, so an equal but distinct phoneme is no longer
+    found in `PhonemesManager.global_list`.
+    """
+
+    def __init__(self, *items: T) -> None:
+        """Creates a new `WeakRegistry` of the given items.
+        """
+        self._refs: dict[int, ref[T]] = {}
+        self.add(*items)
+
+    def __contains__(self, item: object) -> bool:
+        return id(item) in self._refs
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    @property
+    def items(self) -> tuple[T, ...]:
+        """The live registered items, in registration order."""
+        items = [r() for r in tuple(self._refs.values())]
+        return tuple([i for i in items if i is not None])
+
+    def add(self, *items: T) -> None:
+        """Registers the given items, unless already registered."""
+        refs = self._refs
+        for item in items:
+            key = id(item)
+            if key not in refs:
+                refs[key] = ref(item, lambda _, key=key: refs.pop(key, None))
+
+    def clear(self) -> None:
+        """Unregisters all items."""
+        self._refs.clear()
+
+
+class RegistryView(Generic[T]):
+    """Descriptor exposing a read-only view of a registry as a class
+    attribute, computed by `getter` on every read.
+    """
+
+    def __init__(self, getter: Callable[[], T]) -> None:
+        self._getter = getter
+
+    def __get__(self, instance: Any, owner: type) -> T:
+        return self._getter()
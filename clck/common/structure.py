@@ -1,8 +1,13 @@
-from typing import Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Self, TypeVar, Union
+from weakref import WeakValueDictionary
 
 from clck.common.component import Component, DummyComponent, FlexibleBlueprint
 from clck.common.component import ComponentBlueprint
 from clck.common.interfaces import Initializable
+from clck.config import print_warning
 from clck.exceptions import CLCKException
 from clck.phonology.phonemes import ConsonantPhoneme
 from clck.phonology.phonemes import DummyPhoneme
@@ -13,17 +18,127 @@ from clck.utils import tuple_append
 
 # Deprecated type alias
 # T = TypeVar("T")
-# PhonemeT = TypeVar("PhonemeT", bound=Phoneme)
 # Structurable: TypeAlias = Union["tuple[StructurableT, ...]", StructurableT]
-# StructurableT = TypeVar("StructurableT", bound=Union[Component, "Structure"])
+
+# Deprecated type variables, still used by modules that do not use the
+# PEP 695 syntax yet
+PhonemeT = TypeVar("PhonemeT", bound=Phoneme)
+StructurableT = TypeVar("StructurableT", bound=Union[Component, "Structure[Any]"])
 
 type Structurable[C: Component] = Union[tuple[C, ...], C, Structure[C]]
 
+
+@dataclass(frozen=True)
+class InternStats:
+    """A snapshot of the hit and miss counts of the structure intern
+    table used by `Structure.interned()`.
+    """
+
+    hits: int
+    """The number of constructions answered by an existing instance."""
+
+    misses: int
+    """The number of constructions that created a new instance."""
+
+    size: int
+    """The number of interned instances that are still alive."""
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of hits to all interned constructions."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+class _InternTable:
+    """The weak-value table behind `Structure.interned()`.
+
+    Keys are derived from the class being constructed and from its
+    constructor arguments. Leaf components such as phonemes are keyed by
+    identity, while substructures are keyed by their own structural key,
+    so two equal subtrees built from the same phonemes share one entry.
+    Entries disappear once the interned structure is no longer
+    referenced anywhere else.
+    """
+
+    def __init__(self) -> None:
+        self._table: WeakValueDictionary[tuple[Any, ...], Structure[Any]] = WeakValueDictionary()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def intern[S: "Structure[Any]"](self, cls: type[S], *args: object) -> S:
+        # A single tuple argument is the structurable itself, so it is
+        # keyed the same way as the components of a built structure
+        if len(args) == 1 and isinstance(args[0], tuple):
+            key = (cls, self._key_of(args[0]))
+        else:
+            key = (cls, self._key_of(args))
+        found = self._table.get(key)
+        if found is not None:
+            self._hits += 1
+            return found  # type: ignore
+
+        self._misses += 1
+        structure = cls(*args)
+        structure._intern_key = key
+        self._table[key] = structure
+        return structure
+
+    def clear(self) -> None:
+        self._table.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def get_stats(self) -> InternStats:
+        return InternStats(self._hits, self._misses, len(self._table))
+
+    def _key_of(self, o: object) -> Any:
+        if isinstance(o, tuple):
+            return tuple(self._key_of(e) for e in o)
+        elif isinstance(o, Structure):
+            if o._intern_key is not None:
+                return o._intern_key
+            return (o.__class__, self._key_of(o._components))
+        else:
+            # Phonemes, blueprints and other leaves are compared by
+            # identity. They stay alive as long as the interned
+            # structure holding them does, so their ids cannot be reused
+            # while the entry exists.
+            return id(o)
+
+
+_INTERN_TABLE = _InternTable()
+
+_DEFAULT_BLUEPRINTS: dict[type, ComponentBlueprint] = {}
+"""The cache of the default blueprint of each `Structure` subclass."""
+
+_TRUSTED: ContextVar[bool] = ContextVar("_TRUSTED", default=False)
+"""Whether or not structures are currently created in trusted mode."""
+
+
 class Structure[C: Component](Component, Initializable):
     """The base class that represents all CLCK structures.
 
     A structure is a component that can contain other components.
     """
+
+    _intern_key: Any = None
+    """The key of this instance in the intern table if it was created
+    through `interned()`, otherwise `None`.
+    """
+
+    _phoneme_index: dict[type, tuple[Any, ...]] | None = None
+    """The per-type index of this structure's phonemes, available after
+    calling `build_type_index()`.
+    """
+
+    _structure_index: dict[type, tuple[Any, ...]] | None = None
+    """The per-type index of this structure's substructures, available
+    after calling `build_type_index()`.
+    """
+
     def __init__(self, structurable: Structurable[C],
         _bp: ComponentBlueprint | None = None) -> None:
         """Creates a new instance of `Structure` given the only valid
@@ -70,9 +185,15 @@ class Structure[C: Component](Component, Initializable):
             self._init_romanization(),
             self._init_default_bp(_bp),
             self._init_blueprint())
+
+        # Structures created in trusted mode are correct by construction
+        # and can be checked later on using validate()
+        if _TRUSTED.get():
+            return
+
         try:
             self._assert_blueprint_compatibility()
-        except:
+        except CLCKException:
             self._try_blueprints(self._components)
 
     def __str__(self) -> str:
@@ -101,7 +222,7 @@ class Structure[C: Component](Component, Initializable):
     @property
     def phonemes(self) -> tuple[Phoneme, ...]:
         """The phones of this structure."""
-        return tuple(self._phonemes)
+        return self._phonemes
 
     @property
     def size(self) -> int:
@@ -111,7 +232,7 @@ class Structure[C: Component](Component, Initializable):
     @property
     def substructures(self) -> tuple["Structure[C]", ...]:
         """The substructures of this structure."""
-        return tuple(self._substructures)
+        return self._substructures
 
     def get_phonemes_by_type[P: Phoneme](self,
             type: type[P] = Phoneme) -> tuple[P, ...]:
@@ -120,18 +241,20 @@ class Structure[C: Component](Component, Initializable):
         type. If no argument is given, it returns all the phonemes of
         this structure.
 
+        If the type index of this structure has been built using
+        `build_type_index()`, the result is looked up directly instead
+        of traversing the structure.
+
         Parameters
         ----------
         - `type` - is the `Phone` subtype to find. Defaults to `Phone`.
         """
-        rl: list[P] = []
-        for s in self._components:
-            if isinstance(s, type):
-                rl.append(s)
-            else:
-                if isinstance(s, Structure):
-                    rl.extend(s.get_phonemes_by_type(type))
-        return tuple(rl)
+        # Structures of the type would be found instead of their phonemes
+        if self._phoneme_index is not None and not issubclass(Structure, type):
+            found = self._look_up_type(self._phoneme_index, type)
+            if found is not None:
+                return found
+        return tuple(self.iter_phonemes(type))
 
     def get_consonants(self) -> tuple[ConsonantPhoneme, ...]:
         """
@@ -139,14 +262,14 @@ class Structure[C: Component](Component, Initializable):
         dummy consonant phonemes that are used as placeholders in
         consonant-based structures and positions.
         """
-        return tuple(self.get_phonemes_by_type(ConsonantPhoneme))
+        return self.get_phonemes_by_type(ConsonantPhoneme)
 
     def get_vowels(self) -> tuple[VowelPhoneme, ...]:
         """Returns all the vowels of this structure. This also returns
         dummy vowel phonemes that are used as placeholders in
         vowel-based structures and positions.
         """
-        return tuple(self.get_phonemes_by_type(VowelPhoneme))
+        return self.get_phonemes_by_type(VowelPhoneme)
 
     def get_structures_by_type(self,
             type: type["Structure[C]"]) -> tuple["Structure[C]", ...]:
@@ -154,17 +277,206 @@ class Structure[C: Component](Component, Initializable):
         Returns a tuple of all found structures that are of the given
         `Structure` subtype.
 
+        Substructures of a found structure are not searched any
+        further. If the type index of this structure has been built
+        using `build_type_index()`, the result is looked up directly
+        instead of traversing the structure.
+
         Parameters
         ----------
         - `type` - is the `Structure` subtype to find.
         """
-        rl: list[Structure[C]] = []
-        for s in self._substructures:
-            if isinstance(s, type):
-                rl.append(s)
+        if self._structure_index is not None:
+            found = self._look_up_type(self._structure_index, type)
+            if found is not None:
+                return found
+        return tuple(self.iter_structures(type))
+
+    def build_type_index(self) -> None:
+        """Builds the per-type index of this structure's phonemes and
+        substructures.
+
+        The index maps every class of the phonemes and substructures
+        found in this structure's hierarchy, including their base
+        classes, to the matching components in reading order. Once
+        built, `get_phonemes_by_type()` and `get_structures_by_type()`
+        answer with a single lookup. The index is built only once, and
+        since structures are not modified after their creation it never
+        needs to be rebuilt.
+        """
+        if self._phoneme_index is not None:
+            return
+
+        phonemes: dict[type, list[Any]] = {}
+        structures: dict[type, list[Any]] = {}
+        self._index_types(phonemes, structures, frozenset())
+        self._phoneme_index = {t: tuple(l) for t, l in phonemes.items()}
+        self._structure_index = {t: tuple(l) for t, l in structures.items()}
+
+    def iter_phonemes[P: Phoneme](self,
+            type: type[P] = Phoneme) -> Iterator[P]:
+        """Yields the phonemes of this structure's hierarchy that are of
+        the given `Phoneme` type, in reading order, without building
+        intermediate collections.
+
+        Parameters
+        ----------
+        - `type` - is the `Phoneme` subtype to find. Defaults to
+            `Phoneme`.
+        """
+        stack = [iter(self._components)]
+        while stack:
+            for c in stack[-1]:
+                if isinstance(c, type):
+                    yield c
+                elif isinstance(c, Structure):
+                    stack.append(iter(c._components))
+                    break
             else:
-                rl.extend(s.get_structures_by_type(type))
-        return tuple(rl)
+                stack.pop()
+
+    def iter_structures(self,
+            type: type["Structure[C]"]) -> Iterator["Structure[C]"]:
+        """Yields the structures within this structure's hierarchy that
+        are of the given `Structure` subtype, in reading order.
+        Substructures of a found structure are not searched any
+        further.
+
+        Parameters
+        ----------
+        - `type` - is the `Structure` subtype to find.
+        """
+        stack = [iter(self._substructures)]
+        while stack:
+            for s in stack[-1]:
+                if isinstance(s, type):
+                    yield s
+                else:
+                    stack.append(iter(s._substructures))
+                    break
+            else:
+                stack.pop()
+
+    def walk(self) -> Iterator[C]:
+        """Yields all components within this structure's hierarchy in
+        depth-first order, each structure being yielded before its own
+        components.
+        """
+        stack = [iter(self._components)]
+        while stack:
+            for c in stack[-1]:
+                yield c
+                if isinstance(c, Structure):
+                    stack.append(iter(c._components))
+                    break
+            else:
+                stack.pop()
+
+    @classmethod
+    def from_trusted(cls, *args: object) -> Self:
+        """Returns an instance of this class created from the given
+        constructor arguments in trusted mode, that is, without checking
+        its blueprint compatibility. See `trusted()`.
+        """
+        with Structure.trusted():
+            return cls(*args)
+
+    @staticmethod
+    @contextmanager
+    def trusted() -> Iterator[None]:
+        """Returns a context manager within which structures are created
+        in trusted mode.
+
+        Structures created in trusted mode skip the blueprint
+        compatibility check and never have their components
+        reconstructed to fit their blueprint. This should only be used
+        for components known to be correct by construction, such as the
+        results of compiled formulas. Such structures can be checked
+        later on, e.g. in bulk, using `validate()` or
+        `validate_many()`.::
+
+            with Structure.trusted():
+                syllables = [Syllable(c) for c in components]
+            invalid = Structure.validate_many(syllables)
+        """
+        token = _TRUSTED.set(True)
+        try:
+            yield
+        finally:
+            _TRUSTED.reset(token)
+
+    def is_valid(self) -> bool:
+        """Returns `True` if this structure is compatible to its default
+        blueprint, otherwise returns `False`.
+        """
+        return self._blueprint.is_compatible_to(self._default_blueprint)
+
+    def validate(self) -> None:
+        """Checks the compatibility of this structure to its default
+        blueprint.
+
+        Raises
+        ------
+        CLCKException
+            if this structure is not compatible to its default blueprint
+        """
+        self._assert_blueprint_compatibility()
+
+    @staticmethod
+    def validate_many(structures: Iterable["Structure[Any]"]) -> tuple["Structure[Any]", ...]:
+        """Checks many structures, e.g. created in trusted mode, and
+        returns those that are not compatible to their default
+        blueprints. Structures of the same shape are only checked once
+        thanks to the memoized blueprint compatibility.
+
+        Parameters
+        ----------
+        structures : Iterable[Structure]
+            the structures to check
+
+        Returns
+        -------
+        tuple[Structure, ...]
+            the invalid structures, in the given order
+        """
+        return tuple([s for s in structures if not s.is_valid()])
+
+    @classmethod
+    def interned(cls, *args: object) -> Self:
+        """Returns an instance of this class created from the given
+        constructor arguments, reusing an existing instance if an
+        identical subtree has already been interned.
+
+        Interned structures are shared between all of their users, so
+        they must be treated as immutable, e.g. `set_romanization()`
+        should not be called on them. Instances are held weakly and are
+        collected once nothing else refers to them.
+
+        Parameters
+        ----------
+        *args : object
+            the arguments passed on to the class' constructor
+
+        Returns
+        -------
+        Self
+            the shared instance for the given arguments
+        """
+        return _INTERN_TABLE.intern(cls, *args)
+
+    @staticmethod
+    def get_intern_stats() -> InternStats:
+        """Returns the current hit and miss counts of the structure
+        intern table.
+        """
+        return _INTERN_TABLE.get_stats()
+
+    @staticmethod
+    def clear_intern_table() -> None:
+        """Removes all interned structures from the intern table and
+        resets its statistics.
+        """
+        _INTERN_TABLE.clear()
 
     def remove_component_duplicates[T](self, bank: tuple[T]) -> tuple[T, ...]:
         return tuple([*set(bank)])
@@ -180,6 +492,19 @@ class Structure[C: Component](Component, Initializable):
     def get_default_blueprint(cls) -> ComponentBlueprint:
         return FlexibleBlueprint()
 
+    @classmethod
+    def get_shared_default_blueprint(cls) -> ComponentBlueprint:
+        """Returns the default blueprint of this class as shared by all
+        of its instances. Unlike `get_default_blueprint()`, this does
+        not create a new blueprint on every call, so its compiled
+        matchers and memoized results are reused.
+        """
+        try:
+            return _DEFAULT_BLUEPRINTS[cls]
+        except KeyError:
+            bp = _DEFAULT_BLUEPRINTS[cls] = cls.get_default_blueprint()
+            return bp
+
     def _append_dummies(self, to: tuple[C, ...]) -> tuple[C | DummyPhoneme, ...]:
         nl: list[C | DummyPhoneme] = [*to]
         for c in self._components:
@@ -195,11 +520,11 @@ class Structure[C: Component](Component, Initializable):
                 if bp_default.limit_size == 0:
                     pass
                 elif self._size > bp_default.limit_size:
-                    print(f"Warning: Class \"{self.__class__.__name__}\" has flexible blueprint size of {bp_default.size} but instance size is {self._size}")
+                    print_warning(f"Class \"{self.__class__.__name__}\" has flexible blueprint size of {bp_default.size} but instance size is {self._size}")
             case _:
 
                 if self._size > bp_default.size:
-                    print(f"Warning: Class \"{self.__class__.__name__}\" has blueprint size of {bp_default.size} but instance size is {self._size}")
+                    print_warning(f"Class \"{self.__class__.__name__}\" has blueprint size of {bp_default.size} but instance size is {self._size}")
 
         if self._blueprint.is_compatible_to(self._default_blueprint):
             return
@@ -281,7 +606,9 @@ class Structure[C: Component](Component, Initializable):
             if isinstance(s, Phoneme):
                 rl.append(s)
             elif isinstance(s, Structure):
-                rl.extend(s._get_phonemes())
+                # Substructures are already built, so their phonemes
+                # can be reused instead of being collected again
+                rl.extend(s._phonemes)
 
         return tuple(rl)
 
@@ -297,6 +624,39 @@ class Structure[C: Component](Component, Initializable):
 
         return tuple(rl)
 
+    def _index_types(self, phonemes: dict[type, list[Any]],
+        structures: dict[type, list[Any]], covered: frozenset[type]) -> None:
+        """Adds the components of this structure to the given type
+        indexes. `covered` holds the structure types already matched by
+        an enclosing structure, which are not indexed again.
+        """
+        for c in self._components:
+            if isinstance(c, Structure):
+                found: list[type] = []
+                for t in c.__class__.__mro__:
+                    if t not in covered:
+                        structures.setdefault(t, []).append(c)
+                        found.append(t)
+                c._index_types(phonemes, structures, covered.union(found))
+            else:
+                for t in c.__class__.__mro__:
+                    phonemes.setdefault(t, []).append(c)
+
+    @staticmethod
+    def _look_up_type(index: dict[type, tuple[Any, ...]],
+        type: type) -> tuple[Any, ...] | None:
+        """Returns the components of the given type index that are of
+        the given type, or `None` if the index cannot tell, that is,
+        when an indexed class is only a virtual subclass of the type,
+        such as one registered to an abstract base class.
+        """
+        found = index.get(type)
+        if found is not None:
+            return found
+        if any([issubclass(t, type) for t in index]):
+            return None
+        return ()
+
     def _init_output(self) -> str:
         comps: list[str] = []
         for c in self._phonemes:
@@ -320,7 +680,7 @@ class Structure[C: Component](Component, Initializable):
         if _bp:
             return _bp
         else:
-            return self.__class__.get_default_blueprint()
+            return self.__class__.get_shared_default_blueprint()
         
     def _init_blueprint(self, *args: object, **kwargs: object) -> ComponentBlueprint:
         return ComponentBlueprint(*self._components)
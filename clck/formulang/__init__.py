@@ -1,5 +1,29 @@
-from clck.formulang import common
-from clck.formulang.common import Formulang
-from clck.formulang.parsing import Parser
-from clck.formulang.parsing import Token
-from clck.formulang.parsing import Tokenizer
\ No newline at end of file
+import importlib
+
+
+_LAZY_NAMES: dict[str, str] = {
+    "common": "clck.formulang.common",
+    "Formulang": "clck.formulang.common",
+    "SyllableTemplate": "clck.formulang.common",
+    "Parser": "clck.formulang.parsing",
+    "Token": "clck.formulang.parsing",
+    "Tokenizer": "clck.formulang.parsing",
+}
+
+__all__ = sorted(_LAZY_NAMES)
+
+
+def __getattr__(name: str) -> object:
+    # The parser and the Formulang definitions are only imported on
+    # first access (PEP 562)
+    try:
+        module = importlib.import_module(_LAZY_NAMES[name])
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = module if name == "common" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,14 +1,27 @@
-from typing import TypeVar
-from clck.common.component import Component
+from array import array
+from functools import lru_cache
+from typing import Iterator, Literal, TypeVar
+from clck.common.component import Component, ComponentBlueprint
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PackedStructure, PhonemeIndex
 from clck.common.structure import EmptyStructure, Structure
+from clck.exceptions import CLCKException
 from clck.formulang.parsing.fl_parser import Parser
 from clck.formulang.parsing.fl_tokenizer import Tokenizer
-from clck.formulang.parsing.parse_tree import Formula, TreeNode
+from clck.formulang.parsing.parse_tree import Formula, PhonemeNode, TreeNode
 from clck.phonology.syllabics import Nucleus, SyllabicComponent, Syllable
-from tests.test_classes import SyllableComponent
 
 StructureT = TypeVar("StructureT", bound="Structure")
 
+FormulangOutput = Literal["structure", "text", "ipa", "ids"]
+"""The kinds of results of `Formulang.generate()`:
+
+- `"structure"`, the evaluated `Component`
+- `"text"`, the output string of the result
+- `"ipa"`, the IPA transcript of the result
+- `"ids"`, the phoneme IDs of the result as an `array('H')`
+"""
+
+
 class Formulang:
 
     @staticmethod
@@ -20,34 +33,81 @@ class Formulang:
         return ast
 
     @staticmethod
-    def generate(formula: str) -> Component:
+    def generate(formula: str, output: FormulangOutput = "structure",
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> Component | str | array:
         """Generate a result from the given formula string.
 
+        The `"text"`, `"ipa"` and `"ids"` outputs are produced directly
+        from the phonemes selected while evaluating, without creating
+        any structure.
+
         Parameters
         ----------
         formula : str
             the formula to evaluate and get the result from
+        output : FormulangOutput, optional
+            the kind of the result, by default `"structure"`
+        index : PhonemeIndex, optional
+            the index assigning the IDs of the `"ids"` output, by
+            default `DEFAULT_PHONEME_INDEX`
 
         Returns
         -------
-        Phoneme | Structure | None
+        Phoneme | Structure | str | array
             the generated result after evaluating the formula string
         """
-        ast = Formulang.generate_ast(formula)
-        result = ast.eval()
-        if result:
-            return result
-        else:
-            return EmptyStructure()
+        return Formulang._evaluate(Formulang.get_cached_ast(formula),
+            output, index)
         
     @staticmethod
-    def generate_of_type(formula: str, type: type[StructureT]) -> StructureT:
-        _g = Formulang.generate(formula)
-        return type(_g)
+    def generate_of_type(formula: str, type: type[StructureT],
+        blueprint: ComponentBlueprint | None = None) -> StructureT:
+        """Generate a structure of the given type from the given
+        formula string.
+
+        The formula is evaluated directly into the target type, see
+        `Formula.eval_as()`.
+
+        Parameters
+        ----------
+        formula : str
+            the formula to evaluate and get the result from
+        type : type[StructureT]
+            the `Structure` subclass of the result
+        blueprint : ComponentBlueprint | None, optional
+            the blueprint the components of the result must be compatible
+            to, by default the default blueprint of `type`, to which
+            components are otherwise fitted
+
+        Returns
+        -------
+        StructureT
+            the generated structure
+
+        Raises
+        ------
+        CLCKException
+            if a blueprint is given and the components of the result are
+            not compatible to it
+        """
+        return Formulang.get_cached_ast(formula).eval_as(type, blueprint)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def get_cached_ast(formula: str) -> Formula:
+        """Returns the parsed tree of the given formula string, parsing
+        it only on the first call. Parse trees are evaluated anew each
+        time, into new phoneme nodes and structures, so one tree can be
+        shared by every generation from the same formula.
+        """
+        return Formulang.generate_ast(formula)
     
     @staticmethod
-    def generate_multiple(formula: str, count: int) -> tuple[Component, ...]:
+    def generate_multiple(formula: str, count: int,
+        output: FormulangOutput = "structure",
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> tuple[Component | str | array, ...]:
         """Generate a tuple of results from the given formula string.
+        The formula is only parsed once.
 
         Parameters
         ----------
@@ -55,35 +115,229 @@ class Formulang:
             the formula to evaluate and get the results from
         count : int
             the number of iterations in evaluating the formula
+        output : FormulangOutput, optional
+            the kind of the results, by default `"structure"`
+        index : PhonemeIndex, optional
+            the index assigning the IDs of the `"ids"` output, by
+            default `DEFAULT_PHONEME_INDEX`
 
         Returns
         -------
-        tuple[Phoneme | Structure | None, ...]
+        tuple[Phoneme | Structure | str | array, ...]
             the tuple of results after evaluating the formula string
         """
-        ret: list[Component] = []
-        for _ in range(count):
-            ret.append(Formulang.generate(formula))
-        return tuple(ret)
+        ast = Formulang.get_cached_ast(formula)
+        return tuple([Formulang._evaluate(ast, output, index)
+            for _ in range(count)])
+
+    @staticmethod
+    def _evaluate(ast: Formula, output: FormulangOutput,
+        index: PhonemeIndex) -> Component | str | array:
+        if output == "structure":
+            result = ast.eval()
+            if result:
+                return result
+            else:
+                return EmptyStructure()
+
+        leaves: list[PhonemeNode] = []
+        ast.eval_leaves(leaves)
+        if output == "text":
+            return "".join([p.output for p in leaves])
+        elif output == "ipa":
+            return f"/{''.join([p.output for p in leaves])}/"
+        elif output == "ids":
+            return array("H", [Formulang._get_symbol_id(p, index)
+                for p in leaves])
+        raise CLCKException(f"Invalid Formulang output \"{output}\"")
+
+    @staticmethod
+    def _get_symbol_id(node: PhonemeNode, index: PhonemeIndex) -> int:
+        # Phoneme nodes stand for the phonemes of their symbols, so the
+        # phonemes already registered with a symbol are preferred. Other
+        # symbols are registered with a copy, as the node belongs to a
+        # parse tree that may be cached
+        try:
+            return index.get_symbol_id(node.symbol)
+        except KeyError:
+            return index.get_id(node.copy())
     
     @staticmethod
     def generate_syllable(left_margin: str | None, nucleus: str,
         right_margin: str | None) -> Syllable:
+        """Generate a syllable from the formula strings of its margins
+        and nucleus.
 
-        if left_margin:
-            lm_n = Formulang.generate_of_type(left_margin, SyllabicComponent)
-        else:
-            lm_n = Formulang.generate_of_type("", SyllabicComponent)
+        Each part is evaluated directly into its `SyllabicComponent`
+        type, and the syllable itself is created without being checked
+        again against its blueprint.
 
+        Parameters
+        ----------
+        left_margin : str | None
+            the formula of the left margin, or `None` for an empty one
+        nucleus : str
+            the formula of the nucleus
+        right_margin : str | None
+            the formula of the right margin, or `None` for an empty one
+
+        Returns
+        -------
+        Syllable
+            the generated syllable
+        """
+        lm_n = Formulang.generate_of_type(left_margin or "", SyllabicComponent)
         n = Formulang.generate_of_type(nucleus, Nucleus)
+        rm_n = Formulang.generate_of_type(right_margin or "", SyllabicComponent)
+
+        # Both margins and the nucleus always fit the syllable blueprint
+        with Structure.trusted():
+            return Syllable((lm_n, n, rm_n))
+
+
+SyllableOutput = Literal["structure", "text", "packed"]
+
 
-        if right_margin:
-            rm_n = Formulang.generate_of_type(right_margin, SyllabicComponent)
+class SyllableTemplate:
+    """The class for `SyllableTemplate`.
+
+    A `SyllableTemplate` holds the formulas of the left margin, nucleus
+    and right margin of a syllable, parsed once when the template is
+    created, and samples any number of syllables from them. Unlike
+    `Formulang.generate_syllable()`, no formula is tokenized or parsed
+    again while sampling.
+
+    The output of the template is one of:
+
+    - `"structure"`, a `Syllable` (the default)
+    - `"text"`, the output string of the syllable; no structure is
+      created at all
+    - `"packed"`, a `PackedStructure` of the syllable
+
+    Below demonstrates sampling a hundred syllable strings.::
+
+        template = SyllableTemplate("s+t", "a", "n|m", output="text")
+        template.sample_many(100)
+    """
+
+    def __init__(self, left_margin: str | None, nucleus: str,
+        right_margin: str | None, output: SyllableOutput = "structure",
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> None:
+        """Creates a new `SyllableTemplate` from the formulas of the
+        parts of a syllable.
+
+        Parameters
+        ----------
+        left_margin : str | None
+            the formula of the left margin, or `None` for an empty one
+        nucleus : str
+            the formula of the nucleus
+        right_margin : str | None
+            the formula of the right margin, or `None` for an empty one
+        output : SyllableOutput, optional
+            the kind of the sampled results, by default `"structure"`
+        index : PhonemeIndex, optional
+            the index assigning phoneme IDs to packed results, by
+            default `DEFAULT_PHONEME_INDEX`
+
+        Raises
+        ------
+        CLCKException
+            if `output` is not a valid output kind
+        """
+        if output not in ("structure", "text", "packed"):
+            raise CLCKException(f"Invalid syllable output \"{output}\"")
+
+        self._left_margin = left_margin or ""
+        self._nucleus = nucleus
+        self._right_margin = right_margin or ""
+        self._output: SyllableOutput = output
+        self._index = index
+
+        self._left_ast = Formulang.generate_ast(self._left_margin)
+        self._nucleus_ast = Formulang.generate_ast(self._nucleus)
+        self._right_ast = Formulang.generate_ast(self._right_margin)
+
+    def __iter__(self) -> Iterator[Syllable | str | PackedStructure]:
+        """Returns an endless iterator of sampled syllables."""
+        while True:
+            yield self.sample()
+
+    def __repr__(self) -> str:
+        return f"<SyllableTemplate {self._left_margin!r} {self._nucleus!r} {self._right_margin!r}>"
+
+    @property
+    def left_margin(self) -> str:
+        """The formula of the left margin."""
+        return self._left_margin
+
+    @property
+    def nucleus(self) -> str:
+        """The formula of the nucleus."""
+        return self._nucleus
+
+    @property
+    def output(self) -> SyllableOutput:
+        """The kind of the sampled results."""
+        return self._output
+
+    @property
+    def right_margin(self) -> str:
+        """The formula of the right margin."""
+        return self._right_margin
+
+    def sample(self) -> Syllable | str | PackedStructure:
+        """Samples a single syllable from this template.
+
+        Returns
+        -------
+        Syllable | str | PackedStructure
+            the sampled syllable, in the output kind of this template
+        """
+        if self._output == "text":
+            return self._sample_text()
+        elif self._output == "packed":
+            return PackedStructure.from_structure(self._sample_syllable(),
+                self._index)
+        return self._sample_syllable()
+
+    def sample_many(self, n: int) -> tuple[Syllable | str | PackedStructure, ...]:
+        """Samples `n` syllables from this template.
+
+        Parameters
+        ----------
+        n : int
+            the number of syllables to sample
+
+        Returns
+        -------
+        tuple[Syllable | str | PackedStructure, ...]
+            the sampled syllables, in the output kind of this template
+        """
+        if self._output == "text":
+            sample = self._sample_text
+        elif self._output == "packed":
+            index = self._index
+            return tuple([PackedStructure.from_structure(
+                self._sample_syllable(), index) for _ in range(n)])
         else:
-            rm_n = Formulang.generate_of_type("", SyllabicComponent)
+            sample = self._sample_syllable
+        return tuple([sample() for _ in range(n)])
+
+    def _sample_syllable(self) -> Syllable:
+        lm_n = self._left_ast.eval_as(SyllabicComponent)
+        n = self._nucleus_ast.eval_as(Nucleus)
+        rm_n = self._right_ast.eval_as(SyllabicComponent)
+        with Structure.trusted():
+            return Syllable((lm_n, n, rm_n))
+
+    def _sample_text(self) -> str:
+        leaves: list[PhonemeNode] = []
+        self._left_ast.eval_leaves(leaves)
+        self._nucleus_ast.eval_leaves(leaves)
+        self._right_ast.eval_leaves(leaves)
+        return "".join([p.output for p in leaves])
 
-        return Syllable((lm_n, n, rm_n))
-    
 
 class FormulangTempContainer:
     def __init__(self, formulang_result: TreeNode) -> None:
@@ -1,8 +1,8 @@
 import string
 from enum import Enum
-from typing import TypeVar
+from typing import Any, TypeVar
 
-from clck.phonology.phonemes import Phoneme
+from clck.phonology.phonemes import DEFAULT_IPA_PHONEME_REGISTRY
 
 
 T = TypeVar("T")
@@ -70,8 +70,7 @@ class StandardTokenType(Enum):
                 if isinstance(enum.value, str):
                     chars.extend(list(enum.value))
 
-        for phoneme in Phoneme.DEFAULT_IPA_PHONEMES:
-            chars.append(phoneme.symbol)
+        chars.extend(DEFAULT_IPA_PHONEME_REGISTRY.symbols)
 
         return tuple(set(chars))
     
@@ -249,9 +248,16 @@ class TypeGroupings(Groupings):
 TOKEN_CLASSES: tuple[type[StandardTokenType], ...] = StandardTokenType.get_all_subclasses()
 """The tuple of all `StandardToken` enum classes"""
 
-VALID_CHARS: tuple[str, ...] = StandardTokenType.get_valid_chars()
-"""The tuple of all valid characters acceptable in a string formula."""
-
 # It's important to register all tokens to STANDARD_TOKENS.
 # Without this, tokens will not be able to be recognized by CLCK.
-StandardTokenType.register_enums_from_classes(TOKEN_CLASSES)
\ No newline at end of file
+StandardTokenType.register_enums_from_classes(TOKEN_CLASSES)
+
+
+def __getattr__(name: str) -> Any:
+    # VALID_CHARS: tuple[str, ...], the tuple of all valid characters
+    # acceptable in a string formula, is computed on first access since
+    # it enumerates the default IPA phonemes, which loads the IPA chart
+    if name == "VALID_CHARS":
+        chars = globals()[name] = StandardTokenType.get_valid_chars()
+        return chars
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
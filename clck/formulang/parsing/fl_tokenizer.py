@@ -3,8 +3,8 @@ from dataclasses import dataclass
 from typing import Any
 from typing import TypeAlias
 
+from clck.formulang.definitions import tokens
 from clck.formulang.definitions.tokens import STANDARD_TOKENS, Literals, StandardTokenType
-from clck.formulang.definitions.tokens import VALID_CHARS
 from clck.utils import clean_collection
 from clck.utils import strip_whitespace
 
@@ -131,8 +131,9 @@ class Tokenizer:
             `False`
         """
 
+        valid_chars = tokens.VALID_CHARS
         for char in strip_whitespace(self._formula):
-            if char not in VALID_CHARS:
+            if char not in valid_chars:
                 raise Exception(f"Invalid character '{char}' found in formula string")
         return True
 
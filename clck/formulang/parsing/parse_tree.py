@@ -1,15 +1,18 @@
 import random
 from types import NoneType
 from typing import TypeVar
-from clck.common.component import Component
-from clck.common.structure import StructurableT
+from clck.common.builder import StructureBuilder
+from clck.common.component import Component, ComponentBlueprint
+from clck.common.structure import EmptyStructure, StructurableT
 from clck.common.structure import Structure
+from clck.exceptions import CLCKException
 from clck.phonology.phonemes import DummyPhoneme
 from clck.utils import clean_collection
 
 
 # InputNodeT = TypeVar("InputNodeT", bound=Union["TreeNode", Phoneme])
 OutputNodeT = TypeVar("OutputNodeT", bound=Component)
+StructureT = TypeVar("StructureT", bound=Structure[Component])
 
 class TreeNode():
     """Class for all Formulang parse tree nodes.
@@ -93,6 +96,37 @@ class TreeNode():
         for subnode in self._subnodes:
             return subnode.eval()
 
+    def eval_components(self) -> tuple[Component, ...]:
+        """Evaluates this `TreeNode` like `eval()` but returns the
+        components that its result contributes to the enclosing
+        structure instead of wrapping them into a new structure.
+
+        Explicitly braced structures are still returned as single
+        substructures.
+
+        Returns
+        -------
+        tuple[Component, ...]
+            the components resulting from the evaluation
+        """
+        for subnode in self._subnodes:
+            return subnode.eval_components()
+        return ()
+
+    def eval_leaves(self, leaves: list["PhonemeNode"]) -> None:
+        """Evaluates this `TreeNode` like `eval()` but only appends the
+        resulting phoneme nodes to `leaves`, in reading order, without
+        creating any structure.
+
+        Parameters
+        ----------
+        leaves : list[PhonemeNode]
+            the list to append the resulting phoneme nodes to
+        """
+        for subnode in self._subnodes:
+            subnode.eval_leaves(leaves)
+            return
+
     def get_json(self, indent: int = 4) -> str:
         """Returns a JSON string copy of the parse tree branch starting
         from this `TreeNode`.
@@ -163,6 +197,8 @@ class TreeNode():
 
 
 class PhonemeNode(DummyPhoneme, TreeNode):
+    stands_for_symbol = True
+
     def __init__(self, symbol: str, brace_level: int) -> None:
         super().__init__(symbol)
         self._brace_level = brace_level
@@ -176,8 +212,25 @@ class PhonemeNode(DummyPhoneme, TreeNode):
     def subnodes(self) -> tuple["PhonemeNode"]:
         return self._subnodes
     
+    def copy(self) -> "PhonemeNode":
+        """Returns a new node of the same symbol. Evaluating a node
+        returns such a copy, so that parse trees, which may be cached
+        and evaluated many times, are never handed out to callers.
+        """
+        node = object.__new__(self.__class__)
+        node.__dict__.update(self.__dict__)
+        node._allophones = list(self._allophones)
+        node._subnodes = (node,) if self._subnodes else ()
+        return node
+
     def eval(self) -> "PhonemeNode":
-        return self
+        return self.copy()
+
+    def eval_components(self) -> tuple[Component, ...]:
+        return (self.copy(),)
+
+    def eval_leaves(self, leaves: list["PhonemeNode"]) -> None:
+        leaves.append(self)
     
     def get_json(self, indent: int = 4) -> str:
         TreeNode._indent_size = indent
@@ -235,6 +288,60 @@ class Formula(TreeNode):
         else:
             raise Exception("TreeNode cannot be the return type of eval()")
 
+    def eval_as(self, type: type[StructureT],
+        blueprint: ComponentBlueprint | None = None) -> StructureT:
+        """Evaluates this formula directly into a structure of the given
+        type.
+
+        The components resulting from the evaluation are checked once
+        against the blueprint and added as they are to a
+        `StructureBuilder`, without any intermediate
+        `FormulangStructure`, which then creates the structure like its
+        constructor would. Without a given blueprint, components not
+        fitting the default blueprint of `type` are wrapped first like
+        `type(self.eval())` would do.
+
+        Parameters
+        ----------
+        type : type[StructureT]
+            the `Structure` subclass to create
+        blueprint : ComponentBlueprint | None, optional
+            the blueprint the components must be compatible to, which is
+            given to `type` as `_bp` like `Structure` accepts, by default
+            the default blueprint of `type`
+
+        Returns
+        -------
+        StructureT
+            the evaluated structure
+
+        Raises
+        ------
+        CLCKException
+            if a blueprint is given and the components are not
+            compatible to it
+        """
+        components = self.eval_components()
+        if blueprint is not None:
+            if not ComponentBlueprint(*components).is_compatible_to(blueprint):
+                raise CLCKException(f"The components {components} are not "
+                    f"compatible to the blueprint {blueprint}")
+            builder = StructureBuilder(type, blueprint)
+            builder.extend(components)
+            return builder.freeze()  # type: ignore
+
+        builder = StructureBuilder(type)
+        if ComponentBlueprint(*components).is_compatible_to(
+            type.get_shared_default_blueprint()):
+            builder.extend(components)
+        elif components == ():
+            builder.append(EmptyStructure())
+        elif len(components) == 1:
+            builder.append(components[0])
+        else:
+            builder.append(FormulangStructure(components))
+        return builder.freeze()  # type: ignore
+
 
 class Expression(TreeNode):
     def __init__(self, subnodes: tuple[TreeNode, ...],
@@ -278,9 +385,24 @@ class Concatenation(Operation):
         self._operands = operands
 
     def eval(self) -> Structure[Component] | None:
+        components = self._collect_components()
+
+        if components == []:
+            return None
+        else:
+            return FormulangStructure(tuple(components), brace_level=self._brace_level)
+
+    def eval_components(self) -> tuple[Component, ...]:
+        return tuple(self._collect_components())
+
+    def eval_leaves(self, leaves: list["PhonemeNode"]) -> None:
+        for o in self._operands:
+            o.eval_leaves(leaves)
+
+    def _collect_components(self) -> list[Component]:
         # The following code allows detection of 'chained' operations to
         # add either as structures or phonemes depending on the brace level
-        components: list[Component | Structure[Component]] = []
+        components: list[Component] = []
 
         for o in self._operands:
             operand = o.eval()
@@ -293,10 +415,7 @@ class Concatenation(Operation):
                 else:
                     components.append(operand)
 
-        if components == []:
-            return None
-        else:
-            return FormulangStructure(tuple(components), brace_level=self._brace_level)
+        return components
 
 
 class Subtraction(Operation):
@@ -318,6 +437,12 @@ class Selection(Operation):
         selected = random.choice(self._options).eval()
         return selected
 
+    def eval_components(self) -> tuple[Component, ...]:
+        return random.choice(self._options).eval_components()
+
+    def eval_leaves(self, leaves: list["PhonemeNode"]) -> None:
+        random.choice(self._options).eval_leaves(leaves)
+
 
 class Term(TreeNode):
     def __init__(self, subnodes: tuple[TreeNode, ...],
@@ -342,6 +467,12 @@ class StructureNode(TreeNode):
         elif isinstance(expr, Component):
             return FormulangStructure(expr, brace_level=self._brace_level)
 
+    def eval_components(self) -> tuple[Component, ...]:
+        result = self.eval()
+        if result is None:
+            return ()
+        return (result,)
+
 
 class ProbabilityNode(TreeNode):
     def __init__(self, subnodes: tuple[TreeNode, ...], brace_level: int,
@@ -353,6 +484,15 @@ class ProbabilityNode(TreeNode):
         if random.random() < self._probability:
             return super().eval()
 
+    def eval_components(self) -> tuple[Component, ...]:
+        if random.random() < self._probability:
+            return super().eval_components()
+        return ()
+
+    def eval_leaves(self, leaves: list["PhonemeNode"]) -> None:
+        if random.random() < self._probability:
+            super().eval_leaves(leaves)
+
 
 class EllipsisNode(PhonemeNode):
     def __init__(self, brace_level: int) -> None:
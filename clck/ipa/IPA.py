@@ -1,31 +1,85 @@
+from typing import Any
+
 from clck.phonetics.articulatory_properties import MannerOfArticulation
 from clck.phonetics.articulatory_properties import Phonation
 from clck.phonetics.articulatory_properties import PlaceOfArticulation
-from clck.phonetics.phones import PulmonicConsonantPhone
-from clck.phonology.phonemes import ConsonantPhoneme
-
-
-IPA_VOICED_BILABIAL_PLOSIVE     = ConsonantPhoneme(PulmonicConsonantPhone("\u0062", PlaceOfArticulation.BILABIAL, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICELESS_BILABIAL_PLOSIVE  = ConsonantPhoneme(PulmonicConsonantPhone("\u0070", PlaceOfArticulation.BILABIAL, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS, (), True))
-IPA_VOICED_ALVEOLAR_PLOSIVE     = ConsonantPhoneme(PulmonicConsonantPhone("\u0064", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICELESS_ALVEOLAR_PLOSIVE  = ConsonantPhoneme(PulmonicConsonantPhone("\u0074", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS, (), True))
-IPA_VOICED_RETROFLEX_PLOSIVE    = ConsonantPhoneme(PulmonicConsonantPhone("\u0256", PlaceOfArticulation.RETROFLEX, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICELESS_RETROFLEX_PLOSIVE = ConsonantPhoneme(PulmonicConsonantPhone("\u0288", PlaceOfArticulation.RETROFLEX, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS, (), True))
-IPA_VOICED_PALATAL_PLOSIVE      = ConsonantPhoneme(PulmonicConsonantPhone("\u025f", PlaceOfArticulation.PALATAL, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICELESS_PALATAL_PLOSIVE   = ConsonantPhoneme(PulmonicConsonantPhone("\u0063", PlaceOfArticulation.PALATAL, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS, (), True))
-IPA_VOICED_VELAR_PLOSIVE        = ConsonantPhoneme(PulmonicConsonantPhone("\u0261", PlaceOfArticulation.VELAR, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICELESS_VELAR_PLOSIVE     = ConsonantPhoneme(PulmonicConsonantPhone("\u006b", PlaceOfArticulation.VELAR, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS, (), True))
-IPA_VOICED_UVULAR_PLOSIVE       = ConsonantPhoneme(PulmonicConsonantPhone("\u0262", PlaceOfArticulation.UVULAR, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICELESS_UVULAR_PLOSIVE    = ConsonantPhoneme(PulmonicConsonantPhone("\u0071", PlaceOfArticulation.UVULAR, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS, (), True))
-IPA_VOICED_GLOTTAL_PLOSIVE      = ConsonantPhoneme(PulmonicConsonantPhone("\u0294", PlaceOfArticulation.GLOTTAL, MannerOfArticulation.PLOSIVE, Phonation.VOICED, (), True))
-IPA_VOICED_BILABIAL_NASAL       = ConsonantPhoneme(PulmonicConsonantPhone("\u006d", PlaceOfArticulation.BILABIAL, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_LABIODENTAL_NASAL    = ConsonantPhoneme(PulmonicConsonantPhone("\u0271", PlaceOfArticulation.LABIODENTAL, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_ALVEOLAR_NASAL       = ConsonantPhoneme(PulmonicConsonantPhone("\u006e", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_RETROFLEX_NASAL      = ConsonantPhoneme(PulmonicConsonantPhone("\u0273", PlaceOfArticulation.RETROFLEX, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_PALATAL_NASAL        = ConsonantPhoneme(PulmonicConsonantPhone("\u0272", PlaceOfArticulation.PALATAL, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_VELAR_NASAL          = ConsonantPhoneme(PulmonicConsonantPhone("\u014b", PlaceOfArticulation.VELAR, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_UVULAR_NASAL         = ConsonantPhoneme(PulmonicConsonantPhone("\u0274", PlaceOfArticulation.UVULAR, MannerOfArticulation.NASAL, Phonation.VOICELESS, (), True))
-IPA_VOICED_BILABIAL_TRILL       = ConsonantPhoneme(PulmonicConsonantPhone("\u0299", PlaceOfArticulation.BILABIAL, MannerOfArticulation.TRILL, Phonation.VOICELESS, (), True))
-IPA_VOICED_ALVEOLAR_TRILL       = ConsonantPhoneme(PulmonicConsonantPhone("\u0072", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.TRILL, Phonation.VOICELESS, (), True))
-IPA_VOICED_UVULAR_TRILL         = ConsonantPhoneme(PulmonicConsonantPhone("\u0280", PlaceOfArticulation.UVULAR, MannerOfArticulation.TRILL, Phonation.VOICELESS, (), True))
-IPA_VOICED_LABIODENTAL_FLAP     = ConsonantPhoneme(PulmonicConsonantPhone("\u2c71", PlaceOfArticulation.LABIODENTAL, MannerOfArticulation.FLAP, Phonation.VOICELESS, (), True))
\ No newline at end of file
+
+
+_CHART_SPEC: tuple[tuple[str, str, PlaceOfArticulation, MannerOfArticulation, Phonation], ...] = (
+    ("IPA_VOICED_BILABIAL_PLOSIVE",     "\u0062", PlaceOfArticulation.BILABIAL, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICELESS_BILABIAL_PLOSIVE",  "\u0070", PlaceOfArticulation.BILABIAL, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS),
+    ("IPA_VOICED_ALVEOLAR_PLOSIVE",     "\u0064", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICELESS_ALVEOLAR_PLOSIVE",  "\u0074", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS),
+    ("IPA_VOICED_RETROFLEX_PLOSIVE",    "\u0256", PlaceOfArticulation.RETROFLEX, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICELESS_RETROFLEX_PLOSIVE", "\u0288", PlaceOfArticulation.RETROFLEX, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS),
+    ("IPA_VOICED_PALATAL_PLOSIVE",      "\u025f", PlaceOfArticulation.PALATAL, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICELESS_PALATAL_PLOSIVE",   "\u0063", PlaceOfArticulation.PALATAL, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS),
+    ("IPA_VOICED_VELAR_PLOSIVE",        "\u0261", PlaceOfArticulation.VELAR, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICELESS_VELAR_PLOSIVE",     "\u006b", PlaceOfArticulation.VELAR, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS),
+    ("IPA_VOICED_UVULAR_PLOSIVE",       "\u0262", PlaceOfArticulation.UVULAR, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICELESS_UVULAR_PLOSIVE",    "\u0071", PlaceOfArticulation.UVULAR, MannerOfArticulation.PLOSIVE, Phonation.VOICELESS),
+    ("IPA_VOICED_GLOTTAL_PLOSIVE",      "\u0294", PlaceOfArticulation.GLOTTAL, MannerOfArticulation.PLOSIVE, Phonation.VOICED),
+    ("IPA_VOICED_BILABIAL_NASAL",       "\u006d", PlaceOfArticulation.BILABIAL, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_LABIODENTAL_NASAL",    "\u0271", PlaceOfArticulation.LABIODENTAL, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_ALVEOLAR_NASAL",       "\u006e", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_RETROFLEX_NASAL",      "\u0273", PlaceOfArticulation.RETROFLEX, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_PALATAL_NASAL",        "\u0272", PlaceOfArticulation.PALATAL, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_VELAR_NASAL",          "\u014b", PlaceOfArticulation.VELAR, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_UVULAR_NASAL",         "\u0274", PlaceOfArticulation.UVULAR, MannerOfArticulation.NASAL, Phonation.VOICELESS),
+    ("IPA_VOICED_BILABIAL_TRILL",       "\u0299", PlaceOfArticulation.BILABIAL, MannerOfArticulation.TRILL, Phonation.VOICELESS),
+    ("IPA_VOICED_ALVEOLAR_TRILL",       "\u0072", PlaceOfArticulation.ALVEOLAR, MannerOfArticulation.TRILL, Phonation.VOICELESS),
+    ("IPA_VOICED_UVULAR_TRILL",         "\u0280", PlaceOfArticulation.UVULAR, MannerOfArticulation.TRILL, Phonation.VOICELESS),
+    ("IPA_VOICED_LABIODENTAL_FLAP",     "\u2c71", PlaceOfArticulation.LABIODENTAL, MannerOfArticulation.FLAP, Phonation.VOICELESS),
+)
+"""The rows of the IPA chart as (constant name, symbol, place, manner,
+phonation), in chart order. The binary table of `clck.ipa.table` is
+generated from these rows, and the phonemes of the chart are only
+created from the table when the chart is loaded."""
+
+_CHART_NAMES: frozenset[str] = frozenset(row[0] for row in _CHART_SPEC)
+
+__all__ = [row[0] for row in _CHART_SPEC]
+
+_loaded: bool = False
+
+_loading: bool = False
+
+
+def load_chart() -> None:
+    """Creates all the phonemes of the IPA chart and binds them to their
+    constants in this module, if this was not done yet.
+
+    The chart is loaded automatically on the first access to any of its
+    constants or to the default IPA phonemes, so this only needs to be
+    called to pay the loading cost up front.
+    """
+    global _loaded, _loading
+    # Creating default phonemes may enumerate them, which must not load
+    # the chart again while it is being loaded
+    if _loaded or _loading:
+        return
+    _loading = True
+    try:
+        from clck.ipa.table import get_default_table
+
+        table = get_default_table()
+        phonemes = table.get_phonemes()
+        chart = globals()
+        for row, phoneme in enumerate(phonemes):
+            chart[table.get_name(row)] = phoneme
+        # Only set once the chart is complete, so that a failed load is
+        # tried again
+        _loaded = True
+    finally:
+        _loading = False
+
+
+def __getattr__(name: str) -> Any:
+    if name in _CHART_NAMES:
+        load_chart()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_CHART_NAMES})
@@ -1,2 +1,15 @@
+from typing import Any
+
 # from clck.ipa.common import DEFAULT_PATTERN_WILDCARDS
-from clck.ipa.IPA import *
\ No newline at end of file
+from clck.ipa import IPA
+from clck.ipa.parser import SymbolTrie, parse_ipa, parse_ipa_many
+
+__all__ = ["IPA", "SymbolTrie", "parse_ipa", "parse_ipa_many", *IPA.__all__]
+
+
+def __getattr__(name: str) -> Any:
+    # The IPA constants are forwarded lazily so that importing this
+    # package does not load the chart
+    if name in IPA._CHART_NAMES:
+        return getattr(IPA, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,20 @@
+from typing import Any
+
 from clck.language.containers import PhonemeGroup
 from clck.phonology.phonemes import ConsonantPhoneme, VowelPhoneme
 
 
-DEFAULT_PATTERN_WILDCARDS: dict[str, PhonemeGroup] = {
-    "C" : PhonemeGroup.from_type("C", ConsonantPhoneme),
-    "V" : PhonemeGroup.from_type("V", VowelPhoneme),
-}
\ No newline at end of file
+def _create_default_pattern_wildcards() -> dict[str, PhonemeGroup]:
+    return {
+        "C" : PhonemeGroup.from_type("C", ConsonantPhoneme),
+        "V" : PhonemeGroup.from_type("V", VowelPhoneme),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # DEFAULT_PATTERN_WILDCARDS: dict[str, PhonemeGroup] is created and
+    # registered on first access, loading the IPA chart
+    if name == "DEFAULT_PATTERN_WILDCARDS":
+        wildcards = globals()[name] = _create_default_pattern_wildcards()
+        return wildcards
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,240 @@
+import unicodedata
+from typing import Iterable, Iterator, Literal
+from weakref import WeakKeyDictionary
+
+from clck.exceptions import CLCKException
+from clck.phonology.phonemes import DummyPhoneme, Phoneme, PhonemicInventory
+
+
+UnknownSymbolHandling = Literal["error", "skip", "dummy"]
+"""How `parse_ipa()` handles a segment matching no known symbol:
+
+- `"error"`, raise a `CLCKException` (the default)
+- `"skip"`, leave the segment out
+- `"dummy"`, return a `DummyPhoneme` of the segment
+"""
+
+_END = ""
+"""The key of the phoneme stored at a trie node. No single character
+can collide with it."""
+
+_MAX_SEGMENTED = 65536
+"""The number of transcriptions `parse_ipa_many()` remembers before
+starting over, which bounds its memory on long streams."""
+
+
+class SymbolTrie:
+    """The class for `SymbolTrie`.
+
+    A `SymbolTrie` maps the symbols of phonemes to the phonemes, one
+    character per level, so that IPA text can be segmented by longest
+    match in a single left-to-right pass. Symbols may span several code
+    points, such as affricates, or bases followed by combining
+    diacritics. All symbols and texts are normalized to NFC first.
+    """
+
+    _DEFAULT_CACHE: "tuple[int, SymbolTrie] | None" = None
+    _INVENTORY_CACHE: "WeakKeyDictionary[PhonemicInventory, tuple[tuple[Phoneme, ...], SymbolTrie]]" = WeakKeyDictionary()
+
+    def __init__(self, phonemes: Iterable[Phoneme] = ()) -> None:
+        """Creates a new `SymbolTrie` of the given phonemes.
+
+        Parameters
+        ----------
+        phonemes : Iterable[Phoneme], optional
+            the phonemes to add, by default none. If several phonemes
+            share a symbol, the first one is kept
+        """
+        self._root: dict[str, dict] = {}
+        self._size: int = 0
+        for phoneme in phonemes:
+            self.add(phoneme)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, phoneme: Phoneme) -> None:
+        """Adds the given phoneme under its symbol, unless a phoneme was
+        already added with the same symbol.
+        """
+        node = self._root
+        for char in unicodedata.normalize("NFC", phoneme.symbol):
+            node = node.setdefault(char, {})
+        if _END not in node:
+            node[_END] = phoneme # type: ignore
+            self._size += 1
+
+    def get(self, symbol: str) -> Phoneme | None:
+        """Returns the phoneme of exactly the given symbol, or `None`.
+        """
+        node = self._root
+        for char in unicodedata.normalize("NFC", symbol):
+            try:
+                node = node[char]
+            except KeyError:
+                return None
+        return node.get(_END) # type: ignore
+
+    def segment(self, text: str,
+        unknown: UnknownSymbolHandling = "error") -> tuple[Phoneme, ...]:
+        """Segments already normalized text into phonemes by longest
+        match. Whitespace is skipped. Use `parse_ipa()` for text that is
+        not yet normalized.
+
+        Parameters
+        ----------
+        text : str
+            the NFC-normalized IPA text to segment
+        unknown : UnknownSymbolHandling, optional
+            how to handle segments matching no symbol, by default
+            `"error"`
+
+        Returns
+        -------
+        tuple[Phoneme, ...]
+            the phonemes of the text
+
+        Raises
+        ------
+        CLCKException
+            if `unknown` is `"error"` and a segment matches no symbol
+        """
+        root = self._root
+        result: list[Phoneme] = []
+        size = len(text)
+        i = 0
+        while i < size:
+            char = text[i]
+            if char.isspace():
+                i += 1
+                continue
+
+            # Walk down the trie as far as the text allows, remembering
+            # the last complete symbol seen
+            node = root
+            matched: Phoneme | None = None
+            end = i
+            j = i
+            while j < size:
+                try:
+                    node = node[text[j]]
+                except KeyError:
+                    break
+                j += 1
+                if _END in node:
+                    matched = node[_END] # type: ignore
+                    end = j
+
+            # A match may not split a base from its combining marks
+            if matched is not None and not (end < size
+                and unicodedata.combining(text[end])):
+                result.append(matched)
+                i = end
+                continue
+
+            end = i + 1
+            while end < size and unicodedata.combining(text[end]):
+                end += 1
+            if unknown == "dummy":
+                result.append(DummyPhoneme(text[i:end]))
+            elif unknown == "error":
+                raise CLCKException(f"Unknown IPA symbol \"{text[i:end]}\" at position {i} of \"{text}\"")
+            i = end
+
+        return tuple(result)
+
+    @classmethod
+    def of_default_phonemes(cls) -> "SymbolTrie":
+        """Returns the trie of `Phoneme.DEFAULT_IPA_PHONEMES`, building
+        it again only after default phonemes are added.
+        """
+        defaults = Phoneme.DEFAULT_IPA_PHONEMES
+        cached = cls._DEFAULT_CACHE
+        if cached is None or cached[0] != len(defaults):
+            cached = cls._DEFAULT_CACHE = (len(defaults), cls(defaults))
+        return cached[1]
+
+    @classmethod
+    def of_inventory(cls, inventory: PhonemicInventory) -> "SymbolTrie":
+        """Returns the trie of the phonemes of the given inventory. The
+        trie is cached per inventory and only built again after phonemes
+        are added to it.
+        """
+        cached = cls._INVENTORY_CACHE.get(inventory)
+        if cached is None or cached[0] is not inventory.phonemes:
+            cached = cls._INVENTORY_CACHE[inventory] = (inventory.phonemes,
+                cls(inventory.phonemes))
+        return cached[1]
+
+
+def _get_trie(inventory: PhonemicInventory | SymbolTrie | None) -> SymbolTrie:
+    if inventory is None:
+        return SymbolTrie.of_default_phonemes()
+    elif isinstance(inventory, SymbolTrie):
+        return inventory
+    return SymbolTrie.of_inventory(inventory)
+
+
+def parse_ipa(text: str, inventory: PhonemicInventory | SymbolTrie | None = None,
+    unknown: UnknownSymbolHandling = "error") -> tuple[Phoneme, ...]:
+    """Parses an IPA transcription into phonemes.
+
+    The text is normalized to NFC and segmented by longest match against
+    the symbols of the inventory, so that multi-code-point symbols and
+    symbols with combining diacritics are recognized as single phonemes.
+    Whitespace is skipped.
+
+    Below demonstrates parsing a word with the default IPA phonemes,
+    keeping the symbols they lack as dummy phonemes.::
+
+        parse_ipa("ʈaŋka", unknown="dummy")
+
+    Parameters
+    ----------
+    text : str
+        the IPA transcription to parse
+    inventory : PhonemicInventory | SymbolTrie | None, optional
+        the inventory or prebuilt trie whose phonemes are recognized, by
+        default `Phoneme.DEFAULT_IPA_PHONEMES`
+    unknown : UnknownSymbolHandling, optional
+        how to handle segments matching no symbol, by default `"error"`
+
+    Returns
+    -------
+    tuple[Phoneme, ...]
+        the phonemes of the transcription
+
+    Raises
+    ------
+    CLCKException
+        if `unknown` is `"error"` and a segment matches no symbol
+    """
+    return _get_trie(inventory).segment(unicodedata.normalize("NFC", text),
+        unknown)
+
+
+def parse_ipa_many(texts: Iterable[str],
+    inventory: PhonemicInventory | SymbolTrie | None = None,
+    unknown: UnknownSymbolHandling = "error") -> Iterator[tuple[Phoneme, ...]]:
+    """Lazily parses many IPA transcriptions, such as the lines of a
+    wordlist, yielding the phonemes of each in order. See
+    `parse_ipa()`.
+
+    The trie is looked up once for the whole batch, and recently seen
+    transcriptions are not segmented again. With `unknown="dummy"`, a
+    repeated transcription may therefore share its dummy phonemes.
+    """
+    trie = _get_trie(inventory)
+    normalize = unicodedata.normalize
+    segmented: dict[str, tuple[Phoneme, ...]] = {}
+    for text in texts:
+        result = segmented.get(text)
+        if result is None:
+            if len(segmented) >= _MAX_SEGMENTED:
+                segmented.clear()
+            result = segmented[text] = trie.segment(normalize("NFC", text),
+                unknown)
+        yield result
@@ -0,0 +1,327 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from clck.exceptions import CLCKException
+from clck.phonetics.articulatory_properties import FEATURES
+from clck.phonetics.articulatory_properties import AirstreamMechanism
+from clck.phonetics.articulatory_properties import ArticulatoryProperty
+from clck.phonetics.articulatory_properties import MannerOfArticulation
+from clck.phonetics.articulatory_properties import Phonation
+from clck.phonetics.articulatory_properties import PlaceOfArticulation
+from clck.phonetics.articulatory_properties import get_feature_mask
+from clck.phonetics.articulatory_properties import get_feature_properties
+
+if TYPE_CHECKING:
+    import numpy
+    from clck.phonology.phonemes import Phoneme
+
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(__file__), "ipa_chart.bin")
+"""The path of the prebuilt table of the IPA chart. Regenerate it with
+`python -m clck.ipa.table` after editing the chart."""
+
+PULMONIC_CONSONANT = 0
+"""The class ID of rows describing a `ConsonantPhoneme` of a
+`PulmonicConsonantPhone`."""
+
+_MAGIC = b"CLCKIPA\x01"
+
+# The table is little-endian and laid out in columns:
+#   header      magic, row count, checksum, string count, string bytes
+#   masks       one uint64 feature mask per row
+#   class IDs   one uint16 per row, padded to a multiple of 8 bytes
+#   offsets     string count + 1 uint32 offsets into the string block
+#   strings     the UTF-8 symbols of all rows, then their names
+_HEADER = struct.Struct("<8sIIII")
+
+TableRow = tuple[str, str, int, int]
+"""A row of an `IPATable` as (constant name, symbol, feature mask,
+class ID)."""
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def get_checksum(rows: Iterable[TableRow]) -> int:
+    """Returns the checksum of the given rows. The names of `FEATURES`
+    are included, since the meaning of a mask depends on them.
+    """
+    data = repr((tuple(rows), tuple(p.name for p in FEATURES)))
+    return zlib.crc32(data.encode("utf-8"))
+
+
+def get_chart_rows() -> tuple[TableRow, ...]:
+    """Returns the rows of the IPA chart as defined in
+    `clck.ipa.IPA`, in chart order.
+    """
+    from clck.ipa.IPA import _CHART_SPEC
+
+    return tuple([(name, symbol, get_feature_mask((place, manner,
+        AirstreamMechanism.PULMONIC, phonation)), PULMONIC_CONSONANT)
+        for name, symbol, place, manner, phonation in _CHART_SPEC])
+
+
+def build_table(rows: Sequence[TableRow]) -> bytes:
+    """Encodes the given rows into the binary table format read by
+    `IPATable`.
+
+    Parameters
+    ----------
+    rows : Sequence[TableRow]
+        the rows to encode, in row order
+
+    Returns
+    -------
+    bytes
+        the encoded table
+    """
+    n = len(rows)
+    strings = [row[1].encode("utf-8") for row in rows]
+    strings.extend([row[0].encode("utf-8") for row in rows])
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+
+    class_ids = struct.pack(f"<{n}H", *[row[3] for row in rows])
+    return b"".join((
+        _HEADER.pack(_MAGIC, n, get_checksum(rows), len(strings), offsets[-1]),
+        struct.pack(f"<{n}Q", *[row[2] for row in rows]),
+        class_ids, bytes(_pad(len(class_ids))),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        *strings,
+    ))
+
+
+def write_table(path: str = DEFAULT_TABLE_PATH,
+    rows: Sequence[TableRow] | None = None) -> None:
+    """Writes the table of the given rows, by default those of the IPA
+    chart, to the given path.
+    """
+    data = build_table(get_chart_rows() if rows is None else rows)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+class IPATable:
+    """The class for `IPATable`.
+
+    An `IPATable` is a read-only table of phoneme definitions stored in
+    a compact binary format: the symbol, constant name, feature mask
+    (see `FEATURE_BITS`) and class ID of each row. Tables opened from a
+    file are memory-mapped, so processes reading the same table share a
+    single copy of it.
+
+    Symbols, masks and feature queries are read directly from the table
+    without creating any objects. The phonemes of the rows are only
+    created on the first call to `get_phoneme()` or `get_phonemes()`,
+    all at once and in row order.
+
+    Below demonstrates finding the symbols of all voiced plosives of
+    the IPA chart without loading it.::
+
+        table = get_default_table()
+        [table.get_symbol(i) for i in table.select(Phonation.VOICED,
+            MannerOfArticulation.PLOSIVE)]
+    """
+
+    def __init__(self, buffer: "bytes | mmap.mmap", default: bool = False) -> None:
+        """Creates a new `IPATable` reading the given encoded table. Use
+        `open()` to memory-map a table file.
+
+        Parameters
+        ----------
+        buffer : bytes | mmap.mmap
+            the encoded table, as returned by `build_table()`
+        default : bool, optional
+            whether the phonemes of this table are created as default
+            IPA phonemes, by default `False`
+
+        Raises
+        ------
+        CLCKException
+            if the buffer is not a valid table
+        """
+        if len(buffer) < _HEADER.size:
+            raise CLCKException("The IPA table is truncated")
+        magic, n, checksum, string_count, string_size = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise CLCKException("The IPA table has an unknown format")
+
+        masks_start = _HEADER.size
+        class_ids_start = masks_start + 8 * n
+        offsets_start = class_ids_start + 2 * n + _pad(2 * n)
+        self._strings_start = offsets_start + 4 * (string_count + 1)
+        if len(buffer) != self._strings_start + string_size:
+            raise CLCKException("The IPA table is truncated")
+
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._size: int = n
+        self._checksum: int = checksum
+        self._masks_start = masks_start
+        self._masks: Sequence[int]
+        self._class_ids: Sequence[int]
+        self._offsets: Sequence[int]
+        if sys.byteorder == "little":
+            self._masks = self._view[masks_start:class_ids_start].cast("Q")
+            self._class_ids = self._view[class_ids_start:class_ids_start + 2 * n].cast("H")
+            self._offsets = self._view[offsets_start:self._strings_start].cast("I")
+        else:
+            self._masks = array("Q", struct.unpack_from(f"<{n}Q", buffer, masks_start))
+            self._class_ids = array("H", struct.unpack_from(f"<{n}H", buffer, class_ids_start))
+            self._offsets = array("I", struct.unpack_from(f"<{string_count + 1}I",
+                buffer, offsets_start))
+
+        self._default = default
+        self._symbol_rows: dict[str, int] | None = None
+        self._phonemes: "tuple[Phoneme, ...] | None" = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def checksum(self) -> int:
+        """The checksum of the rows of this table, as computed by
+        `get_checksum()` when it was built."""
+        return self._checksum
+
+    def get_class_id(self, row: int) -> int:
+        """Returns the class ID of the given row."""
+        return self._class_ids[row]
+
+    def get_mask(self, row: int) -> int:
+        """Returns the feature mask of the given row."""
+        return self._masks[row]
+
+    def get_name(self, row: int) -> str:
+        """Returns the constant name of the given row."""
+        return self._get_string(self._size + row)
+
+    def get_properties(self, row: int) -> tuple[ArticulatoryProperty, ...]:
+        """Returns the articulatory properties of the given row, in
+        feature bit order.
+        """
+        return get_feature_properties(self._masks[row])
+
+    def get_symbol(self, row: int) -> str:
+        """Returns the symbol of the given row."""
+        return self._get_string(row)
+
+    def find(self, symbol: str) -> int | None:
+        """Returns the first row with the given symbol, or `None`."""
+        if self._symbol_rows is None:
+            self._symbol_rows = {}
+            for row in reversed(range(self._size)):
+                self._symbol_rows[self._get_string(row)] = row
+        return self._symbol_rows.get(symbol)
+
+    def select(self, *properties: ArticulatoryProperty) -> tuple[int, ...]:
+        """Returns the rows having all the given articulatory
+        properties, in row order. No phonemes are created.
+        """
+        mask = get_feature_mask(properties)
+        return tuple([row for row, m in enumerate(self._masks)
+            if m & mask == mask])
+
+    def get_feature_masks(self) -> "numpy.ndarray":
+        """Returns the feature masks of all rows as a read-only NumPy
+        `uint64` array sharing the memory of this table. Requires NumPy.
+        """
+        import numpy
+
+        return numpy.frombuffer(self._buffer, dtype="<u8", count=self._size,
+            offset=self._masks_start)
+
+    def get_phoneme(self, row: int) -> "Phoneme":
+        """Returns the phoneme of the given row. See `get_phonemes()`.
+        """
+        return self.get_phonemes()[row]
+
+    def get_phonemes(self) -> "tuple[Phoneme, ...]":
+        """Returns the phonemes of all rows, in row order, creating them
+        on the first call.
+
+        Raises
+        ------
+        CLCKException
+            if a row has an unknown class ID
+        """
+        if self._phonemes is None:
+            self._phonemes = tuple([self._create_phoneme(row)
+                for row in range(self._size)])
+        return self._phonemes
+
+    def _create_phoneme(self, row: int) -> "Phoneme":
+        from clck.phonetics.phones import PulmonicConsonantPhone
+        from clck.phonology.phonemes import ConsonantPhoneme
+
+        class_id = self._class_ids[row]
+        if class_id != PULMONIC_CONSONANT:
+            raise CLCKException(f"Unknown class ID {class_id} in row {row} of the IPA table")
+
+        place = manner = phonation = None
+        others = []
+        for p in self.get_properties(row):
+            if isinstance(p, PlaceOfArticulation):
+                place = p
+            elif isinstance(p, MannerOfArticulation):
+                manner = p
+            elif isinstance(p, Phonation):
+                phonation = p
+            elif p is not AirstreamMechanism.PULMONIC:
+                others.append(p)
+        if place is None or manner is None or phonation is None:
+            raise CLCKException(f"Row {row} of the IPA table does not describe a pulmonic consonant")
+        return ConsonantPhoneme(PulmonicConsonantPhone(self.get_symbol(row),
+            place, manner, phonation, tuple(others), self._default))
+
+    def _get_string(self, index: int) -> str:
+        start = self._strings_start
+        return str(self._view[start + self._offsets[index]:
+            start + self._offsets[index + 1]], "utf-8")
+
+    @classmethod
+    def open(cls, path: str, default: bool = False) -> "IPATable":
+        """Opens the table file at the given path by memory-mapping it
+        read-only.
+        """
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, default)
+
+
+_default_table: IPATable | None = None
+
+
+def get_default_table() -> IPATable:
+    """Returns the table of the IPA chart, whose phonemes are the
+    default IPA phonemes.
+
+    The prebuilt table at `DEFAULT_TABLE_PATH` is memory-mapped if it
+    matches the chart defined in `clck.ipa.IPA`. Otherwise, such as
+    after the chart was edited without regenerating the file, the
+    table is built in memory instead.
+    """
+    global _default_table
+    if _default_table is None:
+        rows = get_chart_rows()
+        table = None
+        try:
+            table = IPATable.open(DEFAULT_TABLE_PATH, True)
+        except (OSError, ValueError, CLCKException):
+            pass
+        if table is None or table.checksum != get_checksum(rows):
+            table = IPATable(build_table(rows), True)
+        _default_table = table
+    return _default_table
+
+
+if __name__ == "__main__":
+    write_table()
+    print(f"Wrote {len(get_chart_rows())} rows to {DEFAULT_TABLE_PATH}")
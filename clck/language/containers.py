@@ -1,23 +1,27 @@
 from clck.articulation import PhonologicalProperty
+from clck.common.registry import RegistryView, WeakRegistry
 from clck.language.managers import Manager
 from clck.phonetics.phones import *
-from clck.phonology.phonemes import Phoneme
+from clck.phonology.phonemes import DEFAULT_IPA_PHONEME_REGISTRY, Phoneme
 
 
 class PhonemeGroupsManager(Manager):
 
-    global_list: list["PhonemeGroup"] = []
+    global_list: WeakRegistry["PhonemeGroup"] = WeakRegistry()
     """
-    The global list of all phoneme groups across all `Language`
+    The global registry of all live phoneme groups across all `Language`
     instances.
     """
 
-    labels: list[str] = []
+    labels = RegistryView[tuple[str, ...]](lambda: tuple([pg.label
+        for pg in PhonemeGroupsManager.global_list]))
+    """The labels of the phoneme groups of `global_list`."""
+
+    def __init__(self) -> None:
+        self.elements: list[PhonemeGroup] = []
 
     @classmethod  
     def global_register(cls, *phoneme_groups: "PhonemeGroup") -> None:
-        for pg in phoneme_groups:
-            PhonemeGroupsManager.labels.append(pg.label)
         return super().global_register(*phoneme_groups)
 
 
@@ -30,13 +34,8 @@ class PhonemeGroup:
 
     @classmethod
     def from_type(cls, label: str, phoneme_type: type[Phoneme]) -> "PhonemeGroup":
-        phonemes: list[Phoneme] = []
-
-        for phoneme in Phoneme.DEFAULT_IPA_PHONEMES:
-            if isinstance(phoneme, phoneme_type):
-                phonemes.append(phoneme)
-
-        return PhonemeGroup(label, *phonemes)
+        return PhonemeGroup(label,
+            *DEFAULT_IPA_PHONEME_REGISTRY.by_class(phoneme_type))
     
     @classmethod
     def from_property(cls, label: str, *property_names: str) -> "PhonemeGroup":
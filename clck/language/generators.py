@@ -1,8 +1,38 @@
 import random
+from enum import Enum
+from typing import Any
+from clck.common.builder import StructureBuilder
 from clck.common.component import Component
+from clck.common.structure import Structure
+from clck.phonology.phonemes import DEFAULT_IPA_PHONEME_REGISTRY
 from clck.phonology.phonemes import ConsonantPhoneme, Phoneme, PhonemicInventory, VowelPhoneme
 from clck.phonology.syllabics import SyllabicComponent
-from clck.language.containers import PhonemeGroup
+
+
+_DEFAULT_KEYS: dict[type, tuple[tuple[Phoneme, ...], set[tuple[type, str]]]] = {}
+
+
+def _get_default_keys(cls: type[Phoneme]) -> set[tuple[type, str]]:
+    # Phonemes are equal when their classes and transcripts are, so the
+    # default phonemes of a class can be matched by these keys. The
+    # keys are only computed again after default phonemes are added.
+    phonemes = DEFAULT_IPA_PHONEME_REGISTRY.by_class(cls)
+    cached = _DEFAULT_KEYS.get(cls)
+    if cached is None or cached[0] is not phonemes:
+        cached = _DEFAULT_KEYS[cls] = (phonemes,
+            {(p.__class__, p.ipa_transcript) for p in phonemes})
+    return cached[1]
+
+
+class GroupingIdentifiers(Enum):
+    """The characters grouping the parts of a generator formula."""
+    OPTIONAL_GROUP_OPEN = "("
+    OPTIONAL_GROUP_CLOSE = ")"
+
+
+class ActionReferences(Enum):
+    """The actions taken on the groups of a generator formula."""
+    OPTIONAL = "optional"
 
 
 class SyllableGenerator:
@@ -55,19 +85,49 @@ class SyllableGenerator:
 
         return tuple(rl)
 
+    def generate_structures(self, formula: str, size: int,
+        type: type[Structure[Any]] = SyllabicComponent) -> tuple[Structure[Any], ...]:
+        """Generates `size` structures of the given type from the given
+        formula, see `generate()`. Each structure is created once from
+        its generated components by a `StructureBuilder`.
+
+        Parameters
+        ----------
+        formula : str
+            the formula to generate the components from
+        size : int
+            the number of structures to generate
+        type : type[Structure], optional
+            the `Structure` subclass of the results, by default
+            `SyllabicComponent`
+
+        Returns
+        -------
+        tuple[Structure, ...]
+            the generated structures
+        """
+        rl: list[Structure[Any]] = []
+        for components in self.generate(formula, size):
+            builder = StructureBuilder(type)
+            builder.extend(components)
+            rl.append(builder.freeze())
+        return tuple(rl)
+
     def get_consonants(self) -> tuple[ConsonantPhoneme, ...]:
         l: list[ConsonantPhoneme] = []
-        IPA_consonants = PhonemeGroup.from_type("C", ConsonantPhoneme).phonemes
+        IPA_consonants = _get_default_keys(ConsonantPhoneme)
         for ph in self._bank.phonemes:
-            if ph in IPA_consonants and isinstance(ph, ConsonantPhoneme):
+            if ((ph.__class__, ph.ipa_transcript) in IPA_consonants
+                and isinstance(ph, ConsonantPhoneme)):
                 l.append(ph)
         return tuple(l)
     
     def get_vowels(self) -> tuple[VowelPhoneme, ...]:
         l: list[VowelPhoneme] = []
-        IPA_vowels = PhonemeGroup.from_type("V", VowelPhoneme).phonemes
+        IPA_vowels = _get_default_keys(VowelPhoneme)
         for ph in self._bank.phonemes:
-            if ph in IPA_vowels and isinstance(ph, VowelPhoneme):
+            if ((ph.__class__, ph.ipa_transcript) in IPA_vowels
+                and isinstance(ph, VowelPhoneme)):
                 l.append(ph)
         return tuple(l)
     
@@ -1,10 +1,15 @@
-from typing import List, Tuple, Type
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
 
 import clck.language.generators as generators
-from clck.phonology.phonemes import PhonemicInventory
+from clck.phonetics.phones import Phone
+from clck.phonology.allophony import AllophoneRule, Allophony, Environment, Realizable
+from clck.phonology.phonemes import Phoneme, PhonemicInventory
 from clck.language.managers import Manager, PhonemesManager
-from clck.language.containers import PhonemeGroupsManager
-from clck.common.component import Structure
+from clck.language.containers import PhonemeGroup, PhonemeGroupsManager
+from clck.language.orthography import Orthography
+from clck.language.romanization import Romanization, RomanizationRule, RomanizationTrie
+from clck.language.sound_changes import SoundChangeCascade
+from clck.common.structure import Structure
 
 
 class Language:
@@ -13,12 +18,17 @@ class Language:
         self._structures: List[Structure] = []
         self._syllable_generator: generators.SyllableGenerator
         self._phonological_inventory: PhonemicInventory | None = None
+        self._allophony: Allophony = Allophony(inventory)
+        self._sound_changes: SoundChangeCascade = SoundChangeCascade()
+        self._romanization: Romanization = Romanization(inventory)
+        self._orthography: Orthography | None = None
+        self._orthography_key: tuple[RomanizationTrie, tuple[Phoneme, ...]] | None = None
 
         # Manager classes
         self._phonemes_manager: PhonemesManager = PhonemesManager()
-        self._phonemegroups_manager = PhonemeGroupsManager
+        self._phonemegroups_manager = PhonemeGroupsManager()
 
-        self._managers: Tuple[Manager | Type[Manager], ...] = (
+        self._managers: Tuple[Manager, ...] = (
             self._phonemes_manager,
             self._phonemegroups_manager,
         )
@@ -26,9 +36,109 @@ class Language:
         self._phonemes_manager.register(*self._inventory.phonemes)
 
 
-    def get_managers(self) -> tuple[Manager | Type[Manager], ...]:
+    @property
+    def allophony(self) -> Allophony:
+        """The allophone rules of this language."""
+        return self._allophony
+
+    @property
+    def inventory(self) -> PhonemicInventory:
+        """The phonemic inventory of this language."""
+        return self._inventory
+
+    @property
+    def orthography(self) -> Orthography:
+        """The orthography reading text written under the romanization
+        rules of this language back into the phonemes of its inventory.
+        It is rebuilt after the rules or the inventory change.
+        """
+        key = (self._romanization.trie, self._inventory.phonemes)
+        if (self._orthography is None or self._orthography_key is None
+            or any([a is not b for a, b in zip(key, self._orthography_key)])):
+            self._orthography = Orthography(self._romanization, key[1])
+            self._orthography_key = key
+        return self._orthography
+
+    @property
+    def romanization(self) -> Romanization:
+        """The romanization rules of this language."""
+        return self._romanization
+
+    @property
+    def structures(self) -> tuple[Structure, ...]:
+        """The registered structures of this language, in registration
+        order."""
+        return tuple(self._structures)
+
+    @property
+    def sound_changes(self) -> SoundChangeCascade:
+        """The sound change cascade run over the registered structures
+        of this language, in registration order."""
+        return self._sound_changes
+
+    def add_allophone_rule(self, phoneme: Phoneme, allophone: Phone,
+        left: Environment = None, right: Environment = None) -> AllophoneRule:
+        """Adds a rule realizing the given phoneme as the given phone
+        between neighbours satisfying the given environments. See
+        `Allophony.add_rule()`.
+        """
+        return self._allophony.add_rule(phoneme, allophone, left, right)
+
+    def add_romanization_rule(self, phonemes: Phoneme | Sequence[Phoneme],
+        grapheme: str, left: Environment = None,
+        right: Environment = None) -> RomanizationRule:
+        """Adds a rule writing the given phoneme or sequence of phonemes
+        as the given grapheme between neighbours satisfying the given
+        environments. See `Romanization.add_rule()`.
+        """
+        return self._romanization.add_rule(phonemes, grapheme, left, right)
+
+    def get_allophones(self, phoneme: Phoneme) -> tuple[Phone, ...]:
+        """Returns the allophones of the given phoneme in this language.
+        See `Allophony.get_allophones()`.
+        """
+        return self._allophony.get_allophones(phoneme)
+
+    def get_managers(self) -> tuple[Manager, ...]:
         return self._managers
 
+    def realize(self, word: Realizable) -> str:
+        """Returns the phonetic transcription of the given structure,
+        packed structure or sequence of phonemes under the allophone
+        rules of this language. Transcriptions are cached until the
+        rules change.
+        """
+        return self._allophony.realize_transcript(word)
+
+    def realize_many(self, words: Iterable[Realizable]) -> Iterator[str]:
+        """Lazily returns the phonetic transcriptions of many words,
+        such as a whole lexicon. See `realize()`.
+        """
+        return self._allophony.realize_many(words)
+
+    def romanize(self, word: Realizable) -> str:
+        """Returns the romanization of the given structure, packed
+        structure or sequence of phonemes under the romanization rules
+        of this language. See `Romanization.romanize()`.
+        """
+        return self._romanization.romanize(word)
+
+    def romanize_many(self, words: Iterable[Realizable]) -> Iterator[str]:
+        """Lazily returns the romanizations of many words, such as a
+        whole lexicon, reusing the romanizations of shared subtrees.
+        See `romanize()`.
+        """
+        return self._romanization.romanize_many(words)
+
+    def select(self, **conditions: Any) -> PhonemeGroup:
+        """Returns the natural class of the phonemes of this language
+        satisfying all the given conditions. See
+        `PhonemicInventory.select()`.
+        """
+        return self._inventory.select(**conditions)
+
 
     def register_structures(self, *structures: Structure) -> None:
-        self._structures.extend(structures)
\ No newline at end of file
+        self._structures.extend(structures)
+        self._sound_changes.add_words(*[self._inventory.resolve_phonemes(s.phonemes)
+            for s in structures])
\ No newline at end of file
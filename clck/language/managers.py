@@ -2,12 +2,20 @@ from abc import ABC
 from typing import Any, List
 
 from clck.articulation import PhonologicalProperty
+from clck.common.registry import WeakRegistry
 from clck.phonetics.phones import Phone
 
 
 class Manager(ABC):
+    """The base class of the managers of a `Language`.
 
-    global_list: List[Any] = []
+    A manager instance holds the elements registered to one language,
+    and keeps them alive as long as the language is. Every registered
+    element also enters the `global_list` of its manager class, which
+    only references the elements weakly and so never outlives them.
+    """
+
+    global_list: WeakRegistry[Any] = WeakRegistry()
 
     def __init__(self) -> None:
         self.elements: List[Any] = []
@@ -18,14 +26,15 @@ class Manager(ABC):
 
     @classmethod
     def global_register(cls, *items: Any) -> None:
-        cls.global_list.extend(items)
+        cls.global_list.add(*items)
 
 
 
 class PhonemesManager(Manager):
 
-    global_list: List[Phone] = []
-    """The global list of all phonemes across all `Language` instances."""
+    global_list: WeakRegistry[Phone] = WeakRegistry()
+    """The global registry of all live phonemes across all `Language`
+    instances."""
 
     def __init__(self) -> None:
         self.elements: List[Phone] = []
@@ -40,7 +49,7 @@ class PhonemesManager(Manager):
 
 class PropertiesManager(Manager):
 
-    global_list: List[PhonologicalProperty] = []
+    global_list: WeakRegistry[PhonologicalProperty] = WeakRegistry()
 
     def __init__(self) -> None:
         super().__init__()
@@ -0,0 +1,330 @@
+from typing import Iterable, Iterator, TypeAlias
+
+from clck.exceptions import CLCKException
+from clck.language.romanization import Romanization
+from clck.phonology.phonemes import Phoneme
+
+
+Reading: TypeAlias = "tuple[Phoneme, ...]"
+"""The phonemes a word or a grapheme is read as."""
+
+Lattice: TypeAlias = "tuple[tuple[tuple[int, Reading], ...], ...]"
+"""The readings of a word as a graph over its character positions,
+holding at each position the (end position, reading) of every grapheme
+starting there. Only edges lying on some reading of the whole word are
+kept."""
+
+DEFAULT_SEPARATORS = " \t\r\n.,;:!?\"()[]{}«»"
+"""The characters separating words in a text, unless a grapheme uses
+them."""
+
+_MAX_CACHED_READINGS = 65536
+"""The number of read words an `Orthography` remembers before starting
+over."""
+
+
+class GraphemeAutomaton:
+    """The class for `GraphemeAutomaton`.
+
+    A `GraphemeAutomaton` is an Aho-Corasick automaton over a set of
+    graphemes. It finds every occurrence of every grapheme in a string
+    in a single pass over its characters, whatever the number of
+    graphemes.
+    """
+
+    def __init__(self, graphemes: Iterable[str]) -> None:
+        """Compiles a new `GraphemeAutomaton` of the given non-empty
+        graphemes, numbered in the order given.
+
+        Raises
+        ------
+        CLCKException
+            if a grapheme is empty
+        """
+        self._graphemes: tuple[str, ...] = tuple(graphemes)
+        # The child of each (state, character) edge, the root being 0
+        goto: dict[tuple[int, str], int] = {}
+        ends: list[list[int]] = [[]]
+        for g, grapheme in enumerate(self._graphemes):
+            if not grapheme:
+                raise CLCKException("Cannot match an empty grapheme")
+            state = 0
+            for char in grapheme:
+                child = goto.get((state, char))
+                if child is None:
+                    child = goto[(state, char)] = len(ends)
+                    ends.append([])
+                state = child
+            ends[state].append(g)
+
+        # States are visited breadth first, so the failure state of
+        # every state is complete before its children's are computed
+        children: dict[int, list[tuple[str, int]]] = {}
+        for (state, char), child in goto.items():
+            children.setdefault(state, []).append((char, child))
+        fail = [0] * len(ends)
+        outputs: list[tuple[int, ...]] = [()] * len(ends)
+        queue = [0]
+        for state in queue:
+            for char, child in children.get(state, ()):
+                if state:
+                    f = fail[state]
+                    while f and (f, char) not in goto:
+                        f = fail[f]
+                    fail[child] = goto.get((f, char), 0)
+                outputs[child] = tuple(ends[child]) + outputs[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    @property
+    def graphemes(self) -> tuple[str, ...]:
+        """The graphemes of this automaton, in order."""
+        return self._graphemes
+
+    @property
+    def state_count(self) -> int:
+        """The number of states of this automaton."""
+        return len(self._fail)
+
+    def find(self, text: str) -> Iterator[tuple[int, int]]:
+        """Lazily returns the (end position, grapheme number) of every
+        occurrence of the graphemes in the given text, by increasing
+        end position, where the end position is that after the last
+        character.
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for i, char in enumerate(text):
+            next_state = goto.get((state, char))
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto.get((state, char))
+            state = 0 if next_state is None else next_state
+            for g in outputs[state]:
+                yield i + 1, g
+
+
+class Orthography:
+    """The class for `Orthography`.
+
+    An `Orthography` reads text written in the Latin orthography of a
+    language back into phonemes. It reverses the rules of a
+    `Romanization`, every non-empty grapheme being read as the
+    phonemes its rules write, and reads the output of every other given
+    phoneme as that phoneme. Environments are not checked, as they
+    constrain writing rather than reading, and phonemes written as an
+    empty grapheme cannot be recovered.
+
+    Words are segmented by the longest grapheme matching at each
+    position. Ambiguous words can instead be read through their
+    `Lattice` of all readings, see `get_lattice()` and `read_all()`.
+
+    Below demonstrates reading a corpus file line by line.::
+
+        orthography = language.orthography
+        for words in orthography.read_file("corpus.txt"):
+            ...
+    """
+
+    def __init__(self, romanization: Romanization,
+        phonemes: Iterable[Phoneme] = (), ignore_case: bool = True,
+        separators: str = DEFAULT_SEPARATORS) -> None:
+        """Creates a new `Orthography` reversing the given romanization.
+
+        Parameters
+        ----------
+        romanization : Romanization
+            the romanization whose rules are reversed
+        phonemes : Iterable[Phoneme], optional
+            the phonemes also read from their output, usually those of
+            an inventory, by default none
+        ignore_case : bool, optional
+            whether or not text is read case-insensitively, by default
+            `True`
+        separators : str, optional
+            the characters separating words, by default
+            `DEFAULT_SEPARATORS`. Those used in a grapheme are not
+            separators
+        """
+        readings: dict[str, list[Reading]] = {}
+        written: list[tuple[str, Reading]] = [(r.grapheme, r.phonemes)
+            for r in romanization.rules]
+        written += [(p.output, (p,)) for p in phonemes]
+        for grapheme, reading in written:
+            if ignore_case:
+                grapheme = grapheme.lower()
+            if not grapheme:
+                continue
+            alternatives = readings.setdefault(grapheme, [])
+            if not any(len(a) == len(reading)
+                and all(x is y for x, y in zip(a, reading)) for a in alternatives):
+                alternatives.append(reading)
+
+        used = set("".join(readings))
+        self._ignore_case = ignore_case
+        self._separators = frozenset([c for c in separators if c not in used])
+        self._automaton = GraphemeAutomaton(readings)
+        self._readings: tuple[tuple[Reading, ...], ...] = tuple(
+            [tuple(readings[g]) for g in self._automaton.graphemes])
+        self._lengths = tuple([len(g) for g in self._automaton.graphemes])
+        self._words: dict[str, Reading] = {}
+
+    @property
+    def automaton(self) -> GraphemeAutomaton:
+        """The automaton matching the graphemes of this orthography."""
+        return self._automaton
+
+    @property
+    def graphemes(self) -> tuple[str, ...]:
+        """The graphemes read by this orthography."""
+        return self._automaton.graphemes
+
+    def get_readings(self, grapheme: str) -> tuple[Reading, ...]:
+        """Returns the readings of the given grapheme, the one read by
+        default first, or an empty tuple if it is not a grapheme.
+        """
+        if self._ignore_case:
+            grapheme = grapheme.lower()
+        try:
+            return self._readings[self._automaton.graphemes.index(grapheme)]
+        except ValueError:
+            return ()
+
+    def read(self, word: str) -> Reading:
+        """Returns the phonemes of the given word, read by taking the
+        longest grapheme at each position and its default reading.
+
+        Raises
+        ------
+        CLCKException
+            if some part of the word is not a grapheme
+        """
+        reading = self._words.get(word)
+        if reading is None:
+            text = word.lower() if self._ignore_case else word
+            longest = [-1] * len(text)
+            lengths = self._lengths
+            for end, g in self._automaton.find(text):
+                start = end - lengths[g]
+                if longest[start] < 0 or lengths[g] > lengths[longest[start]]:
+                    longest[start] = g
+
+            phonemes: list[Phoneme] = []
+            position = 0
+            while position < len(text):
+                g = longest[position]
+                if g < 0:
+                    raise CLCKException(f"Cannot read \"{word}\" past \"{word[:position]}\"")
+                phonemes.extend(self._readings[g][0])
+                position += lengths[g]
+            if len(self._words) >= _MAX_CACHED_READINGS:
+                self._words.clear()
+            reading = self._words[word] = tuple(phonemes)
+        return reading
+
+    def get_lattice(self, word: str) -> Lattice:
+        """Returns the `Lattice` of all readings of the given word,
+        which is empty at every position if there is none.
+        """
+        text = word.lower() if self._ignore_case else word
+        size = len(text)
+        lengths = self._lengths
+        edges: list[list[tuple[int, Reading]]] = [[] for _ in range(size)]
+        for end, g in self._automaton.find(text):
+            for reading in self._readings[g]:
+                edges[end - lengths[g]].append((end, reading))
+
+        # Keeps the edges between positions reachable from the start
+        # and from which the end is reachable
+        complete = [False] * (size + 1)
+        complete[size] = True
+        for start in range(size - 1, -1, -1):
+            edges[start] = [e for e in edges[start] if complete[e[0]]]
+            complete[start] = bool(edges[start])
+        reachable = [False] * (size + 1)
+        reachable[0] = True
+        for start in range(size):
+            if not reachable[start]:
+                edges[start] = []
+            for end, _ in edges[start]:
+                reachable[end] = True
+        return tuple([tuple(e) for e in edges])
+
+    def read_all(self, word: str, limit: int | None = None) -> Iterator[Reading]:
+        """Lazily returns the readings of the given word from its
+        `Lattice`, those taking longer graphemes first coming first.
+
+        Parameters
+        ----------
+        word : str
+            the word to read
+        limit : int | None, optional
+            the number of readings after which to stop, by default none
+        """
+        lattice = self.get_lattice(word)
+        size = len(lattice)
+        if size == 0:
+            yield ()
+            return
+
+        count = 0
+        path: list[Reading] = []
+        stack: list[Iterator[tuple[int, Reading]]] = [iter(sorted(lattice[0],
+            key=lambda e: -e[0]))]
+        while stack:
+            edge = next(stack[-1], None)
+            if edge is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            end, reading = edge
+            if end == size:
+                yield tuple([p for r in path for p in r] + list(reading))
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+                continue
+            path.append(reading)
+            stack.append(iter(sorted(lattice[end], key=lambda e: -e[0])))
+
+    def read_line(self, line: str) -> tuple[Reading, ...]:
+        """Returns the readings of the words of the given line of text,
+        see `read()`.
+        """
+        return tuple([self.read(w) for w in self.split(line)])
+
+    def read_lines(self, lines: Iterable[str]) -> Iterator[tuple[Reading, ...]]:
+        """Lazily returns the readings of the words of each of the given
+        lines of text, such as those of an open file. See `read_line()`.
+        """
+        for line in lines:
+            yield self.read_line(line)
+
+    def read_file(self, path: str, encoding: str = "utf-8") -> Iterator[tuple[Reading, ...]]:
+        """Lazily reads the text file of the given path line by line,
+        so that files larger than memory can be read. See
+        `read_lines()`.
+        """
+        with open(path, encoding=encoding) as file:
+            yield from self.read_lines(file)
+
+    def split(self, line: str) -> list[str]:
+        """Returns the words of the given line of text."""
+        separators = self._separators
+        words: list[str] = []
+        start = 0
+        for i, char in enumerate(line):
+            if char in separators:
+                if i > start:
+                    words.append(line[start:i])
+                start = i + 1
+        if start < len(line):
+            words.append(line[start:])
+        return words
+
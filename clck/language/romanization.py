@@ -0,0 +1,392 @@
+from typing import Any, Iterable, Iterator, Sequence
+
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PackedStructure, PhonemeIndex
+from clck.common.structure import Structure
+from clck.exceptions import CLCKException
+from clck.phonology.allophony import Environment, Realizable
+from clck.phonology.allophony import compile_environment, describe_environment
+from clck.phonology.phonemes import Phoneme, PhonemicInventory
+
+
+_MAX_CACHED_ROMANIZATIONS = 65536
+"""The number of romanized words, and separately of romanized
+subtrees, a `Romanization` remembers before starting over."""
+
+
+class RomanizationRule:
+    """The class for `RomanizationRule`.
+
+    A `RomanizationRule` states that a sequence of phonemes is written
+    as a grapheme when the phonemes before and after the sequence
+    satisfy the rule's environments (see `Environment`).
+    """
+
+    def __init__(self, phonemes: Phoneme | Sequence[Phoneme], grapheme: str,
+        left: Environment = None, right: Environment = None) -> None:
+        """Creates a new `RomanizationRule`.
+
+        Parameters
+        ----------
+        phonemes : Phoneme | Sequence[Phoneme]
+            the phoneme or the sequence of phonemes written by this
+            rule
+        grapheme : str
+            the string the phonemes are written as, which may be empty
+        left : Environment, optional
+            the condition on the phoneme preceding the sequence, by
+            default none
+        right : Environment, optional
+            the condition on the phoneme following the sequence, by
+            default none
+
+        Raises
+        ------
+        CLCKException
+            if no phonemes are given or an environment is invalid
+        """
+        if isinstance(phonemes, Phoneme):
+            phonemes = (phonemes,)
+        self._phonemes: tuple[Phoneme, ...] = tuple(phonemes)
+        if not self._phonemes:
+            raise CLCKException("A romanization rule must write at least one phoneme")
+        self._grapheme = grapheme
+        self._left = left
+        self._right = right
+        self._matches_left = compile_environment(left)
+        self._matches_right = compile_environment(right)
+
+    def __repr__(self) -> str:
+        return f"<RomanizationRule {self.__str__()}>"
+
+    def __str__(self) -> str:
+        environment = "_"
+        if self._left is not None:
+            environment = f"{describe_environment(self._left)} _"
+        if self._right is not None:
+            environment += f" {describe_environment(self._right)}"
+        symbols = "".join([p.symbol for p in self._phonemes])
+        return f"/{symbols}/ -> <{self._grapheme}> / {environment}"
+
+    @property
+    def grapheme(self) -> str:
+        """The string the phonemes are written as."""
+        return self._grapheme
+
+    @property
+    def phonemes(self) -> tuple[Phoneme, ...]:
+        """The sequence of phonemes written by this rule."""
+        return self._phonemes
+
+    def applies(self, left: Phoneme | None, right: Phoneme | None) -> bool:
+        """Returns `True` if this rule applies between the given
+        neighbours, where `None` is the edge of a word.
+        """
+        return self._matches_left(left) and self._matches_right(right)
+
+
+class RomanizationTrie:
+    """The class for `RomanizationTrie`.
+
+    A `RomanizationTrie` is the compiled form of a sequence of
+    romanization rules. The phoneme sequences of the rules are stored
+    in a trie over their phoneme IDs, so finding the longest rule
+    applying at a position walks the word once instead of trying every
+    rule. Phonemes no rule applies to are written as their output.
+    """
+
+    def __init__(self, rules: Sequence[RomanizationRule],
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> None:
+        """Compiles a new `RomanizationTrie` of the given rules.
+
+        Parameters
+        ----------
+        rules : Sequence[RomanizationRule]
+            the rules, of which the longest one applying at a position
+            writes it, the earlier one among rules of equal length
+        index : PhonemeIndex, optional
+            the index assigning IDs to phonemes, by default
+            `DEFAULT_PHONEME_INDEX`
+        """
+        self._rules = tuple(rules)
+        self._index = index
+        # The child of each (node, phoneme ID) edge, the root being 0
+        self._edges: dict[tuple[int, int], int] = {}
+        # The rules ending at each node, in order
+        self._accepts: dict[int, list[RomanizationRule]] = {}
+        self._signatures: dict[tuple[bool, ...], int] = {}
+        self._class_ids: dict[int, int] = {}
+
+        for rule in self._rules:
+            node = 0
+            for i in index.get_ids(rule.phonemes):
+                child = self._edges.get((node, i))
+                if child is None:
+                    child = self._edges[(node, i)] = len(self._edges) + 1
+                node = child
+            self._accepts.setdefault(node, []).append(rule)
+        self._boundary = self._get_class_of(None)
+
+    @property
+    def boundary_class(self) -> int:
+        """The left environment class of the edge of a word."""
+        return self._boundary
+
+    @property
+    def index(self) -> PhonemeIndex:
+        """The index of the phoneme IDs of this trie."""
+        return self._index
+
+    @property
+    def rules(self) -> tuple[RomanizationRule, ...]:
+        """The rules compiled into this trie, in order."""
+        return self._rules
+
+    def get_left_class_id(self, phoneme_id: int) -> int:
+        """Returns the left environment class of the phoneme of the
+        given ID. Two phonemes share a class when every left
+        environment of the rules treats them alike.
+        """
+        class_id = self._class_ids.get(phoneme_id)
+        if class_id is None:
+            class_id = self._class_ids[phoneme_id] = self._get_class_of(
+                self._index[phoneme_id])
+        return class_id
+
+    def match(self, phoneme_ids: Sequence[int], position: int) -> tuple[str, int, int]:
+        """Returns the grapheme of the longest rule applying at the
+        given position of a word given as phoneme IDs, the number of
+        phonemes it writes, and the furthest position of the word
+        looked at to find it, the size of the word standing for its
+        edge.
+        """
+        index = self._index
+        edges = self._edges
+        accepts = self._accepts
+        size = len(phoneme_ids)
+
+        node = 0
+        end = position
+        matched: list[tuple[int, list[RomanizationRule]]] = []
+        while end < size:
+            child = edges.get((node, phoneme_ids[end]))
+            if child is None:
+                break
+            node = child
+            end += 1
+            if node in accepts:
+                matched.append((end, accepts[node]))
+        # The edge of the word counts as looked at too
+        reach = end
+
+        if matched:
+            left = index[phoneme_ids[position - 1]] if position > 0 else None
+            for end, rules in reversed(matched):
+                right = index[phoneme_ids[end]] if end < size else None
+                if end > reach:
+                    reach = end
+                for rule in rules:
+                    if rule.applies(left, right):
+                        return rule.grapheme, end - position, reach
+        return index[phoneme_ids[position]].output, 1, reach
+
+    def _get_class_of(self, phoneme: Phoneme | None) -> int:
+        signature = tuple([rule._matches_left(phoneme) for rule in self._rules])
+        class_id = self._signatures.get(signature)
+        if class_id is None:
+            class_id = self._signatures[signature] = len(self._signatures)
+        return class_id
+
+
+class Romanization:
+    """The class for `Romanization`.
+
+    A `Romanization` holds the romanization rules of a language and
+    writes its words in the Latin script. Each word is written left to
+    right, the longest sequence of phonemes some rule applies to being
+    written at a time (see `RomanizationTrie`).
+
+    The rules are compiled on the first romanization after they change,
+    and results are cached until then, both for whole words, keyed by
+    their phoneme IDs, and for the substructures of structures, keyed
+    by their phoneme IDs and their neighbours. Words sharing syllables
+    therefore only romanize each distinct syllable once, and
+    romanizing a whole lexicon is a single pass over its distinct
+    subtrees.
+
+    Below demonstrates writing /ŋ/ as "ng", and /n/ before /ɡ/ as "n'"
+    so that /nɡ/ is not read as /ŋ/.::
+
+        romanization.add_rule(IPA_VOICED_VELAR_NASAL, "ng")
+        romanization.add_rule(IPA_VOICED_ALVEOLAR_NASAL, "n'",
+            right=IPA_VOICED_VELAR_PLOSIVE)
+        romanization.romanize(word)
+    """
+
+    def __init__(self, inventory: PhonemicInventory | None = None,
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> None:
+        """Creates a new `Romanization` without rules.
+
+        Parameters
+        ----------
+        inventory : PhonemicInventory | None, optional
+            the inventory whose phonemes stand in for the generated
+            phonemes of words with their symbols, by default none
+        index : PhonemeIndex, optional
+            the index assigning IDs to phonemes, by default
+            `DEFAULT_PHONEME_INDEX`
+        """
+        self._inventory = inventory
+        self._index = index
+        self._rules: list[RomanizationRule] = []
+        self._trie: RomanizationTrie | None = None
+        self._words: dict[tuple[int, ...], str] = {}
+        self._subtrees: dict[tuple[int, tuple[int, ...], int], str] = {}
+        self._matches = 0
+
+    @property
+    def matches(self) -> int:
+        """The number of rule lookups done so far, which cached results
+        do not add to."""
+        return self._matches
+
+    @property
+    def rules(self) -> tuple[RomanizationRule, ...]:
+        """The romanization rules, in order."""
+        return tuple(self._rules)
+
+    @property
+    def trie(self) -> RomanizationTrie:
+        """The compiled trie of the current rules."""
+        if self._trie is None:
+            self._trie = RomanizationTrie(self._rules, self._index)
+        return self._trie
+
+    def add_rule(self, phonemes: Phoneme | Sequence[Phoneme], grapheme: str,
+        left: Environment = None, right: Environment = None) -> RomanizationRule:
+        """Adds a rule writing the given phoneme or sequence of phonemes
+        as the given grapheme between neighbours satisfying the given
+        environments. Among rules of equal length, rules added earlier
+        take precedence. See `RomanizationRule`.
+        """
+        rule = RomanizationRule(phonemes, grapheme, left, right)
+        self._rules.append(rule)
+        self._invalidate()
+        return rule
+
+    def remove_rule(self, rule: RomanizationRule) -> None:
+        """Removes the given rule.
+
+        Raises
+        ------
+        CLCKException
+            if the rule is not one of these rules
+        """
+        for i, r in enumerate(self._rules):
+            if r is rule:
+                del self._rules[i]
+                self._invalidate()
+                return
+        raise CLCKException(f"{rule} is not a romanization rule of this romanization")
+
+    def romanize(self, word: Realizable) -> str:
+        """Returns the romanization of the given structure, packed
+        structure or sequence of phonemes, which is treated as one
+        word.
+        """
+        key = tuple(self._get_ids(word))
+        romanization = self._words.get(key)
+        if romanization is None:
+            if len(self._words) >= _MAX_CACHED_ROMANIZATIONS:
+                self._words.clear()
+            romanization = self._words[key] = self._romanize_ids(key,
+                self._get_subtree_ends(word, len(key)))
+        return romanization
+
+    def romanize_many(self, words: Iterable[Realizable]) -> Iterator[str]:
+        """Lazily returns the romanizations of many words, such as a
+        whole lexicon. See `romanize()`.
+        """
+        for word in words:
+            yield self.romanize(word)
+
+    def _get_ids(self, word: Realizable) -> Sequence[int]:
+        if isinstance(word, PackedStructure):
+            if word._index is self._index:
+                return word.phoneme_ids
+            phonemes: Sequence[Phoneme] = word.phonemes
+        elif isinstance(word, Structure):
+            phonemes = word.phonemes
+        else:
+            phonemes = word
+        if self._inventory is not None:
+            phonemes = self._inventory.resolve_phonemes(phonemes)
+        return self._index.get_ids(phonemes) # type: ignore
+
+    @staticmethod
+    def _get_subtree_ends(word: Realizable, size: int) -> list[int]:
+        # The end positions of the substructures of the word, runs of
+        # phonemes between them being taken together
+        if not isinstance(word, (Structure, PackedStructure)):
+            return [size]
+        ends: list[int] = []
+        end = 0
+        components: Iterable[Any] = word.components
+        for c in components:
+            if isinstance(c, (Structure, PackedStructure)):
+                if ends and ends[-1] < end:
+                    ends.append(end)
+                end += c.size
+                ends.append(end)
+            else:
+                end += 1
+        if end != size:
+            return [size]
+        if not ends or ends[-1] < end:
+            ends.append(end)
+        return ends
+
+    def _romanize_ids(self, phoneme_ids: tuple[int, ...], ends: list[int]) -> str:
+        trie = self.trie
+        subtrees = self._subtrees
+        size = len(phoneme_ids)
+        graphemes: list[str] = []
+        position = start = 0
+
+        for end in ends:
+            # A subtree can only be looked up if no match runs into it
+            # from the left
+            key = None
+            if position == start:
+                left = (trie.boundary_class if start == 0
+                    else trie.get_left_class_id(phoneme_ids[start - 1]))
+                right = phoneme_ids[end] if end < size else -1
+                key = (left, phoneme_ids[start:end], right)
+                romanization = subtrees.get(key)
+                if romanization is not None:
+                    graphemes.append(romanization)
+                    position = start = end
+                    continue
+
+            first = len(graphemes)
+            while position < end:
+                grapheme, length, reach = trie.match(phoneme_ids, position)
+                self._matches += 1
+                graphemes.append(grapheme)
+                position += length
+                if reach > end:
+                    key = None
+
+            # Cached only if its romanization depends on nothing but the
+            # key, which holds the right neighbour itself since matches
+            # may look at it
+            if key is not None and position == end:
+                if len(subtrees) >= _MAX_CACHED_ROMANIZATIONS:
+                    subtrees.clear()
+                subtrees[key] = "".join(graphemes[first:])
+            start = end
+        return "".join(graphemes)
+
+    def _invalidate(self) -> None:
+        self._trie = None
+        self._words.clear()
+        self._subtrees.clear()
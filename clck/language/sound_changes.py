@@ -0,0 +1,429 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PhonemeIndex
+from clck.exceptions import CLCKException
+from clck.phonology.allophony import Environment
+from clck.phonology.allophony import compile_environment, describe_environment
+from clck.phonology.phonemes import Phoneme
+
+if TYPE_CHECKING:
+    from clck.language.containers import PhonemeGroup
+
+
+Word = tuple[int, ...]
+"""A word of a `SoundChangeCascade`, as the IDs of its phonemes."""
+
+DEFAULT_MAX_CACHED_PHONEMES = 1_000_000
+"""The default number of phoneme IDs a `SoundChangeCascade` keeps in its
+cached intermediate stages."""
+
+
+class SoundChange:
+    """The class for `SoundChange`.
+
+    A `SoundChange` replaces its target phonemes with another phoneme,
+    or deletes them, wherever their neighbours satisfy the rule's
+    environments (see `Environment`). All positions of a word are
+    matched against the word as it was before the change, so a change
+    never feeds itself.
+    """
+
+    def __init__(self, target: "Phoneme | PhonemeGroup | Iterable[Phoneme]",
+        replacement: Phoneme | None, left: Environment = None,
+        right: Environment = None) -> None:
+        """Creates a new `SoundChange`.
+
+        Parameters
+        ----------
+        target : Phoneme | PhonemeGroup | Iterable[Phoneme]
+            the phoneme or phonemes changed by this rule
+        replacement : Phoneme | None
+            the phoneme the targets become, or `None` to delete them
+        left : Environment, optional
+            the condition on the preceding phoneme, by default none
+        right : Environment, optional
+            the condition on the following phoneme, by default none
+
+        Raises
+        ------
+        CLCKException
+            if the rule has no target or an environment is invalid
+        """
+        from clck.language.containers import PhonemeGroup
+
+        if isinstance(target, Phoneme):
+            targets: tuple[Phoneme, ...] = (target,)
+        elif isinstance(target, PhonemeGroup):
+            targets = target.phonemes
+        else:
+            targets = tuple(target)
+        if not targets:
+            raise CLCKException("A sound change requires at least one target phoneme")
+
+        self._targets = targets
+        self._replacement = replacement
+        self._left = left
+        self._right = right
+        self._matches_left = compile_environment(left)
+        self._matches_right = compile_environment(right)
+
+    def __repr__(self) -> str:
+        return f"<SoundChange {self.__str__()}>"
+
+    def __str__(self) -> str:
+        target = describe_environment(self._targets if len(self._targets) > 1
+            else self._targets[0])
+        replacement = "∅" if self._replacement is None else self._replacement.symbol
+        environment = "_"
+        if self._left is not None:
+            environment = f"{describe_environment(self._left)} _"
+        if self._right is not None:
+            environment += f" {describe_environment(self._right)}"
+        return f"{target} > {replacement} / {environment}"
+
+    @property
+    def replacement(self) -> Phoneme | None:
+        """The phoneme the targets become, or `None` if deleted."""
+        return self._replacement
+
+    @property
+    def targets(self) -> tuple[Phoneme, ...]:
+        """The phonemes changed by this rule."""
+        return self._targets
+
+    def apply(self, word: Word, index: PhonemeIndex,
+        target_ids: frozenset[int]) -> Word:
+        """Applies this rule to a word given as phoneme IDs of the given
+        index, where `target_ids` are the IDs of the targets.
+        """
+        last = len(word) - 1
+        replacement = (() if self._replacement is None
+            else (index.get_id(self._replacement),))
+        result: list[int] = []
+        for k, i in enumerate(word):
+            if (i in target_ids
+                and self._matches_left(index[word[k - 1]] if k > 0 else None)
+                and self._matches_right(index[word[k + 1]] if k < last else None)):
+                result.extend(replacement)
+            else:
+                result.append(i)
+        return tuple(result)
+
+
+class SoundChangeCascade:
+    """The class for `SoundChangeCascade`.
+
+    A `SoundChangeCascade` applies an ordered sequence of sound changes
+    to every word of a lexicon, and keeps the results up to date as
+    rules and words are added, edited or removed.
+
+    Editing a rule does not run the whole cascade again. For every rule
+    the cascade indexes, by target phoneme, the words whose input to
+    that rule contains it. An edited rule is only applied again to the
+    words it could change before or after the edit, and the following
+    rules only to the words whose form changed, until the forms agree
+    with the previous results again. The inputs of some rules are kept
+    as intermediate stages, the least recently used ones being evicted
+    beyond `max_cached_phonemes` phoneme IDs.
+
+    Below demonstrates voicing /t/ between vowels and then dropping
+    final /n/, and later making the first rule voice /k/ too.::
+
+        vowels = PhonemeGroup("V", *inventory.vowels)
+        cascade = SoundChangeCascade(words)
+        cascade.append(SoundChange(t, d, vowels, vowels))
+        cascade.append(SoundChange(n, None, right=BOUNDARY))
+        cascade.replace(0, SoundChange((t, k), d, vowels, vowels))
+    """
+
+    def __init__(self, words: Iterable[Sequence[Phoneme]] = (),
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX,
+        max_cached_phonemes: int = DEFAULT_MAX_CACHED_PHONEMES) -> None:
+        """Creates a new `SoundChangeCascade` without rules.
+
+        Parameters
+        ----------
+        words : Iterable[Sequence[Phoneme]], optional
+            the initial words of the lexicon, by default none
+        index : PhonemeIndex, optional
+            the index assigning IDs to phonemes, by default
+            `DEFAULT_PHONEME_INDEX`
+        max_cached_phonemes : int, optional
+            the number of phoneme IDs kept in cached intermediate
+            stages, by default `DEFAULT_MAX_CACHED_PHONEMES`
+        """
+        self._index = index
+        self._max_cached_phonemes = max_cached_phonemes
+        self._rules: list[SoundChange] = []
+        self._target_ids: list[frozenset[int]] = []
+        self._triggers: list[dict[int, set[int]]] = []
+        self._words: list[Word] = []
+        self._results: list[Word] = []
+        self._stages: OrderedDict[int, list[Word]] = OrderedDict()
+        self._stage_sizes: dict[int, int] = {}
+        self._cached_phonemes = 0
+        self._applications = 0
+        self.add_words(*words)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    @property
+    def applications(self) -> int:
+        """The number of times a rule was applied to a word since this
+        cascade was created, as a measure of the work done.
+        """
+        return self._applications
+
+    @property
+    def outputs(self) -> tuple[str, ...]:
+        """The outputs of the resulting words, in lexicon order."""
+        index = self._index
+        return tuple(["".join([index[i].output for i in w])
+            for w in self._results])
+
+    @property
+    def results(self) -> tuple[tuple[Phoneme, ...], ...]:
+        """The words after all the rules, in lexicon order."""
+        return tuple([self._to_phonemes(w) for w in self._results])
+
+    @property
+    def rules(self) -> tuple[SoundChange, ...]:
+        """The rules of this cascade, in order."""
+        return tuple(self._rules)
+
+    @property
+    def words(self) -> tuple[tuple[Phoneme, ...], ...]:
+        """The words of the lexicon before any rule, in order."""
+        return tuple([self._to_phonemes(w) for w in self._words])
+
+    def add_words(self, *words: Sequence[Phoneme]) -> None:
+        """Adds the given words to the lexicon and runs them through the
+        whole cascade.
+        """
+        start = len(self._words)
+        self._words.extend([tuple(self._index.get_ids(w)) for w in words]) # type: ignore
+        added = range(start, len(self._words))
+        forms = {w: self._words[w] for w in added}
+        for r in range(len(self._rules)):
+            stage = self._stages.get(r)
+            if stage is not None:
+                stage.extend([forms[w] for w in added])
+                size = sum([len(forms[w]) for w in added])
+                self._stage_sizes[r] += size
+                self._cached_phonemes += size
+            self._run_rule(r, forms)
+        self._results.extend([forms[w] for w in added])
+        self._evict()
+
+    def append(self, rule: SoundChange) -> None:
+        """Adds the given rule at the end of the cascade."""
+        self.insert(len(self._rules), rule)
+
+    def get_stage(self, position: int) -> tuple[tuple[Phoneme, ...], ...]:
+        """Returns the words of the lexicon after the rules before the
+        given position, in order.
+        """
+        if not 0 <= position <= len(self._rules):
+            raise CLCKException(f"There is no sound change stage {position}")
+        return tuple([self._to_phonemes(w) for w in self._get_stage(position)])
+
+    def insert(self, position: int, rule: SoundChange) -> None:
+        """Inserts the given rule before the rule at the given position.
+        """
+        if not 0 <= position <= len(self._rules):
+            raise CLCKException(f"Cannot insert a sound change at position {position}")
+
+        # The input of the new rule is the previous input of the rule
+        # at its position, which is kept as the input of the next rule
+        stage = self._get_stage(position)
+        self._shift_stages(position, 1)
+        self._rules.insert(position, rule)
+        self._target_ids.insert(position, self._get_target_ids(rule))
+        self._triggers.insert(position, {})
+
+        if position not in self._stages:
+            self._cache_stage(position, list(stage))
+
+        ids = self._target_ids[position]
+        forms = {w: form for w, form in enumerate(stage)
+            if not ids.isdisjoint(form)}
+        self._reset_triggers(position)
+        self._run_rule(position, forms)
+        self._propagate(position + 1, {w: form for w, form in forms.items()
+            if form != stage[w]})
+
+    def remove(self, position: int) -> SoundChange:
+        """Removes and returns the rule at the given position."""
+        self._check_position(position)
+
+        # Only the words the rule actually changed are affected
+        stage = self._get_stage(position)
+        forms: dict[int, Word] = {}
+        for w in self._get_triggered_words(position):
+            if self._apply(position, stage[w]) != stage[w]:
+                forms[w] = stage[w]
+
+        # The input of the removed rule becomes the input of the next
+        self._drop_stage(position + 1)
+        self._shift_stages(position + 1, -1)
+        rule = self._rules.pop(position)
+        del self._target_ids[position]
+        del self._triggers[position]
+        self._propagate(position, forms)
+        return rule
+
+    def replace(self, position: int, rule: SoundChange) -> SoundChange:
+        """Replaces the rule at the given position with the given rule,
+        returning the replaced rule.
+        """
+        self._check_position(position)
+
+        # The words the old rule may have changed, and those the new
+        # rule may change, which may need a scan if not yet indexed
+        old = self._rules[position]
+        new_ids = self._get_target_ids(rule)
+        affected = self._get_triggered_words(position)
+        triggers = self._triggers[position]
+        missing = frozenset([i for i in new_ids if i not in triggers])
+        stage = self._get_stage(position)
+        if missing:
+            affected.update([w for w, form in enumerate(stage)
+                if not missing.isdisjoint(form)])
+        else:
+            for i in new_ids:
+                affected.update(triggers[i])
+
+        # Only the words whose outputs differ from before are run
+        # through the following rules
+        following = (self._results if position + 1 == len(self._rules)
+            else self._stages.get(position + 1))
+        if following is not None:
+            previous = {w: following[w] for w in affected}
+        else:
+            previous = {w: stage[w] for w in affected}
+            self._run_rule(position, previous)
+        self._rules[position] = rule
+        self._target_ids[position] = new_ids
+        self._reset_triggers(position)
+        forms = {w: stage[w] for w in affected}
+        self._run_rule(position, forms)
+        self._propagate(position + 1, {w: form for w, form in forms.items()
+            if form != previous[w]})
+        return old
+
+    def _cache_stage(self, position: int, stage: list[Word]) -> None:
+        self._stages[position] = stage
+        self._stage_sizes[position] = sum(map(len, stage))
+        self._cached_phonemes += self._stage_sizes[position]
+        self._evict()
+
+    def _check_position(self, position: int) -> None:
+        if not 0 <= position < len(self._rules):
+            raise CLCKException(f"There is no sound change at position {position}")
+
+    def _apply(self, position: int, word: Word) -> Word:
+        self._applications += 1
+        return self._rules[position].apply(word, self._index,
+            self._target_ids[position])
+
+    def _drop_stage(self, position: int) -> None:
+        if self._stages.pop(position, None) is not None:
+            self._cached_phonemes -= self._stage_sizes.pop(position)
+
+    def _evict(self) -> None:
+        # Stages at either end are the words and the results themselves
+        for position in [p for p in self._stages
+            if p <= 0 or p >= len(self._rules)]:
+            self._drop_stage(position)
+        stages = self._stages
+        while self._cached_phonemes > self._max_cached_phonemes and stages:
+            self._drop_stage(next(iter(stages)))
+
+    def _get_stage(self, position: int) -> list[Word]:
+        """Returns the inputs of the rule at the given position for all
+        words, computing them from the nearest earlier cached stage.
+        """
+        if position == 0:
+            return self._words
+        if position == len(self._rules):
+            return self._results
+        stage = self._stages.get(position)
+        if stage is not None:
+            self._stages.move_to_end(position)
+            return stage
+
+        start = max([p for p in self._stages if p < position], default=0)
+        stage = list(self._get_stage(start))
+        for r in range(start, position):
+            for w in self._get_triggered_words(r):
+                stage[w] = self._apply(r, stage[w])
+        self._cache_stage(position, stage)
+        return stage
+
+    def _get_target_ids(self, rule: SoundChange) -> frozenset[int]:
+        return frozenset(self._index.get_id(p) for p in rule.targets)
+
+    def _get_triggered_words(self, position: int) -> set[int]:
+        """Returns the words whose input to the rule at the given
+        position contains any of its targets.
+        """
+        return set().union(*self._triggers[position].values())
+
+    def _propagate(self, position: int, forms: dict[int, Word]) -> None:
+        """Runs the given words, whose inputs to the rule at the given
+        position changed to the given forms, through the rest of the
+        cascade. A word stops being run once its form agrees with a
+        cached later stage again.
+        """
+        for r in range(position, len(self._rules)):
+            if not forms:
+                break
+            stage = self._stages.get(r)
+            if stage is not None:
+                for w in list(forms):
+                    form = forms[w]
+                    if r > position and stage[w] == form:
+                        del forms[w]
+                        continue
+                    self._stage_sizes[r] += len(form) - len(stage[w])
+                    self._cached_phonemes += len(form) - len(stage[w])
+                    stage[w] = form
+            self._run_rule(r, forms)
+        for w, form in forms.items():
+            self._results[w] = form
+        self._evict()
+
+    def _reset_triggers(self, position: int) -> None:
+        self._triggers[position] = {i: set() for i in self._target_ids[position]}
+
+    def _run_rule(self, position: int, forms: dict[int, Word]) -> None:
+        """Indexes the given words by their inputs to the rule at the
+        given position and replaces their forms by its outputs.
+        """
+        ids = self._target_ids[position]
+        triggers = self._triggers[position]
+        for w, form in forms.items():
+            for i in ids:
+                words = triggers.setdefault(i, set())
+                if i in form:
+                    words.add(w)
+                else:
+                    words.discard(w)
+            if not ids.isdisjoint(form):
+                forms[w] = self._apply(position, form)
+
+    def _shift_stages(self, position: int, offset: int) -> None:
+        """Renumbers the cached stages from the given position on by
+        the given offset, after a rule is inserted or removed.
+        """
+        shifted = [(p, self._stages.pop(p), self._stage_sizes.pop(p))
+            for p in list(self._stages) if p >= position]
+        for p, stage, size in shifted:
+            self._stages[p + offset] = stage
+            self._stage_sizes[p + offset] = size
+
+    def _to_phonemes(self, word: Word) -> tuple[Phoneme, ...]:
+        index = self._index
+        return tuple([index[i] for i in word])
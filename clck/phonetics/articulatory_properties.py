@@ -1,4 +1,5 @@
 from enum import Enum, auto
+from typing import Iterable
 
 
 class ArticulatoryProperty(Enum): ...
@@ -69,4 +70,50 @@ class AirstreamMechanism(ConsonantArticulatoryProperty):
 
     NONPULMONIC = auto()
     """The constant that describes the airstream mechanism as
-    non-pulmonic."""
\ No newline at end of file
+    non-pulmonic."""
+
+
+FEATURES: tuple[ArticulatoryProperty, ...] = (
+    *PlaceOfArticulation,
+    *MannerOfArticulation,
+    *Phonation,
+    *Backness,
+    *Height,
+    *Roundedness,
+    *AirstreamMechanism
+)
+"""All the articulatory properties, ordered by their feature bits. The
+property at index `i` is encoded as the bit `1 << i` of a feature
+mask."""
+
+FEATURE_BITS: dict[ArticulatoryProperty, int] = {
+    property: 1 << i for i, property in enumerate(FEATURES)}
+"""The feature bit of each articulatory property."""
+
+
+def get_feature_mask(properties: Iterable[ArticulatoryProperty]) -> int:
+    """Returns the feature mask encoding the given articulatory
+    properties, with one bit set per property as given by
+    `FEATURE_BITS`.
+
+    Parameters
+    ----------
+    properties : Iterable[ArticulatoryProperty]
+        the articulatory properties to encode
+
+    Returns
+    -------
+    int
+        the feature mask of the properties
+    """
+    mask = 0
+    for property in properties:
+        mask |= FEATURE_BITS[property]
+    return mask
+
+
+def get_feature_properties(mask: int) -> tuple[ArticulatoryProperty, ...]:
+    """Returns the articulatory properties encoded in the given feature
+    mask, in feature bit order.
+    """
+    return tuple([p for i, p in enumerate(FEATURES) if mask >> i & 1])
@@ -1,3 +1,5 @@
+from typing import TYPE_CHECKING, Iterable
+
 from clck.common.component import Component, ComponentBlueprint
 from clck.common.interfaces import Initializable
 from clck.phonetics.articulatory_properties import (
@@ -10,9 +12,26 @@ from clck.phonetics.articulatory_properties import (
     Backness,
     Height,
     Roundedness,
-    VowelArticulatoryProperty
+    VowelArticulatoryProperty,
+    FEATURES,
+    get_feature_mask
 )
 
+from clck.common.registry import RegistryView, SymbolRegistry
+
+if TYPE_CHECKING:
+    import numpy
+
+
+def _load_IPA_chart() -> None:
+    from clck.ipa.IPA import load_chart
+    load_chart()
+
+
+DEFAULT_IPA_PHONE_REGISTRY = SymbolRegistry["Phone"](_load_IPA_chart)
+"""The registry of all phones set as default, indexed by symbol and by
+class. Reading it loads the IPA chart first."""
+
 
 class Phone(Component, Initializable):
     """
@@ -24,8 +43,10 @@ class Phone(Component, Initializable):
     of articulatory properties.
     """
 
-    DEFAULT_IPA_PHONES: tuple["Phone", ...] = ()
-    """The tuple of all phones set as default."""
+    DEFAULT_IPA_PHONES = RegistryView[tuple["Phone", ...]](
+        lambda: DEFAULT_IPA_PHONE_REGISTRY.items)
+    """The tuple of all phones set as default. Reading it loads the IPA
+    chart first. See `DEFAULT_IPA_PHONE_REGISTRY`."""
 
     def __init__(self, symbol: str,
             articulatory_properties: tuple[ArticulatoryProperty, ...],
@@ -47,12 +68,14 @@ class Phone(Component, Initializable):
         self._is_default = _is_IPA_default
         self._symbol = symbol
         self._articulatory_properties = (articulatory_properties)  
+        self._feature_mask = get_feature_mask(articulatory_properties)
+        self._property_names = tuple(self._get_property_names())
         super().__init__(self._init_output(), self._init_ipa_transcript(),
             self._init_formulang_transcript(), self._init_romanization(),
             self._init_default_bp(), self._init_blueprint())
 
         if self.is_default_IPA_phone():
-            Phone._append_to_defaults(self)
+            DEFAULT_IPA_PHONE_REGISTRY.register(self)
 
     def __eq__(self, __value: object) -> bool:
         if self.__class__ != __value.__class__:
@@ -93,7 +116,14 @@ class Phone(Component, Initializable):
     @property
     def articulatory_property_names(self) -> tuple[str, ...]:
         """The property names of this phoneme."""
-        return tuple(self._get_property_names())
+        return self._property_names
+
+    @property
+    def feature_mask(self) -> int:
+        """The feature mask of this phone, encoding its articulatory
+        properties as bits (see `FEATURE_BITS`).
+        """
+        return self._feature_mask
 
     @property
     def name(self) -> str:
@@ -105,6 +135,14 @@ class Phone(Component, Initializable):
         """The assigned Unicode symbol for this phone."""
         return self._symbol
 
+    def has_features(self, *properties: ArticulatoryProperty) -> bool:
+        """
+        Returns `True` if this phone has all the given articulatory
+        properties, otherwise returns `False`.
+        """
+        mask = get_feature_mask(properties)
+        return self._feature_mask & mask == mask
+
     def is_default_IPA_phone(self) -> bool:
         """
         Returns `True` if this phone is labelled as a default phone,
@@ -140,10 +178,6 @@ class Phone(Component, Initializable):
         """
         return [property.name for property in self._articulatory_properties]
 
-    @staticmethod
-    def _append_to_defaults(phoneme: "Phone") -> None:
-        Phone.DEFAULT_IPA_PHONES = tuple([*Phone.DEFAULT_IPA_PHONES, phoneme])
-
 
 class DummyPhone(Phone):
     def __init__(self, symbol: str = "$") -> None:
@@ -279,4 +313,33 @@ class ClickConsonantPhone(NonpulmonicConsonantPhone):
             other_properties: tuple[ConsonantArticulatoryProperty, ...] = (),
             _is_IPA_default: bool = False) -> None:
         super().__init__(symbol, place, manner, other_properties,
-            _is_IPA_default)
\ No newline at end of file
+            _is_IPA_default)
+
+
+def get_feature_masks(phones: Iterable[Phone]) -> "numpy.ndarray":
+    """Returns the feature masks of the given phones as a NumPy
+    `uint64` array. Requires NumPy.
+
+    Below demonstrates selecting all voiced plosives of many phones with
+    bitwise operations.::
+
+        masks = get_feature_masks(phones)
+        wanted = get_feature_mask((MannerOfArticulation.PLOSIVE,
+            Phonation.VOICED))
+        selected = (masks & wanted) == wanted
+    """
+    import numpy
+    return numpy.fromiter((p.feature_mask for p in phones),
+        dtype=numpy.uint64)
+
+
+def get_feature_matrix(phones: Iterable[Phone]) -> "numpy.ndarray":
+    """Returns the binary feature matrix of the given phones as a NumPy
+    `bool` array of shape `(len(phones), len(FEATURES))`, where column
+    `i` tells whether each phone has the property `FEATURES[i]`.
+    Requires NumPy.
+    """
+    import numpy
+    masks = get_feature_masks(phones)
+    bits = numpy.arange(len(FEATURES), dtype=numpy.uint64)
+    return ((masks[:, None] >> bits) & numpy.uint64(1)).astype(bool)
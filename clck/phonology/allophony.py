@@ -0,0 +1,428 @@
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, TypeAlias
+
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PackedStructure, PhonemeIndex
+from clck.common.structure import Structure
+from clck.exceptions import CLCKException
+from clck.phonetics.articulatory_properties import ArticulatoryProperty
+from clck.phonetics.articulatory_properties import get_feature_mask
+from clck.phonetics.phones import Phone
+from clck.phonology.phonemes import Phoneme, PhonemicInventory
+
+if TYPE_CHECKING:
+    from clck.language.containers import PhonemeGroup
+
+
+BOUNDARY = "#"
+"""The environment condition matching only the edge of a word."""
+
+Environment: TypeAlias = "ArticulatoryProperty | Phoneme | PhonemeGroup | Iterable[ArticulatoryProperty | Phoneme] | str | None"
+"""The condition on a neighbour of a phoneme for an allophone rule to
+apply. It is one of:
+
+- `None`, matching anything, including the edge of a word
+- `BOUNDARY`, matching only the edge of a word
+- an articulatory property, or several properties all of which the
+  neighbour must have
+- a phoneme, a `PhonemeGroup`, or several phonemes, one of which the
+  neighbour must be
+
+Phonemes are matched by identity, like the phonemes of the rules
+themselves, and not by equality: a phoneme created separately with the
+same class and transcript as one of them does not match it. Phonemes
+standing for their symbols, such as those generated by Formulang, are
+the exception and match the phonemes with their symbols, and the words
+realized by an `Allophony` with an inventory have them replaced by the
+inventory phonemes with their symbols.
+"""
+
+Realizable: TypeAlias = "Structure[Any] | PackedStructure | Sequence[Phoneme]"
+
+_MAX_TRANSCRIPTS = 65536
+"""The number of realized transcripts an `Allophony` remembers before
+starting over."""
+
+
+def describe_environment(environment: Environment) -> str:
+    """Returns the notation of the given environment used in rules,
+    such as `#` or `VELAR`.
+    """
+    from clck.language.containers import PhonemeGroup
+
+    if isinstance(environment, str):
+        return environment
+    elif isinstance(environment, ArticulatoryProperty):
+        return environment.name
+    elif isinstance(environment, Phoneme):
+        return environment.symbol
+    elif isinstance(environment, PhonemeGroup):
+        return environment.label
+    return "{" + ",".join([describe_environment(e) for e in environment]) + "}" # type: ignore
+
+
+def compile_environment(environment: Environment) -> Callable[[Phoneme | None], bool]:
+    """Returns the predicate of the given environment, which is given
+    `None` for the edge of a word.
+    """
+    from clck.language.containers import PhonemeGroup
+
+    if environment is None:
+        return lambda p: True
+    if isinstance(environment, str):
+        if environment != BOUNDARY:
+            raise CLCKException(f"Unknown allophone environment \"{environment}\"")
+        return lambda p: p is None
+
+    items: tuple[object, ...]
+    if isinstance(environment, PhonemeGroup):
+        items = environment.phonemes
+    elif isinstance(environment, (ArticulatoryProperty, Phoneme)):
+        items = (environment,)
+    else:
+        items = tuple(environment)
+
+    if items and all(isinstance(i, ArticulatoryProperty) for i in items):
+        mask = get_feature_mask(items) # type: ignore
+        return lambda p: (p is not None
+            and p.base_phone.feature_mask & mask == mask)
+    if all(isinstance(i, Phoneme) for i in items):
+        ids = frozenset(id(i) for i in items)
+        # Phonemes standing for their symbols match by symbol
+        symbols = frozenset(i.symbol for i in items) # type: ignore
+        generated = frozenset(i.symbol for i in items if i.stands_for_symbol) # type: ignore
+        return lambda p: id(p) in ids or (p is not None
+            and p.symbol in (symbols if p.stands_for_symbol else generated))
+    raise CLCKException(f"Cannot use {environment} as an allophone environment")
+
+
+class AllophoneRule:
+    """The class for `AllophoneRule`.
+
+    An `AllophoneRule` states that a phoneme is realized as one of its
+    allophones when its left and right neighbours satisfy the rule's
+    environments (see `Environment`).
+    """
+
+    def __init__(self, phoneme: Phoneme, allophone: Phone,
+        left: Environment = None, right: Environment = None) -> None:
+        """Creates a new `AllophoneRule`.
+
+        Parameters
+        ----------
+        phoneme : Phoneme
+            the phoneme realized by this rule
+        allophone : Phone
+            the phone the phoneme is realized as
+        left : Environment, optional
+            the condition on the preceding phoneme, by default none
+        right : Environment, optional
+            the condition on the following phoneme, by default none
+
+        Raises
+        ------
+        CLCKException
+            if an environment is invalid
+        """
+        self._phoneme = phoneme
+        self._allophone = allophone
+        self._left = left
+        self._right = right
+        self._matches_left = compile_environment(left)
+        self._matches_right = compile_environment(right)
+
+    def __repr__(self) -> str:
+        return f"<AllophoneRule {self.__str__()}>"
+
+    def __str__(self) -> str:
+        environment = "_"
+        if self._left is not None:
+            environment = f"{describe_environment(self._left)} _"
+        if self._right is not None:
+            environment += f" {describe_environment(self._right)}"
+        return f"/{self._phoneme.symbol}/ -> [{self._allophone.symbol}] / {environment}"
+
+    @property
+    def allophone(self) -> Phone:
+        """The phone the phoneme is realized as."""
+        return self._allophone
+
+    @property
+    def phoneme(self) -> Phoneme:
+        """The phoneme realized by this rule."""
+        return self._phoneme
+
+    def applies(self, left: Phoneme | None, right: Phoneme | None) -> bool:
+        """Returns `True` if this rule applies between the given
+        neighbours, where `None` is the edge of a word.
+        """
+        return self._matches_left(left) and self._matches_right(right)
+
+
+class AllophoneTable:
+    """The class for `AllophoneTable`.
+
+    An `AllophoneTable` is the compiled form of a sequence of allophone
+    rules. Phonemes are grouped into environment classes, two phonemes
+    sharing a class when every rule environment treats them alike, and
+    the edge of a word has a class of its own. The phone realizing a
+    phoneme is then looked up by (phoneme ID, left class, right class),
+    where IDs are those of a `PhonemeIndex`.
+
+    Entries are computed when the table is compiled for the given
+    phonemes, and added on demand for phonemes first seen while
+    realizing.
+    """
+
+    def __init__(self, rules: Sequence[AllophoneRule],
+        phonemes: Iterable[Phoneme] = (),
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> None:
+        """Compiles a new `AllophoneTable` of the given rules.
+
+        Parameters
+        ----------
+        rules : Sequence[AllophoneRule]
+            the rules, of which the first one applying to a phoneme in
+            its environment realizes it
+        phonemes : Iterable[Phoneme], optional
+            the phonemes to compile the table for, usually those of an
+            inventory, by default none
+        index : PhonemeIndex, optional
+            the index assigning IDs to phonemes, by default
+            `DEFAULT_PHONEME_INDEX`
+        """
+        self._rules = tuple(rules)
+        self._index = index
+        self._signatures: dict[tuple[bool, ...], int] = {}
+        self._class_signatures: list[tuple[bool, ...]] = []
+        self._class_ids = array("h")
+        self._entries: dict[tuple[int, int, int], Phone] = {}
+
+        # The positions of the rules of each phoneme, in order
+        targets: dict[int, list[int]] = {}
+        for r, rule in enumerate(self._rules):
+            targets.setdefault(index.get_id(rule.phoneme), []).append(r)
+        self._targets = {i: tuple(r) for i, r in targets.items()}
+
+        self._boundary = self._get_class_of(None)
+        for phoneme in phonemes:
+            self.get_class_id(index.get_id(phoneme))
+        classes = range(len(self._class_signatures))
+        for target in self._targets:
+            for left in classes:
+                for right in classes:
+                    self._resolve(target, left, right)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def boundary_class(self) -> int:
+        """The environment class of the edge of a word."""
+        return self._boundary
+
+    @property
+    def index(self) -> PhonemeIndex:
+        """The index of the phoneme IDs of this table."""
+        return self._index
+
+    @property
+    def rules(self) -> tuple[AllophoneRule, ...]:
+        """The rules compiled into this table, in order."""
+        return self._rules
+
+    def get_class_id(self, phoneme_id: int) -> int:
+        """Returns the environment class of the phoneme of the given
+        ID.
+        """
+        class_ids = self._class_ids
+        if phoneme_id >= len(class_ids):
+            class_ids.extend([-1] * (phoneme_id + 1 - len(class_ids)))
+        class_id = class_ids[phoneme_id]
+        if class_id < 0:
+            class_id = class_ids[phoneme_id] = self._get_class_of(
+                self._index[phoneme_id])
+        return class_id
+
+    def realize_ids(self, phoneme_ids: Sequence[int]) -> tuple[Phone, ...]:
+        """Realizes a word given as phoneme IDs in a single pass,
+        returning the phone realizing each phoneme.
+        """
+        index = self._index
+        targets = self._targets
+        entries = self._entries
+        boundary = self._boundary
+        get_class_id = self.get_class_id
+        classes = [get_class_id(i) for i in phoneme_ids]
+        last = len(classes) - 1
+
+        phones: list[Phone] = []
+        for k, i in enumerate(phoneme_ids):
+            if i not in targets:
+                phones.append(index[i].base_phone)
+                continue
+            left = classes[k - 1] if k > 0 else boundary
+            right = classes[k + 1] if k < last else boundary
+            phone = entries.get((i, left, right))
+            if phone is None:
+                phone = self._resolve(i, left, right)
+            phones.append(phone)
+        return tuple(phones)
+
+    def _get_class_of(self, phoneme: Phoneme | None) -> int:
+        signature = tuple([f(phoneme) for rule in self._rules
+            for f in (rule._matches_left, rule._matches_right)])
+        class_id = self._signatures.get(signature)
+        if class_id is None:
+            class_id = self._signatures[signature] = len(self._class_signatures)
+            self._class_signatures.append(signature)
+        return class_id
+
+    def _resolve(self, phoneme_id: int, left: int, right: int) -> Phone:
+        left_signature = self._class_signatures[left]
+        right_signature = self._class_signatures[right]
+        phone = self._index[phoneme_id].base_phone
+        for r in self._targets.get(phoneme_id, ()):
+            if left_signature[2 * r] and right_signature[2 * r + 1]:
+                phone = self._rules[r].allophone
+                break
+        self._entries[(phoneme_id, left, right)] = phone
+        return phone
+
+
+class Allophony:
+    """The class for `Allophony`.
+
+    An `Allophony` holds the allophone rules of a language and realizes
+    its words phonetically. The rules are compiled into an
+    `AllophoneTable` on the first realization after they change, and
+    the realized transcripts are cached by the phoneme IDs of the words
+    until then, so realizing a whole lexicon again after editing a rule
+    costs one compilation and one pass over each distinct word.
+
+    Below demonstrates realizing /n/ as [ŋ] before velar consonants.::
+
+        allophony.add_rule(IPA_VOICED_ALVEOLAR_NASAL,
+            IPA_VOICED_VELAR_NASAL.base_phone,
+            right=PlaceOfArticulation.VELAR)
+        allophony.realize_transcript(word)
+    """
+
+    def __init__(self, inventory: PhonemicInventory | None = None,
+        index: PhonemeIndex = DEFAULT_PHONEME_INDEX) -> None:
+        """Creates a new `Allophony` without rules.
+
+        Parameters
+        ----------
+        inventory : PhonemicInventory | None, optional
+            the inventory whose phonemes the rules are compiled for, by
+            default none. Other phonemes are still realized, only more
+            slowly the first time
+        index : PhonemeIndex, optional
+            the index assigning IDs to phonemes, by default
+            `DEFAULT_PHONEME_INDEX`
+        """
+        self._inventory = inventory
+        self._index = index
+        self._rules: list[AllophoneRule] = []
+        self._table: AllophoneTable | None = None
+        self._transcripts: dict[tuple[int, ...], str] = {}
+
+    @property
+    def rules(self) -> tuple[AllophoneRule, ...]:
+        """The allophone rules, in the order they are tried."""
+        return tuple(self._rules)
+
+    @property
+    def table(self) -> AllophoneTable:
+        """The compiled table of the current rules."""
+        if self._table is None:
+            phonemes = () if self._inventory is None else self._inventory.phonemes
+            self._table = AllophoneTable(self._rules, phonemes, self._index)
+        return self._table
+
+    def add_rule(self, phoneme: Phoneme, allophone: Phone,
+        left: Environment = None, right: Environment = None) -> AllophoneRule:
+        """Adds a rule realizing the given phoneme as the given phone
+        between neighbours satisfying the given environments. Rules
+        added earlier take precedence. See `AllophoneRule`.
+
+        The phoneme itself is left unchanged, as it may be shared with
+        other languages; its allophones under these rules are given by
+        `get_allophones()`.
+        """
+        rule = AllophoneRule(phoneme, allophone, left, right)
+        self._rules.append(rule)
+        self._invalidate()
+        return rule
+
+    def remove_rule(self, rule: AllophoneRule) -> None:
+        """Removes the given rule.
+
+        Raises
+        ------
+        CLCKException
+            if the rule is not one of these rules
+        """
+        for i, r in enumerate(self._rules):
+            if r is rule:
+                del self._rules[i]
+                self._invalidate()
+                return
+        raise CLCKException(f"{rule} is not an allophone rule of this allophony")
+
+    def get_allophones(self, phoneme: Phoneme) -> tuple[Phone, ...]:
+        """Returns the allophones of the given phoneme under these
+        rules, that is, its own allophones followed by the phones its
+        rules realize it as, in rule order.
+        """
+        allophones = list(phoneme.allophones)
+        for rule in self._rules:
+            if rule.phoneme is phoneme and all(
+                a is not rule.allophone for a in allophones):
+                allophones.append(rule.allophone)
+        return tuple(allophones)
+
+    def realize(self, word: Realizable) -> tuple[Phone, ...]:
+        """Returns the phones realizing the phonemes of the given
+        structure, packed structure or sequence of phonemes, which is
+        treated as one word.
+        """
+        return self.table.realize_ids(self._get_ids(word))
+
+    def realize_transcript(self, word: Realizable) -> str:
+        """Returns the phonetic transcription of the given structure,
+        packed structure or sequence of phonemes, which is treated as
+        one word. See `realize()`.
+        """
+        key = tuple(self._get_ids(word))
+        transcript = self._transcripts.get(key)
+        if transcript is None:
+            if len(self._transcripts) >= _MAX_TRANSCRIPTS:
+                self._transcripts.clear()
+            phones = self.table.realize_ids(key)
+            transcript = self._transcripts[key] = f"[{''.join([p.output for p in phones])}]"
+        return transcript
+
+    def realize_many(self, words: Iterable[Realizable]) -> Iterator[str]:
+        """Lazily realizes the phonetic transcriptions of many words,
+        such as a whole lexicon. See `realize_transcript()`.
+        """
+        for word in words:
+            yield self.realize_transcript(word)
+
+    def _get_ids(self, word: Realizable) -> Sequence[int]:
+        if isinstance(word, PackedStructure):
+            if word._index is self._index:
+                return word.phoneme_ids
+            phonemes: Sequence[Phoneme] = word.phonemes
+        elif isinstance(word, Structure):
+            phonemes = word.phonemes
+        else:
+            phonemes = word
+        if self._inventory is not None:
+            phonemes = self._inventory.resolve_phonemes(phonemes)
+        return self._index.get_ids(phonemes) # type: ignore
+
+    def _invalidate(self) -> None:
+        self._table = None
+        self._transcripts.clear()
@@ -1,17 +1,44 @@
+from typing import TYPE_CHECKING, Iterable
+
 from clck.common.component import Component, ComponentBlueprint
 from clck.common.interfaces import Initializable
 from clck.phonetics.phones import ConsonantPhone, Phone
 from clck.phonetics.phones import DummyPhone
-from clck.phonetics.phones import VowelPhone
+from clck.phonetics.phones import VowelPhone, _load_IPA_chart
+from clck.phonetics.phones import get_feature_masks, get_feature_matrix
 from clck.phonetics.articulatory_properties import ArticulatoryProperty
 from clck.phonetics.articulatory_properties import MannerOfArticulation
 from clck.phonetics.articulatory_properties import PlaceOfArticulation
 
+from clck.phonology.queries import QueryCondition, get_query_plan
+from clck.common.registry import RegistryView, SymbolRegistry
+
+if TYPE_CHECKING:
+    import numpy
+    from clck.language.containers import PhonemeGroup
+
+
+DEFAULT_IPA_PHONEME_REGISTRY = SymbolRegistry["Phoneme"](_load_IPA_chart)
+"""The registry of all phonemes set as default, indexed by symbol and by
+class. Reading it loads the IPA chart first."""
+
 
 class Phoneme(Component, Initializable):
 
-    DEFAULT_IPA_PHONEMES: list["Phoneme"] = []
-    DEFAULT_IPA_SYMBOLS: list[str] = []
+    DEFAULT_IPA_PHONEMES = RegistryView[tuple["Phoneme", ...]](
+        lambda: DEFAULT_IPA_PHONEME_REGISTRY.items)
+    """The tuple of all phonemes set as default. Reading it loads the
+    IPA chart first. See `DEFAULT_IPA_PHONEME_REGISTRY`."""
+
+    DEFAULT_IPA_SYMBOLS = RegistryView[tuple[str, ...]](
+        lambda: DEFAULT_IPA_PHONEME_REGISTRY.symbols)
+    """The symbols of `DEFAULT_IPA_PHONEMES`."""
+
+    stands_for_symbol: bool = False
+    """Whether or not this phoneme stands for whichever phoneme has its
+    symbol rather than for itself, as the phonemes generated from
+    Formulang formulas do. Such phonemes are resolved by symbol wherever
+    phonemes are otherwise told apart by identity."""
 
     def __init__(self, base_phone: Phone, romanization: str | None = None) -> None:
         """
@@ -30,8 +57,7 @@ class Phoneme(Component, Initializable):
             self._init_default_bp(), self._init_blueprint())
 
         if base_phone.is_default_IPA_phone():
-            Phoneme.DEFAULT_IPA_PHONEMES.append(self)
-            Phoneme.DEFAULT_IPA_SYMBOLS.append(self._symbol)
+            DEFAULT_IPA_PHONEME_REGISTRY.register(self)
 
     def __call__(self) -> str:
         return self._symbol
@@ -60,10 +86,22 @@ class Phoneme(Component, Initializable):
         """The assigned Unicode symbol for this phoneme."""
         return self._symbol
     
+    def add_allophone(self, phone: Phone) -> None:
+        """
+        Adds the given phone to the allophones of this phoneme, unless
+        it already is one.
+
+        Parameters
+        ----------
+        - `phone`: the phone realizing this phoneme in some environment
+        """
+        if all(a is not phone for a in self._allophones):
+            self._allophones.append(phone)
+
     @classmethod
     def get_default_blueprint(cls) -> ComponentBlueprint:
         return ComponentBlueprint(Phoneme)
-    
+
     def _init_output(self) -> str:
         return self._base_phone.output
 
@@ -90,12 +128,13 @@ class DummyPhoneme(Phoneme):
 
 class ConsonantPhoneme(Phoneme):
 
-    IPA_CONSONANTS: list["ConsonantPhoneme"] = []
+    IPA_CONSONANTS = RegistryView[tuple["ConsonantPhoneme", ...]](
+        lambda: DEFAULT_IPA_PHONEME_REGISTRY.by_class(ConsonantPhoneme))
+    """The tuple of all consonant phonemes of the IPA chart. Reading it
+    loads the IPA chart first."""
 
     def __init__(self, _base_phone: ConsonantPhone) -> None:
         super().__init__(_base_phone)
-        if _base_phone.is_default_IPA_phone():
-            ConsonantPhoneme.IPA_CONSONANTS.append(self)
 
 
 class VowelPhoneme(Phoneme):
@@ -114,6 +153,15 @@ class DummyVowelPhoneme(DummyPhoneme, VowelPhoneme):
 
 
 class PhonemicInventory:
+    """
+    The class representing the phonemic inventory of a language.
+
+    A phonemic inventory indexes its phonemes by class and by
+    articulatory property when they are added. Natural class queries are
+    answered from these indexes, and conjunctive queries over several
+    properties are cached until the inventory changes.
+    """
+
     def __init__(self, *phonemes: Phoneme) -> None:
         """
         Creates a new `PhonemicInventory` instance containing the given
@@ -123,35 +171,128 @@ class PhonemicInventory:
         ----------
         - `phonemes`: the given phonemes to be added to this inventory
         """
-        self._phonemes: tuple[Phoneme, ...] = phonemes
-        self._consonants: tuple[ConsonantPhone, ...] = self.get_consonants()
-        self._vowels: tuple[VowelPhone, ...] = self.get_vowels()
+        self._phonemes: list[Phoneme] = []
+        self._phonemes_view: tuple[Phoneme, ...] | None = ()
+        self._phoneme_ids: set[int] = set()
+        self._symbols: dict[str, Phoneme] = {}
+        self._class_index: dict[type[Phoneme], list[int]] = {}
+        self._feature_index: dict[ArticulatoryProperty, set[int]] = {}
+        self._query_cache: dict[frozenset[ArticulatoryProperty], tuple[Phoneme, ...]] = {}
+        self._group_cache: dict[object, "PhonemeGroup"] = {}
+        self.add(*phonemes)
 
     @property
-    def consonants(self) -> tuple[ConsonantPhone, ...]:
+    def consonants(self) -> tuple[ConsonantPhoneme, ...]:
         """The consonants of this phonemic inventory."""
-        return self._consonants
+        return self.get_consonants()
 
     @property
     def phonemes(self) -> tuple[Phoneme, ...]:
-        """The phonemes of this phonemic inventory."""
-        return self._phonemes
+        """The phonemes of this phonemic inventory. The same tuple is
+        returned until phonemes are added."""
+        if self._phonemes_view is None:
+            self._phonemes_view = tuple(self._phonemes)
+        return self._phonemes_view
 
     @property
-    def vowels(self) -> tuple[VowelPhone, ...]:
+    def vowels(self) -> tuple[VowelPhoneme, ...]:
         """The vowels of this phonemic inventory."""
-        return self._vowels
+        return self.get_vowels()
+
+    def add(self, *phonemes: Phoneme) -> None:
+        """
+        Adds the given phonemes to this inventory and to its indexes.
+        Phonemes already in this inventory, by identity, are skipped.
+
+        Parameters
+        ----------
+        - `phonemes`: the phonemes to be added to this inventory
+        """
+        start = position = len(self._phonemes)
+        for phoneme in phonemes:
+            if id(phoneme) in self._phoneme_ids:
+                continue
+            self._phoneme_ids.add(id(phoneme))
+            self._phonemes.append(phoneme)
+            self._symbols.setdefault(phoneme.symbol, phoneme)
+            for cls in phoneme.__class__.__mro__:
+                if issubclass(cls, Phoneme):
+                    self._class_index.setdefault(cls, []).append(position)
+            for property in phoneme.base_phone.articulatory_properties:
+                self._feature_index.setdefault(property, set()).add(position)
+            position += 1
+
+        if position > start:
+            self._phonemes_view = None
+            self._query_cache.clear()
+            self._group_cache.clear()
+
+    def resolve_phonemes(self, phonemes: Iterable[Phoneme]) -> list[Phoneme]:
+        """
+        Returns the given phonemes, where those standing for their
+        symbols, such as the phonemes generated from Formulang formulas,
+        are replaced by the first phoneme of this inventory with the same
+        symbol. Phonemes with no such phoneme are kept as given.
 
-    def get_consonants(self) -> tuple[ConsonantPhone, ...]:
+        Parameters
+        ----------
+        - `phonemes`: the phonemes to be resolved against this inventory
+        """
+        symbols = self._symbols
+        return [symbols.get(p.symbol, p) if p.stands_for_symbol else p
+            for p in phonemes]
+
+    def get_consonants(self) -> tuple[ConsonantPhoneme, ...]:
         """
         Returns all the consonants of this phonemic inventory.
         """
-        consonants: list[ConsonantPhone] = []
-        for phoneme in self._phonemes:
-            if isinstance(phoneme, ConsonantPhone):
-                consonants.append(phoneme)
-        return tuple(consonants)
-    
+        return self.get_phonemes_by_class(ConsonantPhoneme)
+
+    def get_phonemes_by_class[P: Phoneme](self,
+            phoneme_class: type[P]) -> tuple[P, ...]:
+        """
+        Returns all phonemes in this inventory that are instances of the
+        given `Phoneme` class.
+
+        Parameters
+        ----------
+        - `phoneme_class`: the class of the phonemes that will be
+            retrieved
+        """
+        phonemes = self._phonemes
+        positions = self._class_index.get(phoneme_class, ())
+        return tuple([phonemes[i] for i in positions]) # type: ignore
+
+    def get_phonemes_by_features(self,
+            *properties: ArticulatoryProperty) -> tuple[Phoneme, ...]:
+        """
+        Returns all phonemes in this inventory containing every one of
+        the given articulatory properties, in inventory order.
+
+        Parameters
+        ----------
+        - `properties`: the `ArticulatoryProperty` constants contained
+            in the phonemes that will be retrieved
+        """
+        key = frozenset(properties)
+        try:
+            return self._query_cache[key]
+        except KeyError:
+            pass
+
+        index = self._feature_index
+        if not key:
+            positions: set[int] = set(range(len(self._phonemes)))
+        else:
+            # Intersect starting from the rarest property
+            sets = sorted([index.get(p, set()) for p in key], key=len)
+            positions = sets[0].intersection(*sets[1:])
+
+        phonemes = self._phonemes
+        result = self._query_cache[key] = tuple([phonemes[i]
+            for i in sorted(positions)])
+        return result
+
     def get_phonemes_by_manner_of_articulation(self,
             manner: MannerOfArticulation) -> tuple[Phoneme, ...]:
         """
@@ -163,11 +304,7 @@ class PhonemicInventory:
         - `manner`: the `MannerOfArticulation` property contained in the
             phonemes that will be retrieved
         """
-        l: list[Phoneme] = []
-        for phoneme in self._phonemes:
-            if manner in phoneme.base_phone.articulatory_properties:
-                l.append(phoneme)
-        return tuple(l)
+        return self.get_phonemes_by_features(manner)
     
     def get_phonemes_by_place_of_articulation(self,
             place: PlaceOfArticulation) -> tuple[Phoneme, ...]:
@@ -183,15 +320,10 @@ class PhonemicInventory:
         - `place`: the `PlaceOfArticulation` property contained in the
             phonemes that will be retrieved
         """
-        l: list[Phoneme] = []
-        for phoneme in self._phonemes:
-            # safeguard code to prevent non-consonant phonemes to be
-            # accepted in the if statement (see second clause of if
-            # statement)
-            if (place in phoneme.base_phone.articulatory_properties and
-                isinstance(phoneme.base_phone, ConsonantPhoneme)):
-                l.append(phoneme)
-        return tuple(l)
+        # safeguard code to prevent non-consonant phonemes to be
+        # accepted
+        return tuple([p for p in self.get_phonemes_by_features(place)
+            if isinstance(p.base_phone, ConsonantPhone)])
     
     def get_phonemes_by_articulatory_property(self,
             property: ArticulatoryProperty) -> tuple[Phoneme, ...]:
@@ -204,18 +336,81 @@ class PhonemicInventory:
         - `property`: the `ArticulatoryProperty` contained in the
             phonemes that will be retrieved
         """
-        l: list[Phoneme] = []
-        for phoneme in self._phonemes:
-            if property in phoneme.base_phone.articulatory_properties:
-                l.append(phoneme)
-        return tuple(l)
+        return self.get_phonemes_by_features(property)
 
-    def get_vowels(self) -> tuple[VowelPhone, ...]:
+    def get_feature_masks(self) -> "numpy.ndarray":
+        """
+        Returns the feature masks of the base phones of the phonemes in
+        this inventory as a NumPy `uint64` array, in phoneme order.
+        Requires NumPy.
+        """
+        return get_feature_masks([p.base_phone for p in self._phonemes])
+
+    def get_feature_matrix(self) -> "numpy.ndarray":
+        """
+        Returns the binary feature matrix of the base phones of the
+        phonemes in this inventory as a NumPy `bool` array, with one
+        row per phoneme and one column per entry of `FEATURES`.
+        Requires NumPy.
+        """
+        return get_feature_matrix([p.base_phone for p in self._phonemes])
+
+    def get_vowels(self) -> tuple[VowelPhoneme, ...]:
         """
         Returns all the vowels of this phonemic inventory.
         """
-        vowels: list[VowelPhone] = []
-        for phoneme in self._phonemes:
-            if isinstance(phoneme, VowelPhone):
-                vowels.append(phoneme)
-        return tuple(vowels)
\ No newline at end of file
+        return self.get_phonemes_by_class(VowelPhoneme)
+
+    def select(self, *, place: QueryCondition = None,
+            manner: QueryCondition = None, voicing: QueryCondition = None,
+            height: QueryCondition = None, backness: QueryCondition = None,
+            roundedness: QueryCondition = None,
+            airstream: QueryCondition = None,
+            exclude: Iterable[ArticulatoryProperty | Phoneme] = ()) -> "PhonemeGroup":
+        """
+        Returns the natural class of the phonemes in this inventory
+        satisfying all the given conditions as a `PhonemeGroup`.
+
+        Each condition is either a single property or several
+        alternative properties. The query is planned once (see
+        `QueryPlan`) and its group is memoized by the normalized query,
+        so asking for the same natural class again returns the same
+        group until phonemes are added.
+
+        Below demonstrates selecting the voiceless plosives except the
+        glottal stop.::
+
+            inventory.select(manner=MannerOfArticulation.PLOSIVE,
+                voicing=Phonation.VOICELESS,
+                exclude=(PlaceOfArticulation.GLOTTAL,))
+
+        Parameters
+        ----------
+        - `place`: the `PlaceOfArticulation` of the phonemes
+        - `manner`: the `MannerOfArticulation` of the phonemes
+        - `voicing`: the `Phonation` of the phonemes
+        - `height`: the `Height` of the phonemes
+        - `backness`: the `Backness` of the phonemes
+        - `roundedness`: the `Roundedness` of the phonemes
+        - `airstream`: the `AirstreamMechanism` of the phonemes
+        - `exclude`: the properties and phonemes to leave out
+        """
+        plan = get_query_plan(exclude, place=place, manner=manner,
+            voicing=voicing, height=height, backness=backness,
+            roundedness=roundedness, airstream=airstream)
+        try:
+            return self._group_cache[plan.key]
+        except KeyError:
+            from clck.language.containers import PhonemeGroup
+            group = self._group_cache[plan.key] = PhonemeGroup(str(plan),
+                *plan.execute(self))
+            return group
+
+    def _get_positions(self,
+            properties: Iterable[ArticulatoryProperty]) -> set[int]:
+        """
+        Returns the positions of the phonemes having any of the given
+        properties.
+        """
+        index = self._feature_index
+        return set().union(*[index.get(p, ()) for p in properties])
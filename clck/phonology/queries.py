@@ -0,0 +1,211 @@
+from typing import Iterable, TYPE_CHECKING, TypeAlias
+
+from clck.exceptions import CLCKException
+from clck.phonetics.articulatory_properties import AirstreamMechanism
+from clck.phonetics.articulatory_properties import ArticulatoryProperty
+from clck.phonetics.articulatory_properties import Backness
+from clck.phonetics.articulatory_properties import Height
+from clck.phonetics.articulatory_properties import MannerOfArticulation
+from clck.phonetics.articulatory_properties import Phonation
+from clck.phonetics.articulatory_properties import PlaceOfArticulation
+from clck.phonetics.articulatory_properties import Roundedness
+from clck.phonetics.articulatory_properties import get_feature_mask
+
+if TYPE_CHECKING:
+    from clck.phonology.phonemes import Phoneme, PhonemicInventory
+
+
+QUERY_FIELDS: dict[str, type[ArticulatoryProperty]] = {
+    "place": PlaceOfArticulation,
+    "manner": MannerOfArticulation,
+    "voicing": Phonation,
+    "height": Height,
+    "backness": Backness,
+    "roundedness": Roundedness,
+    "airstream": AirstreamMechanism,
+}
+"""The condition names accepted by natural class queries and the
+articulatory property type of each."""
+
+
+QueryCondition: TypeAlias = ArticulatoryProperty | Iterable[ArticulatoryProperty] | None
+QueryKey: TypeAlias = tuple[tuple[frozenset[ArticulatoryProperty], ...], frozenset[ArticulatoryProperty], frozenset[int]]
+
+
+class QueryPlan:
+    """The class for `QueryPlan`.
+
+    A `QueryPlan` is the normalized form of a natural class query such
+    as "voiceless plosives". It is a conjunction of clauses, each clause
+    being the set of articulatory properties of which a phoneme must
+    have at least one, together with the properties and phonemes that
+    are excluded.
+
+    Two queries asking for the same natural class have the same `key`,
+    regardless of the order their conditions were given in, so results
+    can be memoized by it.
+    """
+
+    def __init__(self, clauses: Iterable[frozenset[ArticulatoryProperty]],
+        excluded_properties: frozenset[ArticulatoryProperty] = frozenset(),
+        excluded_phonemes: tuple["Phoneme", ...] = ()) -> None:
+        """Creates a new `QueryPlan`. Use `from_conditions()` to build
+        a plan from keyword conditions.
+
+        Parameters
+        ----------
+        clauses : Iterable[frozenset[ArticulatoryProperty]]
+            the clauses of the query, each satisfied by any of its
+            properties
+        excluded_properties : frozenset[ArticulatoryProperty], optional
+            the properties no selected phoneme may have, by default none
+        excluded_phonemes : tuple[Phoneme, ...], optional
+            the phonemes never selected, by default none
+        """
+        # Clauses are sorted so that equal queries have equal keys
+        self._clauses = tuple(sorted(set(clauses),
+            key=lambda c: sorted((p.__class__.__name__, p.name) for p in c)))
+        self._excluded_properties = excluded_properties
+        self._excluded_phonemes = excluded_phonemes
+        self._excluded_mask = get_feature_mask(excluded_properties)
+        self._key: QueryKey = (self._clauses, excluded_properties,
+            frozenset(id(p) for p in excluded_phonemes))
+
+    def __repr__(self) -> str:
+        return f"<QueryPlan {self.__str__()}>"
+
+    def __str__(self) -> str:
+        terms = ["|".join(sorted(p.name for p in c)) for c in self._clauses]
+        terms.extend(sorted(f"!{p.name}" for p in self._excluded_properties))
+        terms.extend(f"!{p.symbol}" for p in self._excluded_phonemes)
+        return " & ".join(terms) or "*"
+
+    @property
+    def clauses(self) -> tuple[frozenset[ArticulatoryProperty], ...]:
+        """The clauses of this query."""
+        return self._clauses
+
+    @property
+    def key(self) -> QueryKey:
+        """The normalized key of this query."""
+        return self._key
+
+    def execute(self, inventory: "PhonemicInventory") -> tuple["Phoneme", ...]:
+        """Runs this query against the feature index of the given
+        inventory.
+
+        Parameters
+        ----------
+        inventory : PhonemicInventory
+            the inventory to select the phonemes from
+
+        Returns
+        -------
+        tuple[Phoneme, ...]
+            the selected phonemes, in inventory order
+        """
+        candidates: Iterable[int]
+        if self._clauses:
+            # Intersect starting from the most selective clause
+            sets = sorted([inventory._get_positions(c) for c in self._clauses],
+                key=len)
+            candidates = sorted(sets[0].intersection(*sets[1:]))
+        else:
+            candidates = range(len(inventory.phonemes))
+
+        phonemes = inventory.phonemes
+        excluded_mask = self._excluded_mask
+        excluded_ids = self._key[2]
+        return tuple([phonemes[i] for i in candidates
+            if not phonemes[i].base_phone.feature_mask & excluded_mask
+            and id(phonemes[i]) not in excluded_ids])
+
+    @classmethod
+    def from_conditions(cls, exclude: Iterable["ArticulatoryProperty | Phoneme"] = (),
+        **conditions: QueryCondition) -> "QueryPlan":
+        """Builds the plan of a query from keyword conditions.
+
+        Each condition is named after an entry of `QUERY_FIELDS` and
+        given either one property or several alternative properties of
+        the corresponding type. Conditions given `None` are ignored.
+
+        Parameters
+        ----------
+        exclude : Iterable[ArticulatoryProperty | Phoneme], optional
+            the properties and phonemes to leave out of the result, by
+            default none
+        **conditions : QueryCondition
+            the conditions of the query
+
+        Returns
+        -------
+        QueryPlan
+            the plan of the query
+
+        Raises
+        ------
+        CLCKException
+            if a condition name is unknown or a condition is given a
+            property of the wrong type
+        """
+        from clck.phonology.phonemes import Phoneme
+
+        clauses: list[frozenset[ArticulatoryProperty]] = []
+        for name, condition in conditions.items():
+            if condition is None:
+                continue
+            try:
+                expected = QUERY_FIELDS[name]
+            except KeyError:
+                raise CLCKException(f"Unknown query condition \"{name}\"")
+
+            if isinstance(condition, ArticulatoryProperty):
+                condition = (condition,)
+            clause = frozenset(condition)
+            for property in clause:
+                if not isinstance(property, expected):
+                    raise CLCKException(f"Query condition \"{name}\" requires {expected.__name__} but {property} was given")
+            if clause:
+                clauses.append(clause)
+
+        excluded_properties: list[ArticulatoryProperty] = []
+        excluded_phonemes: list[Phoneme] = []
+        for e in exclude:
+            if isinstance(e, ArticulatoryProperty):
+                excluded_properties.append(e)
+            elif isinstance(e, Phoneme):
+                excluded_phonemes.append(e)
+            else:
+                raise CLCKException(f"Cannot exclude {e} from a query")
+
+        return cls(clauses, frozenset(excluded_properties),
+            tuple(excluded_phonemes))
+
+
+_PLAN_CACHE: dict[tuple[object, ...], QueryPlan] = {}
+
+_MAX_CACHED_PLANS = 1024
+"""The number of query plans `get_query_plan()` remembers before
+starting over."""
+
+
+def get_query_plan(exclude: Iterable["ArticulatoryProperty | Phoneme"] = (),
+    **conditions: QueryCondition) -> QueryPlan:
+    """Returns the plan of a query like `QueryPlan.from_conditions()`,
+    reusing the plan of an earlier query given the same conditions.
+    Queries whose conditions are not hashable, such as those excluding
+    phonemes, are planned anew every time.
+    """
+    # Read once, since an iterator would be empty the second time
+    exclude = tuple(exclude)
+    try:
+        key = (tuple(sorted(conditions.items())), exclude)
+        return _PLAN_CACHE[key]
+    except TypeError:
+        return QueryPlan.from_conditions(exclude, **conditions)
+    except KeyError:
+        if len(_PLAN_CACHE) >= _MAX_CACHED_PLANS:
+            _PLAN_CACHE.clear()
+        plan = _PLAN_CACHE[key] = QueryPlan.from_conditions(exclude,
+            **conditions)
+        return plan
@@ -35,9 +35,14 @@ class Syllable(SyllabicComponent[SyllabicComponentT]):
     def __init__(self, components: tuple[SyllabicComponentT, ...] | SyllabicComponentT) -> None:
         super().__init__(components)
         self._left_margin = self._components[0]
-        self._nucleus = Nucleus(self._components[1])
         self._right_margin = self._components[2]
 
+        nucleus = self._components[1]
+        if isinstance(nucleus, Nucleus):
+            self._nucleus = nucleus
+        else:
+            self._nucleus = Nucleus(nucleus)
+
         # if not self._blueprint.is_compatible_to(Syllable.get_default_blueprint()):
             # raise Exception(f"Cannot create a component of less than the elements required (Number of required components is 3 while given is only {len(components)})")
 
@@ -5,4 +5,6 @@ setup(
     version="0.1",
     author="Loui Dominic Naquita",
     packages = find_packages(),
+    package_data={"clck.ipa": ["ipa_chart.bin"]},
+    extras_require={"numpy": ["numpy"]},
 )
\ No newline at end of file
@@ -0,0 +1,70 @@
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PackedStructure
+from clck.formulang.common import Formulang
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICED_VELAR_NASAL
+from clck.ipa.IPA import IPA_VOICELESS_ALVEOLAR_PLOSIVE, IPA_VOICELESS_VELAR_PLOSIVE
+from clck.language.language import Language
+from clck.phonetics.articulatory_properties import Backness, Height, PlaceOfArticulation, Roundedness
+from clck.phonetics.phones import PulmonicConsonantPhone, VowelPhone
+from clck.phonology.allophony import BOUNDARY
+from clck.phonology.phonemes import PhonemicInventory, VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+n, k, t = IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_VELAR_PLOSIVE, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+aspirated_t = PulmonicConsonantPhone("tʰ", *t.base_phone.articulatory_properties[:2],
+    t.base_phone.articulatory_properties[3])
+
+language = Language(PhonemicInventory(n, k, t, a))
+assert language.realize((a, n, k, a)) == "[anka]"
+
+# Rule edits take effect on the next realization
+rule = language.add_allophone_rule(n, IPA_VOICED_VELAR_NASAL.base_phone,
+    right=PlaceOfArticulation.VELAR)
+assert str(rule) == "/n/ -> [ŋ] / _ VELAR"
+assert language.get_allophones(n) == (n.base_phone, IPA_VOICED_VELAR_NASAL.base_phone)
+assert n.allophones == (n.base_phone,)
+assert Language(PhonemicInventory(n, k)).get_allophones(n) == (n.base_phone,)
+assert language.realize((a, n, k, a)) == "[aŋka]"
+assert language.realize((a, n, t, a)) == "[anta]"
+assert language.realize((a, n)) == "[an]"
+
+# Earlier rules take precedence, and word edges are environments
+language.add_allophone_rule(t, aspirated_t, left=BOUNDARY)
+assert language.realize((t, a, t)) == "[tʰat]"
+
+syllable = Syllable((Onset((t,)), Nucleus((a,)), Coda((n,))))
+assert language.realize(syllable) == "[tʰan]"
+assert language.realize(PackedStructure.from_structure(syllable)) == "[tʰan]"
+assert list(language.realize_many([(k, a), syllable])) == ["[ka]", "[tʰan]"]
+assert language.allophony.realize((t, a)) == (aspirated_t, a.base_phone)
+
+language.allophony.remove_rule(rule)
+assert language.realize((a, n, k, a)) == "[anka]"
+assert language.get_allophones(n) == (n.base_phone,)
+assert language.get_allophones(t) == (t.base_phone, aspirated_t)
+
+# Phonemes are matched by identity, not by equality
+other_a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+language.add_allophone_rule(n, IPA_VOICED_VELAR_NASAL.base_phone, right=a)
+assert other_a == a
+assert language.realize((a, n, a)) == "[aŋa]"
+assert language.realize((a, n, other_a)) == "[ana]"
+
+# Generated phonemes are realized as the inventory phonemes of their
+# symbols, without growing the index
+language = Language(PhonemicInventory(n, k, t, a))
+language.add_allophone_rule(n, IPA_VOICED_VELAR_NASAL.base_phone,
+    right=PlaceOfArticulation.VELAR)
+assert language.realize((n, k)) == "[ŋk]"
+size, classes = len(DEFAULT_PHONEME_INDEX), len(language.allophony.table._class_ids)
+for _ in range(100):
+    assert language.realize(Formulang.generate("n+k")) == "[ŋk]"
+    assert language.realize(Formulang.generate("n+t")) == "[nt]"
+assert len(DEFAULT_PHONEME_INDEX) == size
+assert len(language.allophony.table._class_ids) == classes
+
+# Generated phonemes in environments match the phonemes of their symbols
+language.add_allophone_rule(t, aspirated_t, left=Formulang.generate("n"))
+assert language.realize((n, t)) == "[ntʰ]"
+assert language.realize(Formulang.generate("n+t")) == "[ntʰ]"
@@ -0,0 +1,36 @@
+from clck.common.automata import pack_type_ids
+from clck.ipa.IPA import IPA_VOICELESS_ALVEOLAR_PLOSIVE, IPA_VOICELESS_BILABIAL_PLOSIVE
+from clck.common.component import ComponentBlueprint, FlexibleBlueprint
+from clck.phonology.phonemes import ConsonantPhoneme, Phoneme, VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+margin = FlexibleBlueprint((ConsonantPhoneme,), limit_size=2).get_automaton()
+assert margin.accepts_types(())
+assert margin.accepts_types((VowelPhoneme, ConsonantPhoneme))
+assert not margin.accepts_types((VowelPhoneme, VowelPhoneme))
+assert not margin.accepts_types((ConsonantPhoneme,) * 3)
+
+syllable = Syllable.get_default_blueprint().get_automaton()
+ids, offsets = pack_type_ids((
+    (Onset, Nucleus, Coda),
+    (Onset, Onset, Coda),
+    (Phoneme, Nucleus, Phoneme),
+    (Onset, Nucleus),
+))
+assert syllable.accepts_many(ids, offsets) == [True, False, True, False]
+
+exact = ComponentBlueprint(Phoneme, VowelPhoneme).get_automaton()
+assert exact.accepts_types((ConsonantPhoneme, VowelPhoneme))
+assert not exact.accepts_types((VowelPhoneme, ConsonantPhoneme))
+
+# Compatibility to blueprints bound to instances is not cached by type
+p, t = IPA_VOICELESS_BILABIAL_PLOSIVE, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+bound = FlexibleBlueprint((p,))
+assert ComponentBlueprint(p).is_compatible_to(bound)
+assert not ComponentBlueprint(t).is_compatible_to(bound)
+assert not ComponentBlueprint(t).is_compatible_to(FlexibleBlueprint((p,)))
+assert bound == ComponentBlueprint(p) and bound != ComponentBlueprint(t)
+typed = FlexibleBlueprint((ConsonantPhoneme,))
+assert ComponentBlueprint(p).is_compatible_to(typed)
+assert ComponentBlueprint(t).is_compatible_to(typed)
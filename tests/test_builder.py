@@ -0,0 +1,88 @@
+import random
+
+from clck.common.builder import StructureBuilder
+from clck.common.component import AnyBlueprint, FlexibleBlueprint
+from clck.common.structure import Structure
+from clck.exceptions import CLCKException
+from clck.formulang.common import Formulang
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.language.generators import SyllableGenerator
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.phones import VowelPhone
+from clck.phonology.phonemes import Phoneme, PhonemicInventory, VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, SyllabicComponent, Syllable
+
+
+n, t = IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+i = VowelPhoneme(VowelPhone("i", Backness.FRONT, Height.CLOSE, Roundedness.UNROUNDED, ()))
+
+
+def same(built, constructed):
+    return (built.__class__ is constructed.__class__
+        and built.formulang_transcript == constructed.formulang_transcript
+        and built.phonemes == constructed.phonemes
+        and [c.__class__ for c in built.components]
+            == [c.__class__ for c in constructed.components]
+        and built.is_valid() == constructed.is_valid())
+
+def build(type, components, _bp=None):
+    builder = StructureBuilder(type, _bp)
+    builder.extend(components)
+    return builder.freeze()
+
+
+# Diphthong nuclei are accepted like by the constructor
+assert same(build(Nucleus, (a, i)), Nucleus((a, i)))
+assert same(build(Nucleus, (a,)), Nucleus((a,)))
+
+# Bare phonemes are fitted to the syllable blueprint like by the constructor
+assert same(build(Syllable, (n, a, t)), Syllable((n, a, t)))
+assert isinstance(build(Syllable, (n, a, t)).components[1], Nucleus)
+
+# Flexible and any blueprints do not reject components
+for bp in (AnyBlueprint(), AnyBlueprint(n), FlexibleBlueprint((Phoneme,)),
+    FlexibleBlueprint((Phoneme,), 2)):
+    for components in ((n,), (n, t), (n, a, t)):
+        assert same(build(Structure, components, bp), Structure(components, _bp=bp))
+
+# Nested structures are created once, when they are closed
+builder = StructureBuilder(Syllable)
+builder.open(Onset)
+builder.extend((n, t))
+onset = builder.close()
+builder.append(Nucleus((a,)))
+builder.open(Coda)
+builder.append(t)
+assert builder.depth == 1
+syllable = builder.freeze()
+assert syllable.components[0] is onset
+assert same(syllable, Syllable((Onset((n, t)), Nucleus((a,)), Coda((t,)))))
+assert syllable.is_valid()
+
+for action in (lambda: builder.append(n), lambda: builder.freeze()):
+    try:
+        action()
+    except CLCKException:
+        pass
+    else:
+        raise AssertionError("Frozen builders cannot be used")
+
+try:
+    StructureBuilder(Syllable).close()
+except CLCKException:
+    pass
+else:
+    raise AssertionError("No substructure was opened")
+
+# The Formulang evaluator and the syllable generator build through it
+assert same(Formulang.generate_of_type("s+t", SyllabicComponent), SyllabicComponent(
+    tuple(Formulang.get_cached_ast("s+t").eval_components())))
+assert Formulang.generate_syllable("s", "a", "n").formulang_transcript == "{{/s/}.{/a/}.{/n/}}"
+
+random.seed(0)
+generator = SyllableGenerator(PhonemicInventory(*Phoneme.DEFAULT_IPA_PHONEMES))
+structures = generator.generate_structures("(C)", 20)
+assert len(structures) == 20
+assert all(isinstance(s, SyllabicComponent) and len(s.components) <= 1 for s in structures)
+assert any(s.components for s in structures) and not all(s.components for s in structures)
@@ -0,0 +1,42 @@
+from clck.analysis.distance import FeatureDistanceMatrix
+from clck.ipa.IPA import IPA_VOICED_BILABIAL_NASAL
+from clck.ipa.IPA import IPA_VOICED_BILABIAL_PLOSIVE
+from clck.ipa.IPA import IPA_VOICELESS_BILABIAL_PLOSIVE
+from clck.ipa.IPA import IPA_VOICELESS_VELAR_PLOSIVE
+from clck.phonetics.phones import Phone
+from clck.phonology.phonemes import Phoneme, PhonemicInventory
+
+
+inventory = PhonemicInventory(*Phoneme.DEFAULT_IPA_PHONEMES)
+distances = FeatureDistanceMatrix.of_inventory(inventory)
+assert FeatureDistanceMatrix.of_inventory(inventory) is distances
+
+n = len(inventory.phonemes)
+assert distances.matrix.shape == (n, n)
+assert (distances.matrix == distances.matrix.T).all()
+assert (distances.matrix.diagonal() == 0).all()
+
+# The vectorized matrix agrees with the pairwise distances of the masks
+for i, a in enumerate(inventory.phonemes):
+    for j, b in enumerate(inventory.phonemes):
+        assert distances.matrix[i, j] == bin(a.base_phone.feature_mask
+            ^ b.base_phone.feature_mask).count("1")
+
+p, b, m, k = (IPA_VOICELESS_BILABIAL_PLOSIVE, IPA_VOICED_BILABIAL_PLOSIVE,
+    IPA_VOICED_BILABIAL_NASAL, IPA_VOICELESS_VELAR_PLOSIVE)
+assert distances.distance(p, b) == 2
+assert distances.distance(p, k) == 2
+assert distances.distance(b, k) == 4
+assert p not in distances.nearest(p, 3)
+assert [distances.distance(p, q) for q in distances.nearest(p, 5)] == sorted(
+    distances.distance(p, q) for q in distances.nearest(p, 5))
+assert len(distances.nearest(p, 1000)) == n - 1
+
+# Phonemes missing from the inventory can be queried too
+small = FeatureDistanceMatrix.of_inventory(PhonemicInventory(b, m, k))
+assert small.nearest(p, 2) == (b, m)
+assert small.distance(p, k) == 2 and small.distance(m, k) == 4
+
+default = FeatureDistanceMatrix.of_default_phones()
+assert len(default) == len(Phone.DEFAULT_IPA_PHONES)
+assert FeatureDistanceMatrix.of_default_phones() is default
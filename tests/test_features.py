@@ -0,0 +1,93 @@
+from clck.ipa.IPA import IPA_VOICED_BILABIAL_PLOSIVE
+from clck.phonetics.articulatory_properties import FEATURE_BITS, FEATURES
+from clck.phonetics.articulatory_properties import MannerOfArticulation
+from clck.phonetics.articulatory_properties import Phonation
+from clck.phonetics.articulatory_properties import PlaceOfArticulation
+from clck.phonetics.articulatory_properties import get_feature_mask
+from clck.phonetics.articulatory_properties import get_feature_properties
+from clck.phonology.phonemes import Phoneme, PhonemicInventory
+
+
+b = IPA_VOICED_BILABIAL_PLOSIVE.base_phone
+
+assert len(FEATURE_BITS) == len(FEATURES)
+assert set(get_feature_properties(b.feature_mask)) == set(b.articulatory_properties)
+assert b.has_features(PlaceOfArticulation.BILABIAL, Phonation.VOICED)
+assert not b.has_features(MannerOfArticulation.NASAL)
+assert b.articulatory_property_names is b.articulatory_property_names
+
+inventory = PhonemicInventory(*Phoneme.DEFAULT_IPA_PHONEMES)
+masks = inventory.get_feature_masks()
+matrix = inventory.get_feature_matrix()
+assert matrix.shape == (len(inventory.phonemes), len(FEATURES))
+
+wanted = get_feature_mask((MannerOfArticulation.PLOSIVE, Phonation.VOICED))
+selected = [p for p, m in zip(inventory.phonemes, masks) if int(m) & wanted == wanted]
+assert IPA_VOICED_BILABIAL_PLOSIVE in selected
+assert selected == [p for p in inventory.phonemes
+    if p.base_phone.has_features(MannerOfArticulation.PLOSIVE, Phonation.VOICED)]
+
+column = FEATURES.index(PlaceOfArticulation.BILABIAL)
+assert [p for p, row in zip(inventory.phonemes, matrix) if row[column]] \
+    == list(inventory.get_phonemes_by_place_of_articulation(PlaceOfArticulation.BILABIAL))
+
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.phones import VowelPhone
+from clck.phonology.phonemes import ConsonantPhoneme, VowelPhoneme
+
+i = VowelPhoneme(VowelPhone("i", Backness.FRONT, Height.CLOSE, Roundedness.UNROUNDED, ()))
+
+assert all(isinstance(p, ConsonantPhoneme) for p in inventory.get_consonants())
+assert len(inventory.consonants) + len(inventory.vowels) == len(inventory.phonemes)
+
+small = PhonemicInventory(IPA_VOICED_BILABIAL_PLOSIVE)
+assert small.get_phonemes_by_features(Phonation.VOICED) == (IPA_VOICED_BILABIAL_PLOSIVE,)
+assert small.vowels == ()
+small.add(i)
+assert small.vowels == (i,)
+assert small.get_phonemes_by_class(VowelPhoneme) == (i,)
+assert small.get_phonemes_by_features(PlaceOfArticulation.BILABIAL,
+    MannerOfArticulation.PLOSIVE) == (IPA_VOICED_BILABIAL_PLOSIVE,)
+assert small.get_phonemes_by_features(PlaceOfArticulation.BILABIAL,
+    MannerOfArticulation.NASAL) == ()
+
+from clck.ipa.IPA import IPA_VOICELESS_BILABIAL_PLOSIVE
+from clck.language.language import Language
+
+voiceless_plosives = inventory.select(manner=MannerOfArticulation.PLOSIVE,
+    voicing=Phonation.VOICELESS, exclude=(PlaceOfArticulation.GLOTTAL,))
+assert IPA_VOICELESS_BILABIAL_PLOSIVE in voiceless_plosives.phonemes
+assert all(p.base_phone.has_features(MannerOfArticulation.PLOSIVE, Phonation.VOICELESS)
+    and not p.base_phone.has_features(PlaceOfArticulation.GLOTTAL)
+    for p in voiceless_plosives.phonemes)
+assert inventory.select(voicing=Phonation.VOICELESS, exclude=[PlaceOfArticulation.GLOTTAL],
+    manner=(MannerOfArticulation.PLOSIVE,)) is voiceless_plosives
+assert IPA_VOICELESS_BILABIAL_PLOSIVE not in inventory.select(
+    manner=MannerOfArticulation.PLOSIVE, exclude=[IPA_VOICELESS_BILABIAL_PLOSIVE]).phonemes
+assert Language(inventory).select(manner=MannerOfArticulation.PLOSIVE,
+    voicing=Phonation.VOICELESS, exclude=(PlaceOfArticulation.GLOTTAL,)) is voiceless_plosives
+
+# Exclusions given as iterators are read once and planned with the query
+excluded = inventory.select(manner=MannerOfArticulation.PLOSIVE,
+    exclude=iter([PlaceOfArticulation.BILABIAL]))
+assert excluded.phonemes and all(not p.base_phone.has_features(PlaceOfArticulation.BILABIAL)
+    for p in excluded.phonemes)
+other = PhonemicInventory(*inventory.phonemes)
+assert other.select(manner=MannerOfArticulation.PLOSIVE,
+    exclude=(PlaceOfArticulation.BILABIAL,)).phonemes == excluded.phonemes
+assert IPA_VOICELESS_BILABIAL_PLOSIVE not in inventory.select(
+    manner=MannerOfArticulation.PLOSIVE, exclude=(p for p in [IPA_VOICELESS_BILABIAL_PLOSIVE])).phonemes
+
+# Phonemes are appended one at a time and duplicates are skipped
+grown = PhonemicInventory()
+for phoneme in Phoneme.DEFAULT_IPA_PHONEMES:
+    grown.add(phoneme)
+grown.add(*Phoneme.DEFAULT_IPA_PHONEMES[:5])
+assert grown.phonemes == inventory.phonemes
+assert grown.phonemes is grown.phonemes
+assert len(grown.get_consonants()) == len(inventory.get_consonants())
+view = grown.phonemes
+plosives = grown.select(manner=MannerOfArticulation.PLOSIVE)
+grown.add(IPA_VOICED_BILABIAL_PLOSIVE)
+assert grown.phonemes is view
+assert grown.select(manner=MannerOfArticulation.PLOSIVE) is plosives
@@ -1,8 +1,14 @@
+from array import array
+
 from clck.common.component import ComponentBlueprint
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PackedStructure, PhonemeIndex
 from clck.common.structure import Structure
-from clck.formulang.common import Formulang
+from clck.exceptions import CLCKException
+from clck.formulang.common import Formulang, SyllableTemplate
+from clck.formulang.parsing.parse_tree import FormulangStructure
 from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_PLOSIVE
-from clck.phonology.phonemes import DummyPhoneme
+from clck.phonology.phonemes import DummyPhoneme, Phoneme
+from clck.phonology.syllabics import Nucleus, SyllabicComponent, Syllable
 
 s = Structure(
     (IPA_VOICED_ALVEOLAR_PLOSIVE,),
@@ -11,4 +17,78 @@ s = Structure(
 
 s2 = Formulang.generate("abc")
 
-print(s2.base_phone)
\ No newline at end of file
+print(s2.base_phone)
+
+onset = Formulang.generate_of_type("s+t", SyllabicComponent)
+assert onset.__class__ is SyllabicComponent
+assert len(onset.components) == 2
+assert not any(isinstance(c, FormulangStructure) for c in onset.components)
+
+# Given blueprints are enforced instead of being fitted to
+pair = ComponentBlueprint(Phoneme, Phoneme)
+structure = Formulang.generate_of_type("a+e", Structure, pair)
+assert structure._default_blueprint is pair and structure.is_valid()
+assert [c.symbol for c in structure.components] == ["a", "e"]
+try:
+    Formulang.generate_of_type("a+e+i", Structure, pair)
+except CLCKException:
+    pass
+else:
+    raise AssertionError("a+e+i was fitted to two phonemes")
+
+syllable = Formulang.generate_syllable("s+t", "a", "n|m")
+assert syllable.nucleus is syllable.components[1]
+assert isinstance(syllable.nucleus, Nucleus)
+assert syllable.output in ("stan", "stam")
+assert Formulang.generate_syllable(None, "a", None).output == "a"
+
+template = SyllableTemplate("s+t", "a", "n|m")
+assert all(isinstance(s, Syllable) for s in template.sample_many(10))
+assert set(SyllableTemplate("s+t", "a", "n|m", output="text").sample_many(50)) <= {"stan", "stam"}
+packed = SyllableTemplate(None, "a", "n", output="packed").sample()
+assert isinstance(packed, PackedStructure) and packed.output == "an"
+it = iter(SyllableTemplate("k", "i", None, output="text"))
+assert [next(it) for _ in range(3)] == ["ki", "ki", "ki"]
+
+assert Formulang.generate("k+a+(n)", output="text") in ("ka", "kan")
+assert Formulang.generate("{k+a}+{t|d}", output="ipa") in ("/kat/", "/kad/")
+ids_index = PhonemeIndex()
+ids = Formulang.generate("k+a+k", output="ids", index=ids_index)
+assert isinstance(ids, array) and ids.tolist() == [0, 1, 0]
+assert [ids_index[i].symbol for i in ids] == ["k", "a", "k"]
+assert all(isinstance(t, str) for t in Formulang.generate_multiple("p|b", 10, output="text"))
+
+# Cached parse trees are evaluated into new results every time
+first, second = Formulang.generate("a"), Formulang.generate("a")
+assert first is not second and first.symbol == second.symbol == "a"
+first.set_romanization("x")
+assert Formulang.generate("a").romanization != "x"
+words = Formulang.generate_multiple("{k+a}+n", 2)
+assert all(c is not d for c, d in zip(words[0].phonemes, words[1].phonemes))
+assert words[0].components[0] is not words[1].components[0]
+onsets = [Formulang.generate_of_type("s+t", SyllabicComponent) for _ in range(2)]
+assert all(c is not d for c, d in zip(onsets[0].components, onsets[1].components))
+syllables = SyllableTemplate("s", "a", "n").sample_many(2)
+assert all(c is not d for c, d in zip(syllables[0].phonemes, syllables[1].phonemes))
+
+# Output modes do not hand out the nodes of cached parse trees either
+leaves: list = []
+Formulang.get_cached_ast("k+a+k").eval_leaves(leaves)
+assert all(all(p is not leaf for leaf in leaves) for p in ids_index)
+assert len(ids_index) == 2
+results = [Formulang.generate("k+a+k", output="structure") for _ in range(2)]
+assert results[0] is not results[1]
+assert all(c is not d for c, d in zip(results[0].phonemes, results[1].phonemes))
+assert all(all(p is not leaf for leaf in leaves) for p in results[0].phonemes)
+
+# Packed samples resolve their phonemes by symbol, so the index does not grow
+packed_index = PhonemeIndex()
+packed_template = SyllableTemplate("s+t", "a", "n|m", output="packed", index=packed_index)
+packed_template.sample_many(10)
+assert len(packed_index) == 5
+samples = packed_template.sample_many(2000)
+assert len(packed_index) == 5
+assert {s.output for s in samples} == {"stan", "stam"}
+default_size = len(DEFAULT_PHONEME_INDEX)
+SyllableTemplate("k", "i", None, output="packed").sample_many(100)
+assert len(DEFAULT_PHONEME_INDEX) <= default_size + 2
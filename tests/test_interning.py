@@ -0,0 +1,23 @@
+import gc
+
+from clck.common.structure import Structure
+from clck.ipa.IPA import IPA_VOICED_VELAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.phonology.syllabics import Coda, Onset
+
+
+Structure.clear_intern_table()
+
+onset = Onset.interned((IPA_VOICELESS_ALVEOLAR_PLOSIVE,))
+assert Onset.interned((IPA_VOICELESS_ALVEOLAR_PLOSIVE,)) is onset
+coda = Coda.interned((IPA_VOICELESS_ALVEOLAR_PLOSIVE,))
+assert coda is not onset
+
+s = Structure.interned((onset, IPA_VOICED_VELAR_NASAL))
+assert Structure.interned((Onset((IPA_VOICELESS_ALVEOLAR_PLOSIVE,)), IPA_VOICED_VELAR_NASAL)) is s
+
+stats = Structure.get_intern_stats()
+assert (stats.hits, stats.misses, stats.size) == (2, 3, 3)
+
+del onset, coda, s
+gc.collect()
+assert Structure.get_intern_stats().size == 0
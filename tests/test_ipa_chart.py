@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import clck.ipa
+from clck.ipa import IPA
+from clck.ipa.common import DEFAULT_PATTERN_WILDCARDS
+from clck.phonology.phonemes import ConsonantPhoneme, Phoneme
+
+
+# Reading the defaults loads the whole chart, in chart order
+defaults = Phoneme.DEFAULT_IPA_PHONEMES
+assert IPA._loaded
+assert [p.symbol for p in defaults[:len(IPA._CHART_SPEC)]] == [row[1] for row in IPA._CHART_SPEC]
+assert all(getattr(IPA, row[0]) is p for row, p in zip(IPA._CHART_SPEC, defaults))
+assert clck.ipa.IPA_VOICED_VELAR_NASAL is IPA.IPA_VOICED_VELAR_NASAL
+assert Phoneme.DEFAULT_IPA_SYMBOLS == tuple([p.symbol for p in defaults])
+
+# Loading again does not create the phonemes twice
+IPA.load_chart()
+assert len(Phoneme.DEFAULT_IPA_PHONEMES) == len(defaults)
+assert len(ConsonantPhoneme.IPA_CONSONANTS) == len(IPA._CHART_SPEC)
+
+assert IPA.IPA_VOICELESS_VELAR_PLOSIVE in DEFAULT_PATTERN_WILDCARDS["C"].phonemes
+
+# Star imports export every constant of the chart
+for module in ("clck.ipa", "clck.ipa.IPA"):
+    namespace: dict[str, object] = {}
+    exec(f"from {module} import *", namespace)
+    assert all(namespace[row[0]] is getattr(IPA, row[0]) for row in IPA._CHART_SPEC)
+
+# A load failing partway is tried again on the next access
+retried = subprocess.run([sys.executable, "-c", """
+import clck.ipa.table as table
+from clck.ipa import IPA
+
+def fail():
+    raise RuntimeError()
+
+get_default_table = table.get_default_table
+table.get_default_table = fail
+try:
+    IPA.load_chart()
+except RuntimeError:
+    pass
+assert not IPA._loaded
+table.get_default_table = get_default_table
+assert IPA.IPA_VOICED_VELAR_NASAL.symbol == "ŋ" and IPA._loaded
+"""], capture_output=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+assert retried.returncode == 0, retried.stderr.decode()
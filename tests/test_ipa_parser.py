@@ -0,0 +1,50 @@
+import unicodedata
+
+from clck.exceptions import CLCKException
+from clck.ipa.IPA import IPA_VOICED_VELAR_NASAL
+from clck.ipa.IPA import IPA_VOICELESS_RETROFLEX_PLOSIVE
+from clck.ipa.IPA import IPA_VOICELESS_VELAR_PLOSIVE
+from clck.ipa.parser import SymbolTrie, parse_ipa, parse_ipa_many
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.articulatory_properties import MannerOfArticulation
+from clck.phonetics.articulatory_properties import Phonation
+from clck.phonetics.articulatory_properties import PlaceOfArticulation
+from clck.phonetics.phones import PulmonicConsonantPhone, VowelPhone
+from clck.phonology.phonemes import ConsonantPhoneme, PhonemicInventory
+from clck.phonology.phonemes import VowelPhoneme
+
+
+a = VowelPhoneme(VowelPhone("a", Backness.FRONT, Height.OPEN, Roundedness.UNROUNDED, ()))
+inventory = PhonemicInventory(IPA_VOICELESS_RETROFLEX_PLOSIVE,
+    IPA_VOICED_VELAR_NASAL, IPA_VOICELESS_VELAR_PLOSIVE, a)
+
+assert parse_ipa("ʈaŋka", inventory) == (IPA_VOICELESS_RETROFLEX_PLOSIVE, a,
+    IPA_VOICED_VELAR_NASAL, IPA_VOICELESS_VELAR_PLOSIVE, a)
+assert parse_ipa(" ʈa ka ", inventory) == parse_ipa("ʈaka", inventory)
+assert SymbolTrie.of_inventory(inventory) is SymbolTrie.of_inventory(inventory)
+
+try:
+    parse_ipa("ʈaxa", inventory)
+    assert False
+except CLCKException:
+    pass
+assert parse_ipa("ʈaxa", inventory, unknown="skip") == parse_ipa("ʈaa", inventory)
+assert parse_ipa("ʈaxa", inventory, unknown="dummy")[2].symbol == "x"
+
+# Longest match over multi-code-point symbols and combining diacritics
+ts = ConsonantPhoneme(PulmonicConsonantPhone("t͡s", PlaceOfArticulation.ALVEOLAR,
+    MannerOfArticulation.SIBILANT, Phonation.VOICELESS))
+t = ConsonantPhoneme(PulmonicConsonantPhone("t", PlaceOfArticulation.ALVEOLAR,
+    MannerOfArticulation.PLOSIVE, Phonation.VOICELESS))
+a_acute = VowelPhoneme(VowelPhone("á", Backness.FRONT, Height.OPEN, Roundedness.UNROUNDED, ()))
+trie = SymbolTrie((t, ts, a, a_acute))
+assert parse_ipa("t͡sat", trie) == (ts, a, t)
+assert parse_ipa(unicodedata.normalize("NFD", "tá"), trie) == (t, a_acute)
+assert parse_ipa("á", trie) == (a_acute,)
+assert parse_ipa("t̥a", trie, unknown="dummy")[0].symbol == "t̥"
+
+inventory.add(a_acute)
+assert parse_ipa("ʈá", inventory) == (IPA_VOICELESS_RETROFLEX_PLOSIVE, a_acute)
+
+words = ["ʈaŋka", "kaŋa", "ʈaŋka"] * 100
+assert list(parse_ipa_many(words, inventory)) == [parse_ipa(w, inventory) for w in words]
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+from clck.ipa import IPA
+from clck.ipa.table import IPATable, build_table, get_chart_rows, get_checksum, get_default_table
+from clck.phonetics.articulatory_properties import MannerOfArticulation, Phonation, PlaceOfArticulation
+
+
+rows = get_chart_rows()
+table = get_default_table()
+
+# The prebuilt file matches the chart and is memory-mapped
+assert table.checksum == get_checksum(rows)
+assert not isinstance(table._buffer, bytes)
+assert len(table) == len(IPA._CHART_SPEC)
+assert [table.get_symbol(i) for i in range(len(table))] == [row[1] for row in IPA._CHART_SPEC]
+assert [table.get_name(i) for i in range(len(table))] == [row[0] for row in IPA._CHART_SPEC]
+assert table.find("ŋ") == 18
+assert table.find("x") is None
+
+# Feature queries run on the table without loading the chart, which is
+# checked in a fresh interpreter since other tests may have loaded it
+voiced_plosives = table.select(Phonation.VOICED, MannerOfArticulation.PLOSIVE)
+assert [table.get_symbol(i) for i in voiced_plosives] == ["b", "d", "ɖ", "ɟ", "ɡ", "ɢ", "ʔ"]
+assert PlaceOfArticulation.VELAR in table.get_properties(table.find("k"))
+unloaded = subprocess.run([sys.executable, "-c", """
+from clck.ipa import IPA
+from clck.ipa.table import get_default_table
+from clck.phonetics.articulatory_properties import MannerOfArticulation, Phonation
+
+table = get_default_table()
+assert len(table.select(Phonation.VOICED, MannerOfArticulation.PLOSIVE)) == 7
+assert table.get_properties(table.find("k"))
+assert not IPA._loaded
+"""], capture_output=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+assert unloaded.returncode == 0, unloaded.stderr.decode()
+
+# Phonemes are created from the rows when the chart is loaded
+assert IPA.IPA_VOICELESS_VELAR_PLOSIVE is table.get_phoneme(table.find("k"))
+assert all(p.base_phone.feature_mask == table.get_mask(i)
+    for i, p in enumerate(table.get_phonemes()))
+
+# Tables can be built from any rows
+custom = IPATable(build_table([("X", "x", table.get_mask(9), 0)]))
+assert custom.get_symbol(0) == "x" and custom.get_name(0) == "X"
+assert custom.get_phoneme(0).symbol == "x"
+assert not custom.get_phoneme(0).base_phone.is_default_IPA_phone()
@@ -0,0 +1,55 @@
+import gc
+import sys
+
+from clck.ipa import IPA
+from clck.language.containers import PhonemeGroup, PhonemeGroupsManager
+from clck.language.generators import SyllableGenerator
+from clck.language.language import Language
+from clck.language.managers import PhonemesManager
+from clck.phonology.phonemes import ConsonantPhoneme, PhonemicInventory
+
+
+inventory = PhonemicInventory(IPA.IPA_VOICELESS_BILABIAL_PLOSIVE,
+    IPA.IPA_VOICED_VELAR_NASAL)
+
+
+def instantiate(n: int) -> None:
+    for _ in range(n):
+        SyllableGenerator(inventory)
+
+
+def group(n: int) -> None:
+    for _ in range(n):
+        PhonemeGroup.from_type("C", ConsonantPhoneme)
+
+
+def get_growth(function, n: int) -> int:
+    # Warm up every cache before measuring
+    function(1000)
+    gc.collect()
+    before = sys.getallocatedblocks()
+    function(n)
+    gc.collect()
+    return sys.getallocatedblocks() - before
+
+# Groups kept alive by other modules are already registered
+gc.collect()
+baseline = PhonemeGroupsManager.labels
+
+# Memory stays flat, since temporary groups leave the global registry
+# when they are collected
+assert get_growth(instantiate, 100_000) < 1000
+assert get_growth(group, 100_000) < 1000
+assert len(PhonemeGroupsManager.global_list) == len(baseline)
+assert PhonemeGroupsManager.labels == baseline
+
+# Groups registered to a language live as long as the language does
+language = Language(inventory)
+manager = language.get_managers()[1]
+manager.register(PhonemeGroup("N", IPA.IPA_VOICED_VELAR_NASAL))
+gc.collect()
+assert PhonemeGroupsManager.labels == (*baseline, "N")
+assert IPA.IPA_VOICED_VELAR_NASAL in PhonemesManager.global_list
+del language, manager
+gc.collect()
+assert PhonemeGroupsManager.labels == baseline
@@ -0,0 +1,89 @@
+import math
+
+import numpy
+
+from clck.analysis.ngrams import NGramModel
+from clck.common.packed import PackedStructure, pack_phoneme_ids
+from clck.formulang.common import Formulang
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.ipa.IPA import IPA_VOICED_BILABIAL_PLOSIVE
+from clck.ipa.IPA import IPA_VOICELESS_BILABIAL_PLOSIVE, IPA_VOICELESS_VELAR_PLOSIVE
+from clck.language.language import Language
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.phones import VowelPhone
+from clck.phonology.phonemes import PhonemicInventory, VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+n, t, p, k, b = (IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE,
+    IPA_VOICELESS_BILABIAL_PLOSIVE, IPA_VOICELESS_VELAR_PLOSIVE, IPA_VOICED_BILABIAL_PLOSIVE)
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+i = VowelPhoneme(VowelPhone("i", Backness.FRONT, Height.CLOSE, Roundedness.UNROUNDED, ()))
+
+language = Language(PhonemicInventory(n, t, p, a, i))
+language.register_structures(
+    Syllable((Onset((t,)), Nucleus((a,)), Coda((n,)))),
+    Syllable((Onset((p,)), Nucleus((a,)), Coda((n,)))),
+    Syllable((Onset((t,)), Nucleus((i,)), Coda((n,)))))
+lexicon = [(t, a, n), (p, a, n), (t, i, n)]
+
+dense = NGramModel.from_language(language, 2)
+sparse = NGramModel.from_language(language, 2, sparse=True)
+assert not dense.is_sparse and sparse.is_sparse
+assert dense.total == sparse.total == 12
+for model in (dense, sparse):
+    assert model.get_count((None, t)) == 2
+    assert model.get_count((a, n)) == 2
+    assert model.get_count((n, None)) == 3
+    assert model.get_count((n, a)) == 0
+
+# Add-one smoothing over the 5 phonemes, the boundary and the unknown
+# phoneme: P(t|#) P(a|t) P(n|a) P(#|n)
+expected = math.log(3 / 10) + math.log(2 / 9) + math.log(3 / 9) + math.log(4 / 10)
+assert abs(dense.score((t, a, n)) - expected) < 1e-12
+candidates = [(t, a, n), (n, a, t), (a,), (k, a, n), (p, i, n)]
+scores = dense.score_many(candidates)
+assert numpy.allclose(scores, sparse.score_many(candidates))
+# Short words are more probable unless scored per phoneme
+assert scores[2] == scores.max()
+assert scores[0] == scores[[0, 1, 3, 4]].max()
+
+# Phonemes outside the inventory are scored as one unknown phoneme
+assert dense.score((k, a, n)) == dense.score((b, a, n))
+assert dense.score((k, a, n)) < dense.score((p, a, n))
+
+# Packed batches of structures rank the same as sequences
+ids, offsets = pack_phoneme_ids([PackedStructure.from_structure(s)
+    for s in language.structures] + candidates)
+assert list(offsets) == [0, 3, 6, 9, 12, 15, 16, 19, 22]
+packed_scores = dense.score_packed(ids, offsets)
+assert numpy.allclose(packed_scores[3:], scores)
+assert list(dense.rank_packed(ids, offsets)) == list(numpy.argsort(-packed_scores, kind="stable"))
+assert dense.rank(candidates, 2) == ((a,), (t, a, n))
+assert dense.rank(candidates, 1, per_phoneme=True) == ((t, a, n),)
+assert len(dense.rank(candidates, 0)) == 0
+
+# Dense and sparse trigram models agree after incremental training
+for order in (1, 3):
+    dense = NGramModel(language.inventory.phonemes, order)
+    sparse = NGramModel(language.inventory.phonemes, order, sparse=True)
+    for model in (dense, sparse):
+        model.train(lexicon[:2])
+        model.train(lexicon[2:])
+    assert dense.total == sparse.total == 12
+    assert numpy.allclose(dense.score_many(candidates), sparse.score_many(candidates))
+
+# A large batch is scored at once
+rng = numpy.random.default_rng(0)
+inventory_ids = pack_phoneme_ids([language.inventory.phonemes])[0]
+batch = numpy.asarray(inventory_ids)[rng.integers(0, 5, 300_000)]
+batch_offsets = numpy.arange(0, 300_001, 3)
+assert dense.score_packed(batch, batch_offsets).shape == (100_000,)
+
+# Generated phonemes are the phonemes of the model with their symbols
+model = NGramModel((n, t, p), 2)
+model.train([(t, n)] * 50)
+generated = Formulang.generate("t+n")
+assert model.get_count(tuple(generated.phonemes)) == 50
+assert model.score(generated) == model.score((t, n)) > model.score(Formulang.generate("p+p"))
+assert model.rank([Formulang.generate("p+p"), generated], 1)[0] is generated
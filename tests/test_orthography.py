@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICED_VELAR_NASAL
+from clck.ipa.IPA import IPA_VOICED_VELAR_PLOSIVE, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.exceptions import CLCKException
+from clck.language.language import Language
+from clck.language.orthography import GraphemeAutomaton
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.phones import VowelPhone
+from clck.phonology.phonemes import PhonemicInventory, VowelPhoneme
+
+
+automaton = GraphemeAutomaton(("he", "she", "his", "hers"))
+assert list(automaton.find("ushers")) == [(4, 1), (4, 0), (6, 3)]
+assert list(automaton.find("ahishe")) == [(4, 2), (6, 1), (6, 0)]
+
+n, ng, g, t = (IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICED_VELAR_NASAL,
+    IPA_VOICED_VELAR_PLOSIVE, IPA_VOICELESS_ALVEOLAR_PLOSIVE)
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+
+language = Language(PhonemicInventory(n, ng, g, t, a))
+language.add_romanization_rule(ng, "ng")
+language.add_romanization_rule(g, "g")
+language.add_romanization_rule(n, "n'", right=g)
+orthography = language.orthography
+assert orthography is language.orthography
+assert set(orthography.graphemes) == {"ng", "g", "n'", "n", "ŋ", "ɡ", "t", "a"}
+
+# Words are read by the longest grapheme, case-insensitively
+assert orthography.read("tanga") == (t, a, ng, a)
+assert orthography.read("Tan'ga") == (t, a, n, g, a)
+assert orthography.read(language.romanize((t, a, n, g, a))) == (t, a, n, g, a)
+try:
+    orthography.read("taxa")
+    assert False
+except CLCKException:
+    pass
+
+# The lattice holds every reading of an ambiguous word
+lattice = orthography.get_lattice("nga")
+assert [[end for end, _ in edges] for edges in lattice] == [[1, 2], [2], [3]]
+assert list(orthography.read_all("nga")) == [(ng, a), (n, g, a)]
+assert list(orthography.read_all("nga", limit=1)) == [(ng, a)]
+assert orthography.get_lattice("tx") == ((), ())
+assert list(orthography.read_all("tx")) == []
+
+# Text is streamed line by line, and separators used by graphemes are
+# kept in words
+assert orthography.read_line("Tanga, tan'ga!") == ((t, a, ng, a), (t, a, n, g, a))
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "corpus.txt")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("tanga nga\n\ngat\n")
+    assert list(orthography.read_file(path)) == [((t, a, ng, a), (ng, a)), (), ((g, a, t),)]
+
+# Rule edits rebuild the orthography
+language.add_romanization_rule((t, a), "ŧ")
+assert language.orthography is not orthography
+assert language.orthography.read("ŧnga") == (t, a, ng, a)
@@ -0,0 +1,25 @@
+from clck.common.packed import PackedStructure, PhonemeIndex
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_TRILL, IPA_VOICED_VELAR_NASAL
+from clck.ipa.IPA import IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.phonology.phonemes import DummyVowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+syl = Syllable((
+    Onset((IPA_VOICELESS_ALVEOLAR_PLOSIVE, IPA_VOICED_ALVEOLAR_TRILL)),
+    Nucleus((DummyVowelPhoneme(),)),
+    Coda((IPA_VOICED_VELAR_NASAL,))))
+
+index = PhonemeIndex()
+packed = PackedStructure.from_structure(syl, index)
+
+assert packed.output == syl.output
+assert packed.phonemes == syl.phonemes
+assert packed.get_consonants() == syl.get_consonants()
+assert [s.output for s in packed.get_structures_by_type(Coda)] == ["ŋ"]
+assert packed.components[0].structure_type is Onset
+assert len(index) == 4
+
+unpacked = packed.to_structure()
+assert isinstance(unpacked, Syllable)
+assert unpacked.formulang_transcript == syl.formulang_transcript
@@ -0,0 +1,35 @@
+from clck.common.registry import SymbolRegistry
+from clck.ipa import IPA
+from clck.phonetics.articulatory_properties import MannerOfArticulation, Phonation, PlaceOfArticulation
+from clck.phonetics.phones import DEFAULT_IPA_PHONE_REGISTRY, Phone, PulmonicConsonantPhone
+from clck.phonology.phonemes import DEFAULT_IPA_PHONEME_REGISTRY
+from clck.phonology.phonemes import ConsonantPhoneme, Phoneme, VowelPhoneme
+
+
+# Reading a default registry loads the chart
+assert DEFAULT_IPA_PHONEME_REGISTRY.by_symbol("ŋ") is IPA.IPA_VOICED_VELAR_NASAL
+assert DEFAULT_IPA_PHONE_REGISTRY.by_symbol("ŋ") is IPA.IPA_VOICED_VELAR_NASAL.base_phone
+assert DEFAULT_IPA_PHONEME_REGISTRY.by_symbol("?") is None
+assert "k" in DEFAULT_IPA_PHONEME_REGISTRY
+
+# Class lookups include subclasses
+assert DEFAULT_IPA_PHONEME_REGISTRY.by_class(ConsonantPhoneme) == DEFAULT_IPA_PHONEME_REGISTRY.items
+assert DEFAULT_IPA_PHONEME_REGISTRY.by_class(Phoneme) == DEFAULT_IPA_PHONEME_REGISTRY.items
+assert DEFAULT_IPA_PHONEME_REGISTRY.by_class(VowelPhoneme) == ()
+assert ConsonantPhoneme.IPA_CONSONANTS == DEFAULT_IPA_PHONEME_REGISTRY.items
+
+# The views are read-only and stay the same object until a registration
+assert Phone.DEFAULT_IPA_PHONES is Phone.DEFAULT_IPA_PHONES
+assert isinstance(Phoneme.DEFAULT_IPA_PHONEMES, tuple)
+
+# Registration updates every index, and the first symbol wins
+velar_nasal = (PlaceOfArticulation.VELAR, MannerOfArticulation.NASAL, Phonation.VOICED)
+registry = SymbolRegistry[Phoneme]()
+first = ConsonantPhoneme(PulmonicConsonantPhone("ŋ", *velar_nasal))
+registry.register(first)
+items = registry.items
+registry.register(ConsonantPhoneme(PulmonicConsonantPhone("ŋ", *velar_nasal)))
+assert registry.items is not items and len(registry) == 2
+assert registry.by_symbol("ŋ") is first
+assert len(registry.by_class(ConsonantPhoneme)) == 2
+assert registry.symbols == ("ŋ", "ŋ")
@@ -0,0 +1,81 @@
+from clck.common.packed import DEFAULT_PHONEME_INDEX, PackedStructure
+from clck.common.structure import Structure
+from clck.formulang.common import Formulang
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICED_VELAR_NASAL
+from clck.ipa.IPA import IPA_VOICED_VELAR_PLOSIVE, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.ipa.IPA import IPA_VOICELESS_VELAR_PLOSIVE
+from clck.language.language import Language
+from clck.phonetics.articulatory_properties import Backness, Height, MannerOfArticulation, Phonation
+from clck.phonetics.articulatory_properties import PlaceOfArticulation, Roundedness
+from clck.phonetics.phones import PulmonicConsonantPhone, VowelPhone
+from clck.phonology.allophony import BOUNDARY
+from clck.phonology.phonemes import ConsonantPhoneme, PhonemicInventory, VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, SyllabicComponent, Syllable
+
+
+n, ng, g = IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICED_VELAR_NASAL, IPA_VOICED_VELAR_PLOSIVE
+k, t = IPA_VOICELESS_VELAR_PLOSIVE, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+
+language = Language(PhonemicInventory(n, ng, g, k, t, a))
+assert language.romanize((t, a, ng)) == "taŋ"
+
+# The longest applying rule wins, earlier rules breaking ties
+language.add_romanization_rule(ng, "ng")
+rule = language.add_romanization_rule((ng, g), "ngg")
+language.add_romanization_rule((ng, g), "nk")
+assert str(rule) == "/ŋɡ/ -> <ngg> / _"
+assert language.romanize((t, a, ng)) == "tang"
+assert language.romanize((a, ng, g, a)) == "angga"
+
+# Environments restrict rules, falling back to shorter ones
+language.add_romanization_rule(n, "n'", right=g)
+language.add_romanization_rule(k, "c", left=BOUNDARY, right=MannerOfArticulation.NASAL)
+language.add_romanization_rule((t, a), "", left=ng)
+assert language.romanize((a, n, g, a)) == "an'\u0261a"
+assert language.romanize((k, n, a, k, n)) == "cnakn"
+assert language.romanize((a, ng, t, a, t)) == "angt"
+
+language.romanization.remove_rule(rule)
+assert language.romanize((a, ng, g, a)) == "anka"
+assert len(language.romanization.rules) == 5
+
+# Structures reuse the romanizations of their subtrees
+syllable = Syllable((Onset((t,)), Nucleus((a,)), Coda((ng,))))
+assert language.romanize(syllable) == "tang"
+
+ta, tang, ga = SyllabicComponent((t, a)), SyllabicComponent((t, a, ng)), SyllabicComponent((g, a))
+with Structure.trusted():
+    words = [SyllabicComponent((tang, x, y)) for x in (ta, tang, ga) for y in (ta, tang, ga)] * 10
+romanization = language.romanization
+expected = [romanization.romanize(w.phonemes) for w in words]
+matches = romanization.matches
+assert list(language.romanize_many(words)) == expected
+assert list(language.romanize_many(words)) == expected
+assert list(language.romanize_many(PackedStructure.from_structure(w) for w in words)) == expected
+# Every word is only looked up as a sequence of phonemes above
+assert romanization.matches == matches
+
+romanization.add_rule(a, "á")
+matches = romanization.matches
+assert list(language.romanize_many(words)) == [e.replace("a", "á") for e in expected]
+subtree_matches = romanization.matches - matches
+
+# Without subtrees, each distinct word is looked up phoneme by phoneme
+romanization.remove_rule(romanization.add_rule(a, "á")) # Clears the caches
+matches = romanization.matches
+assert list(language.romanize_many(w.phonemes for w in words)) == [e.replace("a", "á") for e in expected]
+assert subtree_matches < romanization.matches - matches
+
+# Generated words are romanized as the inventory phonemes of their
+# symbols, even those the phoneme index has not seen yet
+s = ConsonantPhoneme(PulmonicConsonantPhone("s", PlaceOfArticulation.ALVEOLAR,
+    MannerOfArticulation.FRICATIVE, Phonation.VOICELESS))
+language = Language(PhonemicInventory(n, t, s, a))
+assert language.romanize(Formulang.generate("n+a+s")) == "nas"
+language.add_romanization_rule(t, "T")
+language.add_romanization_rule(s, "S", left=a)
+size = len(DEFAULT_PHONEME_INDEX)
+assert language.romanize((n, t)) == language.romanize(Formulang.generate("n+t")) == "nT"
+assert language.romanize((n, a, s)) == language.romanize(Formulang.generate("n+a+s")) == "naS"
+assert len(DEFAULT_PHONEME_INDEX) == size
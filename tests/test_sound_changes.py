@@ -0,0 +1,70 @@
+from clck.formulang.common import Formulang
+from clck.ipa import IPA
+from clck.language.language import Language
+from clck.language.sound_changes import SoundChange, SoundChangeCascade
+from clck.phonetics.articulatory_properties import MannerOfArticulation, Phonation, PlaceOfArticulation
+from clck.phonetics.phones import PulmonicConsonantPhone
+from clck.phonology.allophony import BOUNDARY
+from clck.phonology.phonemes import ConsonantPhoneme, PhonemicInventory
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+p, b, t, d = (IPA.IPA_VOICELESS_BILABIAL_PLOSIVE, IPA.IPA_VOICED_BILABIAL_PLOSIVE,
+    IPA.IPA_VOICELESS_ALVEOLAR_PLOSIVE, IPA.IPA_VOICED_ALVEOLAR_PLOSIVE)
+k, g, m, n = (IPA.IPA_VOICELESS_VELAR_PLOSIVE, IPA.IPA_VOICED_VELAR_PLOSIVE,
+    IPA.IPA_VOICED_BILABIAL_NASAL, IPA.IPA_VOICED_ALVEOLAR_NASAL)
+nasals = MannerOfArticulation.NASAL
+
+
+def output(cascade: SoundChangeCascade) -> list[str]:
+    return list(cascade.outputs)
+
+
+# Rules apply in order, each to the output of the previous one
+cascade = SoundChangeCascade([(m, p, t), (n, t), (k, n, d)])
+cascade.append(SoundChange(t, d, left=nasals))
+cascade.append(SoundChange(n, None, right=BOUNDARY))
+cascade.append(SoundChange(d, None, left=BOUNDARY))
+assert output(cascade) == ["mpt", "nd", "knd"]
+assert [len(w) for w in cascade.get_stage(1)] == [3, 2, 3]
+assert str(cascade.rules[0]) == "t > d / NASAL _"
+
+# Edits give the same results as running the new cascade from scratch
+cascade.replace(0, SoundChange((t, p), d, left=nasals))
+cascade.insert(0, SoundChange(k, g, right=nasals))
+cascade.remove(2)
+expected = SoundChangeCascade(cascade.words)
+for rule in cascade.rules:
+    expected.append(rule)
+assert output(cascade) == output(expected) == ["mdt", "nd", "ɡnd"]
+
+# An edit only reruns the words the edited rule can touch
+words = [(t, n, b)] * 1000 + [(k, m, d)] * 10
+cascade = SoundChangeCascade(words)
+for i in range(60):
+    if i == 30:
+        cascade.append(SoundChange(k, g))
+    cascade.append(SoundChange(p, b) if i % 2 else SoundChange(b, p))
+before = cascade.applications
+cascade.replace(30, SoundChange(k, g, right=nasals))
+assert cascade.applications - before == 10
+assert cascade.outputs[-1] == "ɡmd"
+
+# The structures registered to a language form its lexicon
+language = Language(PhonemicInventory(p, t, n))
+language.sound_changes.append(SoundChange(t, d, left=nasals))
+language.register_structures(Syllable((Onset((n,)), Nucleus((t,)), Coda((p,)))))
+assert language.sound_changes.outputs == ("ndp",)
+
+# Generated structures are registered as the inventory phonemes of their
+# symbols, even those the phoneme index has not seen yet
+s = ConsonantPhoneme(PulmonicConsonantPhone("s", PlaceOfArticulation.ALVEOLAR,
+    MannerOfArticulation.FRICATIVE, Phonation.VOICELESS))
+language = Language(PhonemicInventory(p, t, n, s))
+language.register_structures(Formulang.generate("n+s"), Formulang.generate("n+t"),
+    Formulang.generate("p+s"))
+language.sound_changes.append(SoundChange((t, s), d, left=nasals))
+index_size = len(language.sound_changes._index)
+language.register_structures(Formulang.generate("n+s"))
+assert language.sound_changes.outputs == ("nd", "nd", "ps", "nd")
+assert len(language.sound_changes._index) == index_size
@@ -0,0 +1,88 @@
+from abc import ABC
+
+from clck.common.structure import Structure
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_TRILL, IPA_VOICED_VELAR_NASAL
+from clck.ipa.IPA import IPA_VOICELESS_ALVEOLAR_PLOSIVE, IPA_VOICELESS_VELAR_PLOSIVE
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.phones import VowelPhone
+from clck.phonology.phonemes import ConsonantPhoneme, Phoneme, VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, SyllabicComponent, Syllable
+
+
+def old_phonemes(structure, type):
+    rl = []
+    for s in structure.components:
+        if isinstance(s, type):
+            rl.append(s)
+        elif isinstance(s, Structure):
+            rl.extend(old_phonemes(s, type))
+    return tuple(rl)
+
+def old_structures(structure, type):
+    rl = []
+    for s in structure.substructures:
+        if isinstance(s, type):
+            rl.append(s)
+        else:
+            rl.extend(old_structures(s, type))
+    return tuple(rl)
+
+def old_walk(structure):
+    for c in structure.components:
+        yield c
+        if isinstance(c, Structure):
+            yield from old_walk(c)
+
+
+t, k = IPA_VOICELESS_ALVEOLAR_PLOSIVE, IPA_VOICELESS_VELAR_PLOSIVE
+r, ng = IPA_VOICED_ALVEOLAR_TRILL, IPA_VOICED_VELAR_NASAL
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+i = VowelPhoneme(VowelPhone("i", Backness.FRONT, Height.CLOSE, Roundedness.UNROUNDED, ()))
+
+first = Syllable((Onset((t, r)), Nucleus((a,)), Coda((ng,))))
+second = Syllable((Onset((k,)), Nucleus((i,)), Coda((t,))))
+with Structure.trusted():
+    word = SyllabicComponent((first, second))
+    nested = SyllabicComponent((word, Syllable((Onset((r,)), Nucleus((i,)), Coda((k,))))))
+
+# A class no component is an instance of
+class Marked(ABC):
+    pass
+
+# Virtual subclasses, which are not in the classes' MROs
+class Voiced(ABC):
+    pass
+
+class Closing(ABC):
+    pass
+
+Voiced.register(VowelPhoneme)
+Closing.register(Coda)
+
+phoneme_types = (Phoneme, ConsonantPhoneme, VowelPhoneme, Voiced, Marked, object)
+structure_types = (Structure, SyllabicComponent, Syllable, Onset, Nucleus, Coda, Closing, Marked)
+
+for structure in (first, word, nested):
+    assert list(structure.walk()) == list(old_walk(structure))
+    expected_phonemes = {ty: old_phonemes(structure, ty) for ty in phoneme_types}
+    expected_structures = {ty: old_structures(structure, ty) for ty in structure_types}
+    assert expected_phonemes[Voiced] == expected_phonemes[VowelPhoneme] != ()
+    assert expected_structures[Closing] == expected_structures[Coda] != ()
+
+    # Lazy traversal, then the same queries answered from the type index
+    for indexed in (False, True):
+        if indexed:
+            structure.build_type_index()
+        for ty, expected in expected_phonemes.items():
+            assert tuple(structure.iter_phonemes(ty)) == expected
+            assert structure.get_phonemes_by_type(ty) == expected
+        for ty, expected in expected_structures.items():
+            assert tuple(structure.iter_structures(ty)) == expected
+            assert structure.get_structures_by_type(ty) == expected
+        assert structure.get_consonants() == expected_phonemes[ConsonantPhoneme]
+        assert structure.get_vowels() == expected_phonemes[VowelPhoneme]
+
+assert nested.get_structures_by_type(Syllable) == (first, second, nested.components[1])
+assert nested.get_structures_by_type(SyllabicComponent) == (word, nested.components[1])
+assert nested.get_phonemes_by_type(Voiced) == (a, i, i)
+assert [c for c in nested.walk() if isinstance(c, Structure)][:2] == [word, first]
@@ -0,0 +1,64 @@
+from clck.common.structure import Structure
+from clck.exceptions import CLCKException
+from clck.ipa.IPA import IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+from clck.phonetics.articulatory_properties import Backness, Height, Roundedness
+from clck.phonetics.phones import VowelPhone
+from clck.phonology.phonemes import VowelPhoneme
+from clck.phonology.syllabics import Coda, Nucleus, Onset, Syllable
+
+
+n, t = IPA_VOICED_ALVEOLAR_NASAL, IPA_VOICELESS_ALVEOLAR_PLOSIVE
+a = VowelPhoneme(VowelPhone("a", Backness.CENTRAL, Height.OPEN, Roundedness.UNROUNDED, ()))
+
+# Counts the blueprint checks run while structures are created
+checks = 0
+check = Structure._assert_blueprint_compatibility
+
+def counting_check(self):
+    global checks
+    checks += 1
+    return check(self)
+
+Structure._assert_blueprint_compatibility = counting_check
+try:
+    onset, nucleus, coda = Onset((n,)), Nucleus((a,)), Coda((t,))
+    Syllable((onset, nucleus, coda))
+    assert checks > 0
+
+    checks = 0
+    with Structure.trusted():
+        valid = Syllable((Onset((n,)), Nucleus((a,)), Coda((t,))))
+        invalid = Syllable((n, a, t))
+    misordered = Syllable.from_trusted((onset, coda, nucleus))
+    assert checks == 0
+finally:
+    Structure._assert_blueprint_compatibility = check
+
+# Trusted components are kept as given instead of being reconstructed
+assert invalid.components == (n, a, t)
+assert isinstance(Syllable((n, a, t)).components[1], Nucleus)
+assert invalid.output == "nat"
+
+# Trusted mode only lasts within its context, even on errors
+try:
+    with Structure.trusted():
+        raise ValueError
+except ValueError:
+    pass
+assert isinstance(Syllable((n, a, t)).components[1], Nucleus)
+
+# Invalid structures are caught once validated
+valid.validate()
+assert valid.is_valid()
+for structure in (invalid, misordered):
+    assert not structure.is_valid()
+    try:
+        structure.validate()
+    except CLCKException:
+        pass
+    else:
+        raise AssertionError(f"{structure} was validated")
+
+assert Structure.validate_many([valid, invalid, valid, misordered]) == (invalid, misordered)
+assert Structure.validate_many(s for s in [valid, valid]) == ()
+assert Structure.validate_many([]) == ()